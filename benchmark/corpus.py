@@ -0,0 +1,145 @@
+"""Deterministic synthetic corpus for benchmarks and load tests."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from xml.sax.saxutils import escape
+
+from backend.paper_process.paper import PaperCandidate, PaperSummary
+
+TOPIC_WORDS = [
+    "trajectory", "prediction", "planning", "pedestrian", "vehicle", "interaction", "safety",
+    "reinforcement", "learning", "transportation", "intelligent", "traffic", "graph", "neural",
+    "network", "diffusion", "transformer", "multi-agent", "control", "signal", "autonomous",
+    "driving", "benchmark", "dataset", "simulation", "uncertainty", "robust", "policy", "model",
+]
+FILLER_WORDS = [
+    "we", "propose", "a", "novel", "method", "that", "improves", "the", "state", "of", "art",
+    "on", "several", "tasks", "and", "show", "results", "with", "strong", "baselines", "for",
+]
+
+
+def make_candidates(
+    count: int,
+    seed: int = 7,
+    duplicate_rate: float = 0.1,
+    abstract_words: int = 150,
+    now: datetime | None = None,
+    prefix: str = "bench",
+) -> list[PaperCandidate]:
+    """Build ``count`` candidates; ``duplicate_rate`` of them reuse an earlier title."""
+
+    rng = random.Random(seed)
+    now_utc = now or datetime.now(timezone.utc)
+    candidates: list[PaperCandidate] = []
+    for index in range(count):
+        if candidates and rng.random() < duplicate_rate:
+            title = rng.choice(candidates).title.upper()
+        else:
+            title = " ".join(rng.choice(TOPIC_WORDS).capitalize() for _ in range(rng.randint(6, 14)))
+        words = [rng.choice(TOPIC_WORDS if rng.random() < 0.3 else FILLER_WORDS) for _ in range(abstract_words)]
+        published_at = now_utc - timedelta(hours=rng.randint(0, 24 * 30))
+        candidates.append(
+            PaperCandidate(
+                source="arxiv",
+                external_id=f"{prefix}.{index:06d}",
+                title=title,
+                abstract=" ".join(words).capitalize() + ".",
+                authors=[f"Author {rng.randint(1, 5000)}" for _ in range(rng.randint(1, 8))],
+                affiliations=[f"University {rng.randint(1, 300)}" for _ in range(rng.randint(0, 3))],
+                published_at=published_at,
+                updated_at=published_at,
+                arxiv_url=f"https://arxiv.org/abs/{prefix}.{index:06d}",
+                pdf_url=f"https://arxiv.org/pdf/{prefix}.{index:06d}.pdf",
+                code_urls=[f"https://github.com/example/repo{index}"] if rng.random() < 0.2 else [],
+                categories=rng.sample(["cs.AI", "cs.LG", "cs.CV", "stat.ML", "cs.RO"], k=2),
+            )
+        )
+    return candidates
+
+
+def make_summaries(candidates: list[PaperCandidate]) -> list[PaperSummary]:
+    return [
+        PaperSummary(
+            external_id=item.external_id,
+            source=item.source,
+            title=item.title,
+            authors=item.authors,
+            affiliations=item.affiliations,
+            arxiv_url=item.arxiv_url,
+            pdf_url=item.pdf_url,
+            code_urls=item.code_urls,
+            problem=item.abstract[:300],
+            approach=item.abstract[300:600] or item.abstract[:200],
+            methodological_novelty="A new **formulation** of the interaction model.",
+            empirical_novelty="Improves on strong baselines across `three` datasets.",
+            tell_someone_in_4_5_sentences=[f"Sentence {n} about {item.title}." for n in range(4)],
+            relevance_score=float(50 + index % 50),
+            relevance_reason="Synthetic benchmark summary.",
+        )
+        for index, item in enumerate(candidates)
+    ]
+
+
+def arxiv_feed_xml(candidates: list[PaperCandidate]) -> str:
+    """Render candidates as an arXiv Atom feed."""
+
+    entries = []
+    for item in candidates:
+        authors = "".join(
+            f"<author><name>{escape(name)}</name></author>" for name in item.authors
+        )
+        categories = "".join(f'<category term="{escape(cat)}"/>' for cat in item.categories)
+        entries.append(
+            "<entry>"
+            f"<id>http://arxiv.org/abs/{escape(item.external_id)}v1</id>"
+            f"<updated>{item.updated_at.strftime('%Y-%m-%dT%H:%M:%SZ')}</updated>"
+            f"<published>{item.published_at.strftime('%Y-%m-%dT%H:%M:%SZ')}</published>"
+            f"<title>{escape(item.title)}</title>"
+            f"<summary>{escape(item.abstract)}</summary>"
+            f"{authors}{categories}"
+            f'<link title="pdf" href="{escape(item.pdf_url)}" rel="related" type="application/pdf"/>'
+            "</entry>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        + "".join(entries)
+        + "</feed>"
+    )
+
+
+def ieee_articles(candidates: list[PaperCandidate]) -> list[dict]:
+    return [
+        {
+            "article_number": str(index),
+            "title": item.title,
+            "abstract": item.abstract,
+            "publication_date": item.published_at.strftime("%d %B %Y"),
+            "html_url": item.arxiv_url,
+            "authors": {"authors": [{"full_name": name, "affiliation": "Example University"} for name in item.authors]},
+            "index_terms": {"ieee_terms": {"terms": item.categories}},
+        }
+        for index, item in enumerate(candidates)
+    ]
+
+
+def scopus_payload(candidates: list[PaperCandidate]) -> dict:
+    return {
+        "search-results": {
+            "entry": [
+                {
+                    "dc:identifier": f"SCOPUS_ID:{index}",
+                    "dc:title": item.title,
+                    "dc:description": item.abstract,
+                    "dc:creator": item.authors[0],
+                    "prism:coverDate": item.published_at.strftime("%Y-%m-%d"),
+                    "affiliation": [{"affilname": name} for name in item.affiliations],
+                    "link": [{"@ref": "scopus", "@href": item.arxiv_url}],
+                    "authkeywords": " | ".join(item.categories),
+                }
+                for index, item in enumerate(candidates)
+            ]
+        }
+    }
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""Standalone benchmark runner for pipeline hot paths.
+
+Each case is timed on a synthetic corpus (see ``benchmark/corpus.py``) for
+every requested size. Medians are compared against ``baselines.json`` and the
+run exits non-zero when a case is slower than its baseline by more than the
+regression threshold. Baselines are machine-specific: refresh them with
+``--update-baselines`` on the machine that runs the check.
+
+Examples:
+    python benchmark/run_benchmarks.py
+    python benchmark/run_benchmarks.py --sizes 1000 10000 100000 --only dedup
+    python benchmark/run_benchmarks.py --update-baselines
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from backend.paper_process.batch import CandidateBatch  # noqa: E402
+from backend.paper_process.binary_codec import (  # noqa: E402
+    decode_summary,
+    encode_summary,
+)
+from backend.paper_process.embedding import EmbeddingRanker, EmbeddingStore, HashingEmbedder  # noqa: E402
+from backend.paper_process.near_duplicate import NearDuplicateDetector  # noqa: E402
+from backend.paper_process.paper import PaperSummary, RelatedPaper  # noqa: E402
+from backend.paper_process.normalize import (  # noqa: E402
+    deduplicate_batch,
+    deduplicate_candidates,
+    normalize_text,
+    normalize_title,
+    normalize_titles,
+    title_keys,
+)
+from backend.paper_process.paper_cache import SQLiteCache  # noqa: E402
+from backend.paper_process.ranker import RelevanceRanker  # noqa: E402
+from backend.paper_process.related import IvfIndex  # noqa: E402
+from backend.paper_process.renderer import render_markdown_digest  # noqa: E402
+from backend.paper_process.writer import MarkdownWriter, _parse_markdown_blocks  # noqa: E402
+from backend.sources.arxiv import ArxivSource  # noqa: E402
+from backend.sources.ieee import IeeeXploreSource  # noqa: E402
+from backend.sources.scopus import ScopusSource  # noqa: E402
+
+from benchmark.corpus import (  # noqa: E402
+    arxiv_feed_xml,
+    ieee_articles,
+    make_candidates,
+    make_summaries,
+    scopus_payload,
+)
+
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "baselines.json"
+DEFAULT_SIZES = [1000, 10000]
+RESEARCH_FIELD = "Traffic engineering, reinforcement learning, and AI with focus on vehicle-pedestrian interaction."
+INCLUDE_KEYWORDS = ["trajectory prediction", "transportation safety", "reinforcement learning"]
+EXCLUDE_KEYWORDS = ["medical imaging", "protein"]
+
+
+@dataclass(slots=True)
+class BenchmarkCase:
+    """One timed operation; ``setup(n)`` returns the callable to time."""
+
+    name: str
+    setup: Callable[[int, Path], Callable[[], object]]
+    max_size: int | None = None
+
+
+def _setup_normalize(n: int, work_dir: Path):
+    # Cold keys: every title is new, as in an ingest of freshly fetched papers.
+    titles = [item.title for item in make_candidates(n)]
+
+    def run():
+        normalize_title.cache_clear()
+        return [normalize_title(title) for title in titles]
+
+    return run
+
+
+def _setup_normalize_cached(n: int, work_dir: Path):
+    titles = [item.title for item in make_candidates(n)]
+    return lambda: [normalize_title(title) for title in titles]
+
+
+def _setup_normalize_text(n: int, work_dir: Path):
+    titles = [item.title for item in make_candidates(n)]
+    return lambda: [normalize_text(title) for title in titles]
+
+
+def _setup_normalize_batch(n: int, work_dir: Path):
+    titles = [item.title for item in make_candidates(n)]
+    return lambda: normalize_titles(titles)
+
+
+def _setup_ingest_title_keys(n: int, work_dir: Path):
+    # Keys for the seen-key lookup, dedup and upsert of fresh candidates: one batch pass in total.
+    candidates = make_candidates(n)
+
+    def run():
+        for item in candidates:
+            item.title_norm = ""
+        seen_keys = title_keys(candidates)
+        deduped = deduplicate_candidates(candidates, set(), set())
+        return seen_keys, [item.title_norm for item in deduped]
+
+    return run
+
+
+def _setup_ingest_title_keys_per_call(n: int, work_dir: Path):
+    # The same keys when the seen-key lookup, dedup and upsert each normalize every title.
+    titles = [item.title for item in make_candidates(n)]
+    return lambda: [[normalize_text(title) for title in titles] for _ in range(3)]
+
+
+def _setup_dedup(n: int, work_dir: Path):
+    candidates = make_candidates(n)
+    seen_ids = {item.external_id for item in candidates[::4]}
+    seen_titles = {normalize_title(item.title) for item in candidates[1::4]}
+    return lambda: deduplicate_candidates(candidates, seen_ids, seen_titles)
+
+
+def _setup_dedup_batch(n: int, work_dir: Path):
+    candidates = make_candidates(n)
+    batch = CandidateBatch.from_candidates(candidates)
+    seen_ids = {item.external_id for item in candidates[::4]}
+    seen_titles = {normalize_title(item.title) for item in candidates[1::4]}
+    return lambda: deduplicate_batch(batch, seen_ids, seen_titles)
+
+
+def _setup_near_duplicate(n: int, work_dir: Path):
+    cache = SQLiteCache(work_dir / "lsh.sqlite3")
+    cache.init_db()
+    history = NearDuplicateDetector(cache)
+    history.remember(make_candidates(n, prefix="history"))
+    candidates = make_candidates(n, seed=11)
+    return lambda: NearDuplicateDetector(cache).filter(candidates)
+
+
+def _setup_heuristic_rank(n: int, work_dir: Path):
+    candidates = make_candidates(n)
+    ranker = RelevanceRanker(
+        research_field=RESEARCH_FIELD,
+        include_keywords=INCLUDE_KEYWORDS,
+        exclude_keywords=EXCLUDE_KEYWORDS,
+        model_name="benchmark",
+        system_prompt="",
+    )
+    return lambda: ranker._rank_with_heuristics(candidates)
+
+
+def _setup_embedding_rank(n: int, work_dir: Path):
+    candidates = make_candidates(n)
+    ranker = EmbeddingRanker(RESEARCH_FIELD, INCLUDE_KEYWORDS, EXCLUDE_KEYWORDS)
+    return lambda: ranker.rank(candidates, top_k=10)
+
+
+def _setup_related_search(n: int, work_dir: Path):
+    embedder = HashingEmbedder()
+    store = EmbeddingStore(work_dir / "vectors.f32")
+    store.add_many([(item.external_id, embedder.embed(f"{item.title} {item.abstract}")) for item in make_candidates(n)])
+    index = IvfIndex(work_dir / "vectors.f32.ivf", store)
+    index.build()
+    queries = [embedder.embed(f"{item.title} {item.abstract}") for item in make_candidates(20, seed=5)]
+    return lambda: [index.search(query, k=3) for query in queries]
+
+
+def _paper_row(candidate, now_iso: str) -> dict:
+    return {
+        "external_id": candidate.external_id,
+        "source": candidate.source,
+        "title_raw": candidate.title,
+        "title_norm": normalize_title(candidate.title),
+        "abstract_raw": candidate.abstract,
+        "authors_json": json.dumps(candidate.authors),
+        "affiliations_json": json.dumps(candidate.affiliations),
+        "published_at": candidate.published_at.isoformat(),
+        "updated_at": candidate.updated_at.isoformat(),
+        "arxiv_url": candidate.arxiv_url,
+        "pdf_url": candidate.pdf_url,
+        "code_urls_json": json.dumps(candidate.code_urls),
+        "categories_json": json.dumps(candidate.categories),
+        "first_seen_at": now_iso,
+    }
+
+
+def _setup_cache_upsert(n: int, work_dir: Path):
+    now_iso = datetime.now(timezone.utc).isoformat()
+    rows = [_paper_row(item, now_iso) for item in make_candidates(n)]
+    counter = iter(range(1_000_000))
+
+    def run() -> None:
+        cache = SQLiteCache(work_dir / f"upsert-{next(counter)}.sqlite3")
+        cache.init_db()
+        cache.upsert_papers(rows)
+
+    return run
+
+
+def _setup_cache_fetch(n: int, work_dir: Path):
+    now_iso = datetime.now(timezone.utc).isoformat()
+    cache = SQLiteCache(work_dir / "fetch.sqlite3")
+    cache.init_db()
+    for item in make_candidates(n):
+        cache.upsert_paper(**_paper_row(item, now_iso))
+    return cache.fetch_seen_keys
+
+
+def _setup_cache_fetch_batch(n: int, work_dir: Path):
+    now_iso = datetime.now(timezone.utc).isoformat()
+    cache = SQLiteCache(work_dir / "prefilter.sqlite3")
+    cache.init_db()
+    for item in make_candidates(n, prefix="history"):
+        cache.upsert_paper(**_paper_row(item, now_iso))
+    batch = make_candidates(500, seed=3)
+    external_ids = [item.external_id for item in batch]
+    title_norms = [normalize_title(item.title) for item in batch]
+    return lambda: cache.fetch_seen_keys_for(external_ids, title_norms)
+
+
+def _setup_cache_search(n: int, work_dir: Path):
+    now_iso = datetime.now(timezone.utc).isoformat()
+    cache = SQLiteCache(work_dir / "search.sqlite3")
+    cache.init_db()
+    for item in make_candidates(n):
+        cache.upsert_paper(**_paper_row(item, now_iso))
+    return lambda: cache.search_papers("pedestrian trajectory prediction reinforcement learning", limit=50)
+
+
+def _setup_render(n: int, work_dir: Path):
+    summaries = make_summaries(make_candidates(n))
+    return lambda: render_markdown_digest(date(2026, 1, 1), summaries)
+
+
+def _setup_parse_blocks(n: int, work_dir: Path):
+    text = render_markdown_digest(date(2026, 1, 1), make_summaries(make_candidates(n)))
+    return lambda: _parse_markdown_blocks(text)
+
+
+def _setup_write_pdf(n: int, work_dir: Path):
+    text = render_markdown_digest(date(2026, 1, 1), make_summaries(make_candidates(n)))
+    writer = MarkdownWriter(markdown_dir=work_dir / "md", pdf_dir=work_dir / "pdf", output_pdf=True)
+    return lambda: writer._write_pdf(text=text, output_path=work_dir / "pdf" / "bench.pdf")
+
+
+def _setup_summary_json(n: int, work_dir: Path):
+    summaries = make_summaries(make_candidates(n))
+
+    def run():
+        decoded = []
+        for item in summaries:
+            payload = json.loads(json.dumps(asdict(item), ensure_ascii=False))
+            payload["related_papers"] = [RelatedPaper(**paper) for paper in payload["related_papers"]]
+            decoded.append(PaperSummary(**payload))
+        return decoded
+
+    return run
+
+
+def _setup_summary_binary(n: int, work_dir: Path):
+    summaries = make_summaries(make_candidates(n))
+    return lambda: [decode_summary(encode_summary(item)) for item in summaries]
+
+
+def _setup_parse_arxiv(n: int, work_dir: Path):
+    xml_text = arxiv_feed_xml(make_candidates(n))
+    source = ArxivSource(RESEARCH_FIELD, INCLUDE_KEYWORDS, EXCLUDE_KEYWORDS, ["cs.AI"], n, window_days=365)
+    return lambda: source._parse_feed(xml_text)
+
+
+def _setup_parse_ieee(n: int, work_dir: Path):
+    articles = ieee_articles(make_candidates(n))
+    source = IeeeXploreSource(RESEARCH_FIELD, INCLUDE_KEYWORDS, EXCLUDE_KEYWORDS, n, window_days=365, api_key="bench")
+    return lambda: source._parse_articles(articles)
+
+
+def _setup_parse_scopus(n: int, work_dir: Path):
+    payload = scopus_payload(make_candidates(n))
+    source = ScopusSource(RESEARCH_FIELD, INCLUDE_KEYWORDS, EXCLUDE_KEYWORDS, n, window_days=365, api_key="bench")
+    return lambda: source._parse_payload(payload)
+
+
+CASES = [
+    BenchmarkCase("normalize_title", _setup_normalize),
+    BenchmarkCase("normalize_title_cached", _setup_normalize_cached),
+    BenchmarkCase("normalize_text", _setup_normalize_text),
+    BenchmarkCase("normalize_titles_batch", _setup_normalize_batch),
+    BenchmarkCase("ingest_title_keys", _setup_ingest_title_keys),
+    BenchmarkCase("ingest_title_keys_per_call", _setup_ingest_title_keys_per_call),
+    BenchmarkCase("deduplicate_candidates", _setup_dedup),
+    BenchmarkCase("deduplicate_batch", _setup_dedup_batch),
+    BenchmarkCase("near_duplicate_filter", _setup_near_duplicate, max_size=10000),
+    BenchmarkCase("rank_with_heuristics", _setup_heuristic_rank),
+    BenchmarkCase("rank_with_embeddings", _setup_embedding_rank),
+    BenchmarkCase("related_index_search_20", _setup_related_search),
+    BenchmarkCase("cache_upsert", _setup_cache_upsert, max_size=10000),
+    BenchmarkCase("cache_fetch_seen_keys", _setup_cache_fetch, max_size=10000),
+    BenchmarkCase("cache_fetch_seen_keys_for_batch", _setup_cache_fetch_batch, max_size=10000),
+    BenchmarkCase("cache_search_papers", _setup_cache_search, max_size=10000),
+    BenchmarkCase("render_markdown_digest", _setup_render, max_size=1000),
+    BenchmarkCase("parse_markdown_blocks", _setup_parse_blocks, max_size=1000),
+    BenchmarkCase("write_pdf", _setup_write_pdf, max_size=100),
+    BenchmarkCase("summary_codec_json", _setup_summary_json),
+    BenchmarkCase("summary_codec_binary", _setup_summary_binary),
+    BenchmarkCase("parse_arxiv_feed", _setup_parse_arxiv),
+    BenchmarkCase("parse_ieee_articles", _setup_parse_ieee),
+    BenchmarkCase("parse_scopus_payload", _setup_parse_scopus),
+]
+
+
+def time_case(run: Callable[[], object], repeat: int) -> list[float]:
+    run()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run_benchmarks(sizes: list[int], repeat: int, only: str | None = None) -> dict[str, float]:
+    """Return median seconds keyed by ``name@size``."""
+
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for case in CASES:
+            if only and only not in case.name:
+                continue
+            for size in sorted({min(size, case.max_size or size) for size in sizes}):
+                work_dir = Path(tmp) / f"{case.name}-{size}"
+                work_dir.mkdir()
+                timings = time_case(case.setup(size, work_dir), repeat)
+                key = f"{case.name}@{size}"
+                results[key] = statistics.median(timings)
+                print(f"{key:<36} median={results[key] * 1000:10.2f}ms  min={min(timings) * 1000:10.2f}ms")
+    return results
+
+
+def find_regressions(results: dict[str, float], baselines: dict[str, float], threshold: float) -> list[str]:
+    regressions = []
+    for key, seconds in results.items():
+        baseline = baselines.get(key)
+        if baseline is not None and seconds > baseline * (1 + threshold):
+            regressions.append(f"{key}: {seconds * 1000:.2f}ms vs baseline {baseline * 1000:.2f}ms")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline hot paths against stored baselines")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default=None, help="Run only cases whose name contains this text")
+    parser.add_argument("--baselines", type=Path, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown ratio, e.g. 0.25 = 25%%")
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.only)
+    baselines = json.loads(args.baselines.read_text(encoding="utf-8")) if args.baselines.exists() else {}
+
+    if args.update_baselines:
+        baselines.update({key: round(value, 6) for key, value in results.items()})
+        args.baselines.write_text(json.dumps(dict(sorted(baselines.items())), indent=2) + "\n", encoding="utf-8")
+        print(f"Baselines written: {args.baselines}")
+        return 0
+
+    regressions = find_regressions(results, baselines, args.threshold)
+    if regressions:
+        print(f"Regressions over {args.threshold:.0%} threshold:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("No regressions against baselines.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
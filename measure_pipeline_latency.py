@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Load-test run_pipeline end-to-end against the local mock LLM server.
+
+Example:
+    python measure_pipeline_latency.py --runs 5 --candidates 200 --latency-ms 300 \
+        --latency-distribution lognormal --latency-jitter-ms 150 --rate-limit-rate 0.05
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from backend.app import run_pipeline  # noqa: E402
+from backend.models.mock_server import MockLLMConfig, MockLLMServer  # noqa: E402
+from backend.paper_process.paper import PaperCandidate  # noqa: E402
+from benchmark.corpus import make_candidates  # noqa: E402
+
+
+class SyntheticSource:
+    """Deterministic offline source producing ``count`` candidates."""
+
+    def __init__(self, count: int, run_index: int):
+        self.count = count
+        self.run_index = run_index
+
+    def search_recent(self) -> list[PaperCandidate]:
+        return make_candidates(self.count, seed=self.run_index, duplicate_rate=0.0, prefix=f"run{self.run_index}")
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def format_latencies(label: str, values: list[float]) -> str:
+    return (
+        f"{label}: n={len(values)} p50={percentile(values, 0.50):.1f}ms "
+        f"p95={percentile(values, 0.95):.1f}ms p99={percentile(values, 0.99):.1f}ms"
+    )
+
+
+def write_config(base_config: Path, work_dir: Path, args: argparse.Namespace) -> Path:
+    data = json.loads(base_config.read_text(encoding="utf-8"))
+    runtime = data.setdefault("runtime", {})
+    runtime.update(
+        {
+            "db_path": str(work_dir / "cache.sqlite3"),
+            "markdown_output_dir": str(work_dir / "markdown"),
+            "pdf_output_dir": str(work_dir / "pdf"),
+            "OUTPUT_PDF": False,
+            "top_k": args.top_k,
+            "min_interval_hours": 0,
+            "require_llm": True,
+        }
+    )
+    llm = runtime.setdefault("llm", {})
+    llm.update({"stream": args.stream, "summary_batch_size": args.summary_batch_size})
+    llm.pop("endpoints", None)
+    config_path = work_dir / "config.json"
+    config_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    return config_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure pipeline throughput and tail latency against a mock LLM")
+    parser.add_argument("--config", default="config/default_config.json")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--candidates", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--summary-batch-size", type=int, default=1)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--latency-distribution", choices=["fixed", "uniform", "lognormal"], default="fixed")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    mock_config = MockLLMConfig(
+        latency_distribution=args.latency_distribution,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    run_seconds: list[float] = []
+    summaries = 0
+    with MockLLMServer(mock_config) as server, tempfile.TemporaryDirectory() as tmp:
+        os.environ["AI_MODEL_URL"] = server.url
+        os.environ["AI_MODEL_API_KEY"] = "mock"
+        for run_index in range(args.runs):
+            work_dir = Path(tmp) / f"run-{run_index}"
+            work_dir.mkdir()
+            config_path = write_config(Path(args.config), work_dir, args)
+            started = time.perf_counter()
+            result = run_pipeline(
+                config_path=str(config_path),
+                source=SyntheticSource(args.candidates, run_index),
+            )
+            run_seconds.append(time.perf_counter() - started)
+            summaries += result["summary_count"]
+
+        stats = server.stats
+        total_seconds = sum(run_seconds)
+        print("=" * 60)
+        print(f"runs: {args.runs}, candidates/run: {args.candidates}, summaries: {summaries}")
+        print(f"llm requests: {stats.requests}, injected 5xx: {stats.errors}, injected 429: {stats.rate_limited}")
+        print(f"throughput: {args.runs * args.candidates / total_seconds:.1f} candidates/s, "
+              f"{summaries / total_seconds:.2f} summaries/s, {stats.requests / total_seconds:.2f} llm calls/s")
+        print(format_latencies("pipeline run", [value * 1000 for value in run_seconds]))
+        print(format_latencies("llm call (server side)", stats.latencies_ms))
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
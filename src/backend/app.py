@@ -5,19 +5,30 @@ from __future__ import annotations
 import argparse
 import os
 import tempfile
-from collections.abc import Sequence
-from datetime import datetime, timezone
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import ExitStack
+from datetime import date, datetime, timezone
 from pathlib import Path
 
-from backend.common.protocols import SourceInterface
-from backend.config.paper_config import DEFAULT_CONFIG_PATH, load_config
-from backend.paper_process.pipeline import DailyPaperPipeline
+from backend.common.profiling import PROFILE_MODES, profile_call
+from backend.common.protocols import RankerInterface, SourceInterface, TermStatsInterface
+from backend.config.paper_config import DEFAULT_CONFIG_PATH, QueryConfig, load_config
+from backend.models.ai_model_client import AIModelClient, ModelEndpoint
+from backend.models.batch_client import BatchModelClient, OpenAIBatchBackend
+from backend.models.tokens import UsageLedger
+from backend.paper_process.embedding import EmbeddingRanker, EmbeddingStore
+from backend.paper_process.near_duplicate import NearDuplicateDetector
+from backend.paper_process.pipeline import DailyPaperPipeline, DigestProfile
+from backend.paper_process.paper import PipelineRunResult
 from backend.paper_process.paper_cache import SQLiteCache
+from backend.paper_process.related import RelatedPaperFinder
 from backend.paper_process.renderer import MarkdownRenderer
+from backend.paper_process.retention import RetentionPolicy
 from backend.paper_process.ranker import RelevanceRanker
 from backend.paper_process.writer import MarkdownWriter
 from backend.paper_process.summarizer import PaperSummarizer
 from backend.sources.arxiv import ArxivSource
+from backend.sources.http_archive import HttpArchive
 from backend.sources.ieee import IeeeXploreSource
 from backend.sources.multi import MultiSource
 from backend.sources.scopus import ScopusSource
@@ -41,7 +52,26 @@ def _build_arg_parser(argv: Sequence[str] | None = None) -> argparse.Namespace:
         action="store_true",  # store_true means it's a flag that defaults to False, and becomes True if specified
         help="Delete today's generated digest outputs and today's cache records before running.",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=sorted(PROFILE_MODES),
+        default=None,
+        help="Profile the run (cprofile by default, or sample) and write artifacts under newspaper/profile.",
+    )
+    parser.add_argument(
+        "--backfill",
+        nargs=2,
+        type=date.fromisoformat,
+        metavar=("START", "END"),
+        default=None,
+        help="Generate one digest per past day from START to END (YYYY-MM-DD, inclusive) instead of today's run.",
+    )
+    args = parser.parse_args(argv)
+    if args.backfill and (args.profile or args.delete_last_file):
+        parser.error("--backfill cannot be combined with --profile or --delete-last-file")
+    return args
 
 
 def _build_runtime_log_lines(config) -> list[str]:
@@ -61,6 +91,7 @@ def _build_runtime_log_lines(config) -> list[str]:
         f"  markdown_output_dir={getattr(runtime, 'markdown_output_dir', 'N/A')}",
         f"  output_pdf={getattr(runtime, 'output_pdf', False)}",
         f"  pdf_output_dir={getattr(runtime, 'pdf_output_dir', 'N/A')}",
+        f"  profiles={[profile.name for profile in getattr(config, 'profiles', [])]}",
     ]
 
 
@@ -128,18 +159,42 @@ def _cleanup_previous_run_data(
     print(f"[STEP] deleteLastFile enabled: cleaning up outputs and cache for today ({today_str})")
     cache.init_db()
     cache.clear_history_for_date(now_utc.date())
-    deleted_md = _delete_digest_outputs(markdown_output_dir, f"{today_stem}.md")
+    # The wildcard also matches per-profile digests (``<stem>_<profile>.md``).
+    deleted_md = _delete_digest_outputs(markdown_output_dir, f"{today_stem}*.md")
     print(f"[STEP] Deleted markdown digests: {deleted_md}")
     if output_pdf:
-        deleted_pdf = _delete_digest_outputs(pdf_output_dir, f"{today_stem}.pdf")
+        deleted_pdf = _delete_digest_outputs(pdf_output_dir, f"{today_stem}*.pdf")
         print(f"[STEP] Deleted pdf digests: {deleted_pdf}")
 
 
+def _fetch_query(config) -> QueryConfig:
+    """Query covering every profile, so one fetch serves them all.
+
+    Include keywords and categories are unioned; a keyword is only excluded
+    from the fetch when every profile excludes it.
+    """
+
+    profiles = getattr(config, "profiles", [])
+    if not profiles:
+        return config.query
+    queries = [profile.query for profile in profiles]
+    excluded = set(queries[0].exclude_keywords).intersection(*(query.exclude_keywords for query in queries[1:]))
+    return QueryConfig(
+        research_field=config.query.research_field,
+        include_keywords=list(dict.fromkeys(keyword for query in queries for keyword in query.include_keywords)),
+        exclude_keywords=[keyword for keyword in queries[0].exclude_keywords if keyword in excluded],
+        categories=list(dict.fromkeys(category for query in queries for category in query.categories)),
+    )
+
+
 def _build_source(config) -> SourceInterface:
-    query = config.query
+    query = _fetch_query(config)
     runtime = config.runtime
     enabled_sources = [item.lower() for item in runtime.enabled_sources]
     sources: list[SourceInterface] = []
+    http_archive = _build_http_archive(runtime)
+    # Replayed responses were recorded with a key; they do not need one now.
+    replay_key = "replay" if http_archive is not None and http_archive.is_offline else ""
 
     if "arxiv" in enabled_sources:
         sources.append(
@@ -150,11 +205,12 @@ def _build_source(config) -> SourceInterface:
                 categories=query.categories,
                 max_results=runtime.max_results,
                 window_days=runtime.window_days,
+                http_archive=http_archive,
             )
         )
 
     if "scopus" in enabled_sources:
-        scopus_key = os.getenv("SCOPUS_API_KEY", "").strip()
+        scopus_key = os.getenv("SCOPUS_API_KEY", "").strip() or replay_key
         if scopus_key:
             sources.append(
                 ScopusSource(
@@ -164,13 +220,14 @@ def _build_source(config) -> SourceInterface:
                     max_results=runtime.max_results,
                     window_days=runtime.window_days,
                     api_key=scopus_key,
+                    http_archive=http_archive,
                 )
             )
         else:
             print("[STEP] Skip source scopus: SCOPUS_API_KEY is not set")
 
     if "ieee_xplore" in enabled_sources or "ieee" in enabled_sources:
-        ieee_key = os.getenv("IEEE_API_KEY", "").strip()
+        ieee_key = os.getenv("IEEE_API_KEY", "").strip() or replay_key
         if ieee_key:
             sources.append(
                 IeeeXploreSource(
@@ -182,6 +239,7 @@ def _build_source(config) -> SourceInterface:
                     api_key=ieee_key,
                     start_year=getattr(runtime, "start_year", 2023),
                     end_year=getattr(runtime, "end_year", datetime.now(timezone.utc).year),
+                    http_archive=http_archive,
                 )
             )
         else:
@@ -199,6 +257,7 @@ def _build_source(config) -> SourceInterface:
                 request_pause_seconds=getattr(runtime, "ssrn_request_pause_seconds", 1.5),
                 timeout_seconds=getattr(runtime, "ssrn_timeout_seconds", 30),
                 feed_url=getattr(runtime, "ssrn_feed_url", "") or None,
+                http_archive=http_archive,
             )
         )
 
@@ -209,8 +268,106 @@ def _build_source(config) -> SourceInterface:
     return MultiSource(sources)
 
 
-def run_pipeline(config_path: str | None = None, delete_last_file: bool = False) -> dict:
-    """Build dependencies from config and execute one run."""
+def _build_http_archive(runtime) -> HttpArchive | None:
+    mode = getattr(runtime, "http_archive_mode", "off")
+    if mode == "off":
+        return None
+    print(f"[STEP] HTTP archive {mode}: {runtime.http_archive_path}")
+    return HttpArchive(
+        runtime.http_archive_path,
+        mode=mode,
+        simulate_latency=runtime.http_archive_simulate_latency,
+    )
+
+
+def _build_llm_client(config, usage_ledger: UsageLedger | None = None) -> AIModelClient | BatchModelClient:
+    runtime = config.runtime
+    if getattr(runtime, "llm_mode", "online") == "batch":
+        return _build_batch_client(runtime, usage_ledger)
+
+    endpoints = [
+        ModelEndpoint(url=item.url, api_key=os.getenv(item.api_key_env, ""), model=item.model)
+        for item in getattr(runtime, "llm_endpoints", [])
+    ]
+    return AIModelClient(
+        endpoints=endpoints or None,
+        hedge=getattr(runtime, "llm_hedge", False),
+        stream=getattr(runtime, "llm_stream", False),
+        max_stream_seconds=getattr(runtime, "llm_max_stream_seconds", None),
+        max_stream_tokens=getattr(runtime, "llm_max_stream_tokens", None),
+        usage_ledger=usage_ledger,
+    )
+
+
+def _build_batch_client(runtime, usage_ledger: UsageLedger | None) -> BatchModelClient:
+    api_key = os.getenv("AI_MODEL_API_KEY", "")
+    base_url = runtime.llm_batch_base_url or os.getenv("AI_MODEL_URL", "").split(",")[0].strip()
+    base_url = base_url.removesuffix("/chat/completions")
+    if not api_key or not base_url:
+        raise RuntimeError("Batch mode requires AI_MODEL_API_KEY and AI_MODEL_URL or runtime.llm.batch_base_url")
+    return BatchModelClient(
+        backend=OpenAIBatchBackend(api_key=api_key, base_url=base_url),
+        batch_dir=runtime.llm_batch_dir,
+        poll_seconds=runtime.llm_batch_poll_seconds,
+        usage_ledger=usage_ledger,
+    )
+
+
+def _build_embedding_store(runtime) -> EmbeddingStore:
+    db_path = Path(runtime.db_path)
+    return EmbeddingStore(db_path.with_name(f"{db_path.name}.vectors.f32"), dim=runtime.embedding_dim)
+
+
+def _build_ranker(
+    config,
+    llm_client,
+    max_prompt_tokens: int | None,
+    embedding_store: EmbeddingStore | None = None,
+    term_stats: TermStatsInterface | None = None,
+    query: QueryConfig | None = None,
+) -> RankerInterface:
+    runtime = config.runtime
+    query = query or config.query
+    if runtime.ranker_backend == "embedding":
+        print(f"[STEP] Ranker backend: embedding (dim={runtime.embedding_dim})")
+        return EmbeddingRanker(
+            research_field=query.research_field,
+            include_keywords=query.include_keywords,
+            exclude_keywords=query.exclude_keywords,
+            store=embedding_store or _build_embedding_store(runtime),
+        )
+    if runtime.ranker_backend != "llm":
+        raise ValueError(f"Unsupported ranker backend: {runtime.ranker_backend}")
+    return RelevanceRanker(
+        research_field=query.research_field,
+        include_keywords=query.include_keywords,
+        exclude_keywords=query.exclude_keywords,
+        model_name=runtime.model_name,
+        system_prompt=config.prompts.ranker_system,
+        user_prompt_template=config.prompts.ranker_user_template,
+        llm_client=llm_client,
+        max_prompt_tokens=max_prompt_tokens,
+        term_stats=term_stats,
+    )
+
+
+def run_pipeline(
+    config_path: str | None = None,
+    delete_last_file: bool = False,
+    on_progress: Callable[[dict], None] | None = None,
+    source: SourceInterface | None = None,
+    profile: str | None = None,
+) -> dict:
+    """Build dependencies from config and execute one run.
+
+    Args:
+        on_progress: Optional callback receiving progress events, such as
+            partial summaries while streamed completions arrive.
+        source: Optional source override, used by load tests to replace the
+            configured live sources with a synthetic one.
+        profile: Optional profiler mode (``cprofile`` or ``sample``). Profile
+            artifacts are written to ``profile/`` next to the digest folder.
+    """
 
     effective_config_path = Path(config_path) if config_path else DEFAULT_CONFIG_PATH
     config = load_config(effective_config_path)
@@ -218,6 +375,24 @@ def run_pipeline(config_path: str | None = None, delete_last_file: bool = False)
     for line in _build_runtime_log_lines(config):
         print(line)
 
+    if not profile:
+        return _execute_pipeline(config, delete_last_file, on_progress, source)
+
+    profile_dir = Path(config.runtime.markdown_output_dir).parent / "profile"
+    result, report = profile_call(
+        lambda: _execute_pipeline(config, delete_last_file, on_progress, source),
+        mode=profile,
+        output_dir=profile_dir,
+    )
+    return {**result, "profile": report}
+
+
+def _execute_pipeline(
+    config,
+    delete_last_file: bool,
+    on_progress: Callable[[dict], None] | None,
+    source: SourceInterface | None,
+) -> dict:
     now_utc = datetime.now(timezone.utc)
     cache = SQLiteCache(config.runtime.db_path)
     _cleanup_previous_run_data(
@@ -229,19 +404,79 @@ def run_pipeline(config_path: str | None = None, delete_last_file: bool = False)
         now=now_utc,
     )
 
-    source = _build_source(config)
-    ranker = RelevanceRanker(
-        research_field=config.query.research_field,
-        include_keywords=config.query.include_keywords,
-        exclude_keywords=config.query.exclude_keywords,
-        model_name=config.runtime.model_name,
-        system_prompt=config.prompts.ranker_system,
-        user_prompt_template=config.prompts.ranker_user_template,
-    )
+    with ExitStack() as resources:
+        pipeline = _build_pipeline(config, cache, on_progress, source, resources)
+        print("[STEP] Pipeline execution started")
+        result = pipeline.run(now=now_utc)
+    return _result_payload(result)
+
+
+def run_backfill(
+    start: date,
+    end: date,
+    config_path: str | None = None,
+    source: SourceInterface | None = None,
+) -> Iterator[dict]:
+    """Build dependencies from config and yield one result per backfilled day.
+
+    Args:
+        start: First day of the range (inclusive).
+        end: Last day of the range (inclusive).
+        source: Optional source override; it must provide ``search_range``.
+    """
+
+    if start > end:
+        raise ValueError(f"Backfill start {start} is after end {end}")
+    effective_config_path = Path(config_path) if config_path else DEFAULT_CONFIG_PATH
+    config = load_config(effective_config_path)
+    print(f"[STEP] Loading configuration from {effective_config_path.resolve()}")
+    for line in _build_runtime_log_lines(config):
+        print(line)
+
+    with ExitStack() as resources:
+        pipeline = _build_pipeline(config, SQLiteCache(config.runtime.db_path), None, source, resources)
+        for day, result in pipeline.backfill(start, end, workers=config.runtime.backfill_workers):
+            yield {"date": day.isoformat(), **_result_payload(result)}
+
+
+def _build_pipeline(
+    config,
+    cache: SQLiteCache,
+    on_progress: Callable[[dict], None] | None,
+    source: SourceInterface | None,
+    resources: ExitStack,
+) -> DailyPaperPipeline:
+    """Wire the pipeline from config; clients that hold threads are closed with ``resources``."""
+
+    source = source or _build_source(config)
+    usage_ledger = UsageLedger()
+    llm_client = _build_llm_client(config, usage_ledger=usage_ledger)
+    if isinstance(llm_client, AIModelClient):
+        resources.callback(llm_client.close)
+    max_prompt_tokens = config.runtime.llm_max_prompt_tokens
+    embedding_store = None
+    if config.runtime.ranker_backend == "embedding" or config.runtime.related_papers_k > 0:
+        embedding_store = _build_embedding_store(config.runtime)
+    ranker = _build_ranker(config, llm_client, max_prompt_tokens, embedding_store, term_stats=cache)
+    profiles = [
+        DigestProfile(
+            name=profile.name,
+            ranker=_build_ranker(
+                config, llm_client, max_prompt_tokens, embedding_store, term_stats=cache, query=profile.query
+            ),
+            top_k=profile.top_k,
+        )
+        for profile in config.profiles
+    ]
     summarizer = PaperSummarizer(
         model_name=config.runtime.model_name,
         system_prompt=config.prompts.summarizer_system,
         user_prompt_template=config.prompts.summarizer_user_template,
+        llm_client=llm_client,
+        on_partial=_partial_summary_reporter(on_progress),
+        max_prompt_tokens=max_prompt_tokens,
+        batch_size=config.runtime.summary_batch_size,
+        batch_user_prompt_template=config.prompts.summarizer_batch_user_template,
     )
     renderer = MarkdownRenderer()
     writer = MarkdownWriter(
@@ -250,6 +485,30 @@ def run_pipeline(config_path: str | None = None, delete_last_file: bool = False)
         output_pdf=config.runtime.output_pdf,
     )
 
+    near_duplicate_filter = None
+    if config.runtime.near_duplicate_enabled:
+        near_duplicate_filter = NearDuplicateDetector(
+            cache,
+            threshold=config.runtime.near_duplicate_threshold,
+            num_perm=config.runtime.near_duplicate_num_perm,
+            bands=config.runtime.near_duplicate_bands,
+        )
+
+    retention_policy = RetentionPolicy(
+        paper_days=config.runtime.retention_paper_days,
+        digest_days=config.runtime.retention_digest_days,
+        vacuum_pages=config.runtime.retention_vacuum_pages,
+    )
+
+    related_finder = None
+    if embedding_store is not None and config.runtime.related_papers_k > 0:
+        related_finder = RelatedPaperFinder(
+            cache,
+            embedding_store,
+            k=config.runtime.related_papers_k,
+            min_similarity=config.runtime.related_papers_min_similarity,
+        )
+
     pipeline = DailyPaperPipeline(
         source=source,
         ranker=ranker,
@@ -262,26 +521,52 @@ def run_pipeline(config_path: str | None = None, delete_last_file: bool = False)
         window_days=config.runtime.window_days,
         model_used=config.runtime.model_name,
         require_llm=config.runtime.require_llm,
-        llm_enabled=ranker.llm_client.enabled,
+        llm_enabled=llm_client.enabled,
+        usage_ledger=usage_ledger,
+        near_duplicate_filter=near_duplicate_filter,
+        retention_policy=retention_policy if retention_policy.enabled else None,
+        related_finder=related_finder,
+        profiles=profiles,
     )
+    return pipeline
+
 
-    print("[STEP] Pipeline execution started")
-    result = pipeline.run(now=now_utc)
+def _result_payload(result: PipelineRunResult) -> dict:
     return {
         "generated": result.generated,
         "summary_count": result.summary_count,
         "output_path": result.output_path,
         "skipped_reason": result.skipped_reason,
         "emitted_ids": result.emitted_ids,
+        "profile_outputs": result.profile_outputs,
     }
 
 
+def _partial_summary_reporter(on_progress: Callable[[dict], None] | None):
+    if on_progress is None:
+        return None
+
+    def report(external_id: str, partial: dict) -> None:
+        on_progress({"type": "partial_summary", "external_id": external_id, "summary": partial})
+
+    return report
+
+
 def main() -> None:
     """CLI main function."""
 
     args = _build_arg_parser()
 
-    result = run_pipeline(config_path=args.config, delete_last_file=args.delete_last_file)
+    if args.backfill:
+        for result in run_backfill(*args.backfill, config_path=args.config):
+            day = result["date"]
+            if result["generated"]:
+                print(f"Generated digest for {day}: {result['summary_count']} papers -> {result['output_path']}")
+            else:
+                print(f"No digest generated for {day}: {result.get('skipped_reason') or 'No output'}")
+        return
+
+    result = run_pipeline(config_path=args.config, delete_last_file=args.delete_last_file, profile=args.profile)
     if result["generated"]:
         print(f"Generated digest: {result['summary_count']} papers -> {result['output_path']}")
     else:
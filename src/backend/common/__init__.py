@@ -2,20 +2,32 @@
 
 from backend.common.protocols import (
     CacheInterface,
+    NearDuplicateFilterInterface,
+    RangeBatchSourceInterface,
+    RangeSourceInterface,
     RankerInterface,
+    RelatedPaperFinderInterface,
     RendererInterface,
+    RetentionPolicyInterface,
     SourceInterface,
     SummarizerInterface,
+    TermStatsInterface,
     WriterInterface,
 )
 from backend.common.utils import extract_code_urls
 
 __all__ = [
     "CacheInterface",
+    "NearDuplicateFilterInterface",
+    "RangeBatchSourceInterface",
+    "RangeSourceInterface",
     "RankerInterface",
+    "RelatedPaperFinderInterface",
     "RendererInterface",
+    "RetentionPolicyInterface",
     "SourceInterface",
     "SummarizerInterface",
+    "TermStatsInterface",
     "WriterInterface",
     "extract_code_urls",
 ]
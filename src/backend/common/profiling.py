@@ -0,0 +1,127 @@
+"""Opt-in profiling of one pipeline run.
+
+``cprofile`` records deterministic call statistics; ``sample`` polls every
+thread's stack on a timer and writes folded stacks (one ``frame;frame count``
+line per unique stack, readable by flamegraph.pl and speedscope). Both modes
+also capture the ``tracemalloc`` peak and top allocation sites.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TypeVar
+
+PROFILE_MODES = {"cprofile", "sample"}
+SAMPLE_INTERVAL_SECONDS = 0.005
+
+T = TypeVar("T")
+
+
+class StackSampler:
+    """Background thread that counts folded stacks of all other threads."""
+
+    def __init__(self, interval_seconds: float = SAMPLE_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="stack-sampler")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def profile_call(func: Callable[[], T], mode: str, output_dir: str | Path) -> tuple[T, dict]:
+    """Run ``func`` under the chosen profiler and write artifacts.
+
+    Returns:
+        The function result and a report dict with wall time, peak memory
+        and artifact paths. Artifacts are written even if ``func`` raises.
+    """
+
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unsupported profile mode: {mode}")
+
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = datetime.now(timezone.utc).strftime("%m%d_%H%M%S")
+    report: dict = {"mode": mode, "artifacts": []}
+
+    profiler = cProfile.Profile() if mode == "cprofile" else None
+    sampler = StackSampler() if mode == "sample" else None
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        if sampler is not None:
+            sampler.start()
+        return func(), report
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if sampler is not None:
+            sampler.stop()
+        report["wall_seconds"] = round(time.perf_counter() - started, 4)
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        report["peak_memory_bytes"] = peak
+        report["top_allocations"] = [
+            {"site": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:15]
+        ]
+
+        if profiler is not None:
+            prof_path = directory / f"{stem}_papers.prof"
+            profiler.dump_stats(prof_path)
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(40)
+            text_path = directory / f"{stem}_papers_profile.txt"
+            text_path.write_text(text.getvalue(), encoding="utf-8")
+            report["artifacts"] += [str(prof_path), str(text_path)]
+        if sampler is not None:
+            folded_path = directory / f"{stem}_papers.folded"
+            folded_path.write_text(sampler.folded(), encoding="utf-8")
+            report["samples"] = sampler.samples
+            report["artifacts"].append(str(folded_path))
+
+        report_path = directory / f"{stem}_papers_profile.json"
+        report["artifacts"].append(str(report_path))
+        report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(
+            f"[STEP] Profile ({mode}) written: wall={report['wall_seconds']}s, "
+            f"peak_memory={peak / 1024 / 1024:.1f}MiB, report={report_path}"
+        )
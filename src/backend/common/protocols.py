@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime
 from typing import Protocol
 
-from backend.paper_process.paper import PaperCandidate, PaperSummary
+from backend.models.tokens import UsageRecord
+from backend.paper_process.batch import CandidateBatch
+from backend.paper_process.bm25 import CorpusStats
+from backend.paper_process.paper import PaperCandidate, PaperSummary, RelatedPaper
 
 
 class SourceInterface(Protocol):
@@ -14,10 +18,32 @@ class SourceInterface(Protocol):
     def search_recent(self) -> list[PaperCandidate]: ...
 
 
+class RangeSourceInterface(Protocol):
+    """Source that can stream a past date range, newest first."""
+
+    def search_range(self, start: date, end: date) -> Iterator[PaperCandidate]: ...
+
+
+class RangeBatchSourceInterface(Protocol):
+    """Range source that streams one columnar batch per published day, newest first."""
+
+    def search_range_batches(self, start: date, end: date) -> Iterator[CandidateBatch]: ...
+
+
 class RankerInterface(Protocol):
     """Candidate ranker interface."""
 
-    def rank(self, candidates: list[PaperCandidate]) -> list[tuple[PaperCandidate, float, str]]: ...
+    def rank(
+        self,
+        candidates: list[PaperCandidate],
+        top_k: int | None = None,
+    ) -> list[tuple[PaperCandidate, float, str]]: ...
+
+
+class TermStatsInterface(Protocol):
+    """Corpus statistics source for BM25 scoring."""
+
+    def fetch_term_stats(self, terms: Iterable[str]) -> CorpusStats: ...
 
 
 class SummarizerInterface(Protocol):
@@ -30,6 +56,8 @@ class SummarizerInterface(Protocol):
         relevance_reason: str,
     ) -> PaperSummary: ...
 
+    def summarize_many(self, ranked: list[tuple[PaperCandidate, float, str]]) -> list[PaperSummary]: ...
+
 
 class CacheInterface(Protocol):
     """Cache interface used by pipeline."""
@@ -40,7 +68,17 @@ class CacheInterface(Protocol):
 
     def fetch_seen_keys(self) -> tuple[set[str], set[str]]: ...
 
-    def upsert_paper(self, **kwargs: str) -> None: ...
+    def fetch_seen_keys_for(
+        self,
+        external_ids: list[str],
+        title_norms: list[str],
+    ) -> tuple[set[str], set[str]]: ...
+
+    def upsert_papers(self, rows: Iterable[dict[str, str]]) -> None: ...
+
+    def fetch_identity_keys(self, identifiers: list[str]) -> dict[str, str]: ...
+
+    def record_identities(self, paper_key: str, identifiers: list[str]) -> None: ...
 
     def clear_history(self) -> None: ...
 
@@ -58,6 +96,18 @@ class CacheInterface(Protocol):
         items: list[str],
     ) -> int: ...
 
+    def record_summaries(self, run_at: datetime, summaries: list[PaperSummary]) -> None: ...
+
+    def record_llm_usage(self, run_at: datetime, records: list[UsageRecord]) -> None: ...
+
+
+class NearDuplicateFilterInterface(Protocol):
+    """Near-duplicate filter backed by persisted signatures."""
+
+    def filter(self, candidates: list[PaperCandidate]) -> list[PaperCandidate]: ...
+
+    def remember(self, candidates: list[PaperCandidate]) -> None: ...
+
 
 class RendererInterface(Protocol):
     """Renderer interface for digest generation."""
@@ -68,4 +118,16 @@ class RendererInterface(Protocol):
 class WriterInterface(Protocol):
     """Writer interface for digest output."""
 
-    def write(self, run_date: date, text: str) -> str: ...
+    def write(self, run_date: date, text: str, name: str | None = None) -> str: ...
+
+
+class RetentionPolicyInterface(Protocol):
+    """Cache maintenance applied after a successful run."""
+
+    def apply(self, cache, now: datetime) -> dict[str, int]: ...
+
+
+class RelatedPaperFinderInterface(Protocol):
+    """Lookup of similar previously digested papers."""
+
+    def find_related(self, candidates: list[PaperCandidate]) -> dict[str, list[RelatedPaper]]: ...
@@ -3,6 +3,7 @@
 from backend.config.paper_config import (
     AppConfig,
     DEFAULT_CONFIG_PATH,
+    LlmEndpointConfig,
     PromptConfig,
     QueryConfig,
     RuntimeConfig,
@@ -13,6 +14,7 @@ from backend.config.web_config import ROOT_DIR, WebAppConfig
 __all__ = [
     "AppConfig",
     "DEFAULT_CONFIG_PATH",
+    "LlmEndpointConfig",
     "PromptConfig",
     "QueryConfig",
     "ROOT_DIR",
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import re
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -18,6 +19,27 @@ class QueryConfig:
     categories: list[str] = field(default_factory=lambda: ["cs.AI", "cs.LG", "stat.ML"])
 
 
+@dataclass(slots=True)
+class ProfileConfig:
+    """One research profile of a multi-profile run; ``name`` suffixes its digest file."""
+
+    name: str
+    query: QueryConfig
+    top_k: int | None = None
+
+
+PROFILE_NAME_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+
+@dataclass(slots=True)
+class LlmEndpointConfig:
+    """One LLM endpoint entry; the API key is read from ``api_key_env``."""
+
+    url: str
+    model: str | None = None
+    api_key_env: str = "AI_MODEL_API_KEY"
+
+
 @dataclass(slots=True)
 class RuntimeConfig:
     """Runtime behavior configuration."""
@@ -39,6 +61,41 @@ class RuntimeConfig:
     ssrn_timeout_seconds: int = 30
     ssrn_feed_url: str = ""
     require_llm: bool = False
+    llm_stream: bool = False
+    llm_max_stream_seconds: float | None = None
+    llm_max_stream_tokens: int | None = None
+    llm_endpoints: list[LlmEndpointConfig] = field(default_factory=list)
+    llm_hedge: bool = False
+    llm_context_window_tokens: int | None = None
+    llm_completion_reserve_tokens: int = 4096
+    summary_batch_size: int = 1
+    llm_mode: str = "online"
+    llm_batch_dir: str = "newspaper/batches"
+    llm_batch_poll_seconds: float = 60.0
+    llm_batch_base_url: str = ""
+    http_archive_mode: str = "off"
+    http_archive_path: str = "cache/http_archive.zip"
+    http_archive_simulate_latency: bool = False
+    near_duplicate_enabled: bool = True
+    near_duplicate_threshold: float = 0.7
+    near_duplicate_num_perm: int = 64
+    near_duplicate_bands: int = 16
+    retention_paper_days: int | None = None
+    retention_digest_days: int | None = None
+    retention_vacuum_pages: int | None = None
+    ranker_backend: str = "llm"
+    embedding_dim: int = 512
+    related_papers_k: int = 3
+    related_papers_min_similarity: float = 0.3
+    backfill_workers: int = 2
+
+    @property
+    def llm_max_prompt_tokens(self) -> int | None:
+        """Prompt budget left after reserving room for the completion."""
+
+        if self.llm_context_window_tokens is None:
+            return None
+        return max(0, self.llm_context_window_tokens - self.llm_completion_reserve_tokens)
 
 
 @dataclass(slots=True)
@@ -66,6 +123,14 @@ class PromptConfig:
         "Paper JSON:\n"
         "{paper_json}"
     )
+    summarizer_batch_user_template: str = (
+        "Read these papers and summarize each one in English. Return JSON only with key 'items', "
+        "a list with one object per paper, each with keys: external_id, title, authors, affiliations, "
+        "code_urls, problem, approach, methodological_novelty, empirical_novelty, "
+        "tell_someone_in_4_5_sentences.\n\n"
+        "Papers JSON:\n"
+        "{papers_json}"
+    )
 
 
 @dataclass(slots=True)
@@ -75,6 +140,7 @@ class AppConfig:
     query: QueryConfig
     runtime: RuntimeConfig = field(default_factory=RuntimeConfig)
     prompts: PromptConfig = field(default_factory=PromptConfig)
+    profiles: list[ProfileConfig] = field(default_factory=list)
 
 
 DEFAULT_CONFIG_PATH = Path("config/default_config.json")
@@ -111,6 +177,13 @@ def load_config(path: str | Path | None = None) -> AppConfig:
 
     runtime_data = data.get("runtime", {})
     ssrn_data = runtime_data.get("ssrn", {})
+    llm_data = runtime_data.get("llm", {})
+    archive_data = runtime_data.get("http_archive", {})
+    near_duplicate_data = runtime_data.get("near_duplicate", {})
+    retention_data = runtime_data.get("retention", {})
+    ranker_data = runtime_data.get("ranker", {})
+    related_data = runtime_data.get("related_papers", {})
+    backfill_data = runtime_data.get("backfill", {})
     runtime = RuntimeConfig(
         enabled_sources=list(runtime_data.get("enabled_sources", ["arxiv"])),
         markdown_output_dir=runtime_data.get(
@@ -137,6 +210,44 @@ def load_config(path: str | Path | None = None) -> AppConfig:
         ssrn_timeout_seconds=int(ssrn_data.get("timeout_seconds", runtime_data.get("ssrn_timeout_seconds", 30))),
         ssrn_feed_url=ssrn_data.get("feed_url", runtime_data.get("ssrn_feed_url", "")),
         require_llm=bool(runtime_data.get("require_llm", False)),
+        llm_stream=bool(llm_data.get("stream", runtime_data.get("llm_stream", False))),
+        llm_max_stream_seconds=_optional_float(
+            llm_data.get("max_stream_seconds", runtime_data.get("llm_max_stream_seconds"))
+        ),
+        llm_max_stream_tokens=_optional_int(
+            llm_data.get("max_stream_tokens", runtime_data.get("llm_max_stream_tokens"))
+        ),
+        llm_endpoints=[
+            LlmEndpointConfig(
+                url=item["url"],
+                model=item.get("model"),
+                api_key_env=item.get("api_key_env", "AI_MODEL_API_KEY"),
+            )
+            for item in llm_data.get("endpoints", [])
+        ],
+        llm_hedge=bool(llm_data.get("hedge", False)),
+        llm_context_window_tokens=_optional_int(llm_data.get("context_window_tokens")),
+        llm_completion_reserve_tokens=int(llm_data.get("completion_reserve_tokens", 4096)),
+        summary_batch_size=int(llm_data.get("summary_batch_size", 1)),
+        llm_mode=llm_data.get("mode", "online"),
+        llm_batch_dir=llm_data.get("batch_dir", "newspaper/batches"),
+        llm_batch_poll_seconds=float(llm_data.get("batch_poll_seconds", 60.0)),
+        llm_batch_base_url=llm_data.get("batch_base_url", ""),
+        http_archive_mode=archive_data.get("mode", runtime_data.get("http_archive_mode", "off")),
+        http_archive_path=archive_data.get("path", runtime_data.get("http_archive_path", "cache/http_archive.zip")),
+        http_archive_simulate_latency=bool(archive_data.get("simulate_latency", False)),
+        near_duplicate_enabled=bool(near_duplicate_data.get("enabled", True)),
+        near_duplicate_threshold=float(near_duplicate_data.get("threshold", 0.7)),
+        near_duplicate_num_perm=int(near_duplicate_data.get("num_perm", 64)),
+        near_duplicate_bands=int(near_duplicate_data.get("bands", 16)),
+        retention_paper_days=_optional_int(retention_data.get("paper_days")),
+        retention_digest_days=_optional_int(retention_data.get("digest_days")),
+        retention_vacuum_pages=_optional_int(retention_data.get("vacuum_pages")),
+        ranker_backend=ranker_data.get("backend", "llm"),
+        embedding_dim=int(ranker_data.get("embedding_dim", 512)),
+        related_papers_k=int(related_data.get("k", 3)),
+        related_papers_min_similarity=float(related_data.get("min_similarity", 0.3)),
+        backfill_workers=max(1, int(backfill_data.get("workers", 2))),
     )
 
     prompt_data = data.get("prompts", {})
@@ -157,6 +268,41 @@ def load_config(path: str | Path | None = None) -> AppConfig:
             "summarizer_user_template",
             PromptConfig.summarizer_user_template,
         ),
+        summarizer_batch_user_template=prompt_data.get(
+            "summarizer_batch_user_template",
+            PromptConfig.summarizer_batch_user_template,
+        ),
     )
 
-    return AppConfig(query=query, runtime=runtime, prompts=prompts)
+    profiles = [_load_profile(item, query) for item in data.get("profiles", [])]
+    names = [item.name for item in profiles]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Profile names must be unique: {names}")
+
+    return AppConfig(query=query, runtime=runtime, prompts=prompts, profiles=profiles)
+
+
+def _load_profile(data: dict, base_query: QueryConfig) -> ProfileConfig:
+    name = str(data.get("name", ""))
+    if not PROFILE_NAME_PATTERN.fullmatch(name):
+        raise ValueError(f"Profile name must match {PROFILE_NAME_PATTERN.pattern}: {name!r}")
+    if "research_field" not in data:
+        raise ValueError(f"Profile {name} must contain research_field")
+    return ProfileConfig(
+        name=name,
+        query=QueryConfig(
+            research_field=data["research_field"],
+            include_keywords=list(data.get("include_keywords", [])),
+            exclude_keywords=list(data.get("exclude_keywords", [])),
+            categories=list(data.get("categories", base_query.categories)),
+        ),
+        top_k=_optional_int(data.get("top_k")),
+    )
+
+
+def _optional_float(value) -> float | None:
+    return None if value is None else float(value)
+
+
+def _optional_int(value) -> int | None:
+    return None if value is None else int(value)
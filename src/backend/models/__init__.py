@@ -1,7 +1,8 @@
 """Model-adjacent clients and exports for backend workflows."""
 
-from backend.models.ai_model_client import AIModelClient
+from backend.models.ai_model_client import AIModelClient, ModelEndpoint
 
 __all__ = [
     "AIModelClient",
+    "ModelEndpoint",
 ]
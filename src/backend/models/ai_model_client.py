@@ -4,23 +4,138 @@ from __future__ import annotations
 
 import json
 import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from threading import Lock
 from urllib.request import Request, urlopen
 
+from backend.models.tokens import (
+    UsageLedger,
+    UsageRecord,
+    current_usage_stage,
+    estimate_chat_tokens,
+    estimate_tokens,
+)
+
+LATENCY_WINDOW = 50
+
+
+class StreamBudgetExceeded(RuntimeError):
+    """Raised when a streamed completion exceeds its time or token budget."""
+
+    def __init__(self, message: str, stats: StreamStats | None = None):
+        super().__init__(message)
+        self.stats = stats
+
+
+@dataclass(slots=True)
+class StreamStats:
+    """Timing metadata captured from one streamed completion."""
+
+    time_to_first_token: float | None
+    total_seconds: float
+    chunk_count: int
+    # ``estimate_tokens`` summed over content deltas; what ``max_stream_tokens`` is checked against.
+    estimated_tokens: int = 0
+    aborted: bool = False
+
+
+@dataclass(slots=True)
+class ModelEndpoint:
+    """One OpenAI-compatible endpoint in the client's failover order."""
+
+    url: str
+    api_key: str = ""
+    model: str | None = None
+
+
+@dataclass(slots=True)
+class EndpointHealth:
+    """Rolling health and latency state for one endpoint."""
+
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def p95(self, min_samples: int) -> float | None:
+        if len(self.latencies) < min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
 
 class AIModelClient:
-    """HTTP client for OpenAI-compatible chat completion endpoints."""
+    """HTTP client for OpenAI-compatible chat completion endpoints.
+
+    Endpoints are tried in their configured order. An endpoint that fails
+    ``failure_threshold`` times in a row is parked for ``cooldown_seconds``
+    and the next one takes over. With ``hedge=True`` a second request is sent
+    to the next endpoint once the first has been pending longer than its
+    observed p95 latency, and whichever answers first wins. Call ``close``
+    (or use the client as a context manager) to release the hedging threads.
+    """
 
-    def __init__(self, api_key: str | None = None, endpoint: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        endpoint: str | None = None,
+        stream: bool = False,
+        max_stream_seconds: float | None = None,
+        max_stream_tokens: int | None = None,
+        endpoints: list[ModelEndpoint] | None = None,
+        hedge: bool = False,
+        hedge_min_samples: int = 5,
+        failure_threshold: int = 2,
+        cooldown_seconds: float = 60.0,
+        usage_ledger: UsageLedger | None = None,
+    ):
         self.api_key = api_key or os.getenv("AI_MODEL_API_KEY", "")
-        self.endpoint = endpoint or os.getenv("AI_MODEL_URL", "")
+        if endpoints is None:
+            urls = endpoint or os.getenv("AI_MODEL_URL", "")
+            endpoints = [ModelEndpoint(url=url.strip()) for url in urls.split(",") if url.strip()]
+        self.endpoints = [
+            ModelEndpoint(url=item.url, api_key=item.api_key or self.api_key, model=item.model) for item in endpoints
+        ]
+        self.endpoint = self.endpoints[0].url if self.endpoints else ""
+        self.stream = stream
+        self.max_stream_seconds = max_stream_seconds
+        self.max_stream_tokens = max_stream_tokens
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.usage_ledger = usage_ledger
+        self.last_stream_stats: StreamStats | None = None
+        self.health = {item.url: EndpointHealth() for item in self.endpoints}
+        self._health_lock = Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def __enter__(self) -> AIModelClient:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the hedging worker threads, if any were started."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
     @property
     def enabled_api_key(self) -> bool:
-        return bool(self.api_key)
+        return any(item.api_key for item in self.endpoints) if self.endpoints else bool(self.api_key)
 
     @property
     def enabled_endpoint(self) -> bool:
-        return bool(self.endpoint)
+        return bool(self.endpoints)
 
     @property
     def enabled(self) -> bool:
@@ -32,11 +147,21 @@ class AIModelClient:
         system_prompt: str,
         user_prompt: str,
         temperature: float = 0.1,
+        on_partial: Callable[[dict], None] | None = None,
     ) -> dict:
         """Send chat completion request and parse JSON output.
 
+        Args:
+            on_partial: Optional callback receiving best-effort partial JSON
+                while a streamed completion is still arriving. Only used when
+                the client runs in stream mode.
+
         Returns:
             Parsed JSON dict from assistant content.
+
+        Raises:
+            RuntimeError: If the client is not configured or every endpoint
+                failed.
         """
 
         if not self.enabled_api_key:
@@ -53,22 +178,354 @@ class AIModelClient:
                 {"role": "user", "content": user_prompt},
             ],
         }
+        if self.stream:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+            if self.max_stream_tokens is not None:
+                payload["max_tokens"] = self.max_stream_tokens
+
+        call_context = {
+            "stage": current_usage_stage(),
+            "estimated_prompt_tokens": estimate_chat_tokens(system_prompt, user_prompt),
+        }
+        ordered = self._ordered_endpoints()
+        errors: list[str] = []
+        index = 0
+        while index < len(ordered):
+            primary = ordered[index]
+            backup = ordered[index + 1] if index + 1 < len(ordered) else None
+            hedge_after = self._hedge_delay(primary) if backup is not None else None
+            try:
+                if hedge_after is None:
+                    result, stats = self._call_endpoint(primary, payload, on_partial, **call_context)
+                else:
+                    result, stats = self._call_hedged(primary, backup, payload, on_partial, hedge_after, call_context)
+            except StreamBudgetExceeded as exc:
+                self.last_stream_stats = exc.stats
+                raise
+            except Exception as exc:
+                # Hedged failures already name the endpoint each error came from.
+                errors.append(str(exc) if hedge_after is not None else f"{primary.url}: {exc}")
+                index += 1 if hedge_after is None else 2
+                continue
+            if stats is not None:
+                self.last_stream_stats = stats
+            return result
+
+        raise RuntimeError("All AI model endpoints failed: " + "; ".join(errors))
+
+    def _ordered_endpoints(self) -> list[ModelEndpoint]:
+        now = time.monotonic()
+        with self._health_lock:
+            available = [item for item in self.endpoints if self.health[item.url].is_available(now)]
+            parked = [item for item in self.endpoints if not self.health[item.url].is_available(now)]
+        return available + parked
+
+    def _hedge_delay(self, endpoint: ModelEndpoint) -> float | None:
+        if not self.hedge:
+            return None
+        with self._health_lock:
+            return self.health[endpoint.url].p95(self.hedge_min_samples)
+
+    def _call_hedged(
+        self,
+        primary: ModelEndpoint,
+        backup: ModelEndpoint,
+        payload: dict,
+        on_partial: Callable[[dict], None] | None,
+        hedge_after: float,
+        call_context: dict,
+    ) -> tuple[dict, StreamStats | None]:
+        """Race ``primary`` against a delayed ``backup`` and return the first success.
+
+        Raises:
+            StreamBudgetExceeded: As soon as either request exceeds its budget,
+                matching the non-hedged path.
+            RuntimeError: When both fail, naming each endpoint's own error.
+        """
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-model-hedge")
+
+        started = {self._executor.submit(self._call_endpoint, primary, payload, on_partial, **call_context): primary}
+        errors: list[str] = []
+
+        def settle(done) -> tuple[dict, StreamStats | None] | None:
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    return future.result()
+                if isinstance(error, StreamBudgetExceeded):
+                    raise error
+                errors.append(f"{started[future].url}: {error}")
+            return None
+
+        done, pending = wait(set(started), timeout=hedge_after)
+        winner = settle(done)
+        if winner is not None:
+            return winner
 
+        backup_future = self._executor.submit(self._call_endpoint, backup, payload, None, **call_context)
+        started[backup_future] = backup
+        pending.add(backup_future)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = settle(done)
+            if winner is not None:
+                return winner
+        raise RuntimeError("; ".join(errors))
+
+    def _call_endpoint(
+        self,
+        endpoint: ModelEndpoint,
+        payload: dict,
+        on_partial: Callable[[dict], None] | None,
+        stage: str = "unknown",
+        estimated_prompt_tokens: int = 0,
+    ) -> tuple[dict, StreamStats | None]:
+        """Call one endpoint; returns the parsed JSON and, when streaming, its stream stats."""
+
+        body = dict(payload, model=endpoint.model or payload["model"])
         request = Request(
-            self.endpoint,
-            data=json.dumps(payload).encode("utf-8"),
+            endpoint.url,
+            data=json.dumps(body).encode("utf-8"),
             headers={
-                "Authorization": f"Bearer {self.api_key}",
+                "Authorization": f"Bearer {endpoint.api_key}",
                 "Content-Type": "application/json",
             },
             method="POST",
         )
 
-        with urlopen(request, timeout=60) as response:
-            body = json.loads(response.read().decode("utf-8"))
+        started = time.monotonic()
+        stats = None
+        try:
+            if self.stream:
+                result, usage, completion_estimate, stats = self._read_stream(request, on_partial=on_partial)
+            else:
+                with urlopen(request, timeout=60) as response:
+                    response_body = json.loads(response.read().decode("utf-8"))
+                content = response_body["choices"][0]["message"]["content"]
+                result = _extract_json(content)
+                usage = response_body.get("usage")
+                completion_estimate = estimate_tokens(content)
+        except StreamBudgetExceeded:
+            raise
+        except Exception:
+            self._mark_failure(endpoint)
+            raise
+
+        self._mark_success(endpoint, time.monotonic() - started)
+        if self.usage_ledger is not None:
+            usage = usage or {}
+            self.usage_ledger.record(
+                UsageRecord(
+                    stage=stage,
+                    model=body["model"],
+                    endpoint=endpoint.url,
+                    prompt_tokens=int(usage.get("prompt_tokens") or estimated_prompt_tokens),
+                    completion_tokens=int(usage.get("completion_tokens") or completion_estimate),
+                    estimated_prompt_tokens=estimated_prompt_tokens,
+                )
+            )
+        return result, stats
+
+    def _mark_success(self, endpoint: ModelEndpoint, latency: float) -> None:
+        with self._health_lock:
+            health = self.health[endpoint.url]
+            health.consecutive_failures = 0
+            health.cooldown_until = 0.0
+            health.latencies.append(latency)
+
+    def _mark_failure(self, endpoint: ModelEndpoint) -> None:
+        with self._health_lock:
+            health = self.health[endpoint.url]
+            health.consecutive_failures += 1
+            if health.consecutive_failures >= self.failure_threshold:
+                health.cooldown_until = time.monotonic() + self.cooldown_seconds
+
+    def _read_stream(
+        self,
+        request: Request,
+        on_partial: Callable[[dict], None] | None,
+    ) -> tuple[dict, dict | None, int, StreamStats]:
+        """Consume an SSE completion stream and assemble the JSON content.
+
+        Stats are returned (or attached to ``StreamBudgetExceeded``) rather
+        than stored, so racing hedged requests cannot overwrite each other.
+
+        Returns:
+            Parsed JSON content, the ``usage`` object if the endpoint sent one,
+            the estimated completion tokens received and the stream stats.
+        """
+
+        started = time.perf_counter()
+        first_token_at: float | None = None
+        chunk_count = 0
+        estimated_tokens = 0
+        parser = IncrementalJsonParser()
+        last_partial: dict | None = None
+        usage: dict | None = None
+
+        try:
+            with urlopen(request, timeout=60) as response:
+                for event in _iter_sse_events(response):
+                    usage = event.get("usage") or usage
+                    delta = _event_content(event)
+                    if not delta:
+                        continue
+                    now = time.perf_counter()
+                    if first_token_at is None:
+                        first_token_at = now - started
+                    chunk_count += 1
+                    # A delta may hold several tokens (or none), so budget on its text, not the chunk count.
+                    estimated_tokens += estimate_tokens(delta)
+
+                    partial = parser.feed(delta)
+                    if on_partial is not None and partial is not None and partial != last_partial:
+                        last_partial = partial
+                        on_partial(partial)
+
+                    if self.max_stream_seconds is not None and now - started > self.max_stream_seconds:
+                        raise StreamBudgetExceeded(
+                            f"Streamed completion exceeded {self.max_stream_seconds:.1f}s budget"
+                        )
+                    if self.max_stream_tokens is not None and estimated_tokens > self.max_stream_tokens:
+                        raise StreamBudgetExceeded(
+                            f"Streamed completion exceeded {self.max_stream_tokens} token budget"
+                        )
+        except StreamBudgetExceeded as exc:
+            exc.stats = StreamStats(
+                time_to_first_token=first_token_at,
+                total_seconds=time.perf_counter() - started,
+                chunk_count=chunk_count,
+                estimated_tokens=estimated_tokens,
+                aborted=True,
+            )
+            raise
+
+        stats = StreamStats(
+            time_to_first_token=first_token_at,
+            total_seconds=time.perf_counter() - started,
+            chunk_count=chunk_count,
+            estimated_tokens=estimated_tokens,
+        )
+        return _extract_json(parser.text), usage, estimated_tokens, stats
+
+
+class IncrementalJsonParser:
+    """Assemble streamed JSON text and expose best-effort partial objects.
+
+    String and bracket state is tracked incrementally, so each character is
+    scanned once. Building a partial view still parses the buffer, so ``feed``
+    only does it when a chunk completes a member (a ``,`` or closing bracket
+    outside strings); chunks inside a long string value cost no parse.
+    """
+
+    def __init__(self) -> None:
+        self._scanned = 0
+        self._started = False
+        self._in_string = False
+        self._escaped = False
+        self._stack: list[str] = []
+        self._last_comma: int | None = None
+        self._stack_at_comma: list[str] = []
+        self._end: int | None = None
+        self._buffer = ""
+        self._boundary = False
+
+    @property
+    def text(self) -> str:
+        return self._buffer
+
+    def feed(self, chunk: str) -> dict | None:
+        """Append one chunk; return the partial object when the chunk completed a member, else None."""
+
+        self._buffer += chunk
+        self._boundary = False
+        text = self._buffer
+        start = self._scanned if self._end is None else len(text)
+        for index in range(start, len(text)):
+            char = text[index]
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._stack.append("}")
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append("}" if char == "{" else "]")
+            elif char in "}]" and self._stack:
+                self._stack.pop()
+                self._boundary = True
+                if not self._stack:
+                    self._end = index + 1
+                    break
+            elif char == ",":
+                self._boundary = True
+                self._last_comma = index
+                self._stack_at_comma = list(self._stack)
+        self._scanned = len(text)
+
+        if not self._boundary:
+            return None
+        return self.partial()
+
+    def partial(self) -> dict | None:
+        """Parse the buffer as a dict, closing open strings and brackets.
+
+        Falls back to the buffer cut at the last ``,`` when the tail is an
+        unfinished key or value. Each call parses the whole buffer.
+        """
+
+        start = self._buffer.find("{")
+        if start < 0:
+            return None
+        if self._end is not None:
+            try:
+                return json.loads(self._buffer[start : self._end])
+            except ValueError:
+                return None
+
+        closers = "".join(reversed(self._stack))
+        suffix = '"' if self._in_string else ""
+        attempts = [self._buffer[start:] + suffix + closers]
+        if self._last_comma is not None and self._last_comma > start:
+            attempts.append(self._buffer[start : self._last_comma] + "".join(reversed(self._stack_at_comma)))
+
+        for candidate in attempts:
+            try:
+                parsed = json.loads(candidate)
+            except ValueError:
+                continue
+            if isinstance(parsed, dict):
+                return parsed
+        return None
+
+
+def _iter_sse_events(lines: Iterable[bytes]):
+    """Yield parsed events from an OpenAI-compatible SSE stream."""
+
+    for raw_line in lines:
+        line = raw_line.decode("utf-8").strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[len("data:") :].strip()
+        if data == "[DONE]":
+            return
+        yield json.loads(data)
+
 
-        content = body["choices"][0]["message"]["content"]
-        return _extract_json(content)
+def _event_content(event: dict) -> str:
+    return "".join((choice.get("delta") or {}).get("content") or "" for choice in event.get("choices", []))
 
 
 def _extract_json(content: str) -> dict:
@@ -0,0 +1,361 @@
+"""Offline batch submission for OpenAI-compatible chat completions.
+
+Requests are written to a JSONL batch file (one JSON object per line), handed
+to a batch backend, polled until the backend reports a terminal state and the
+result lines are mapped back to their ``custom_id``. ``LocalBatchBackend``
+stands in for the remote batch API in tests and local dry runs.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Protocol
+from urllib.request import Request, urlopen
+
+from backend.models.ai_model_client import _extract_json
+from backend.models.tokens import (
+    UsageLedger,
+    UsageRecord,
+    current_usage_stage,
+    estimate_chat_tokens,
+    estimate_tokens,
+)
+
+CHAT_COMPLETIONS_PATH = "/v1/chat/completions"
+TERMINAL_BATCH_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+@dataclass(slots=True)
+class BatchJob:
+    """State of one submitted batch."""
+
+    batch_id: str
+    status: str
+    output_file_id: str | None = None
+    error_file_id: str | None = None
+
+
+class BatchBackend(Protocol):
+    """Backend that accepts a JSONL batch file and returns result lines."""
+
+    def submit(self, input_path: Path) -> BatchJob: ...
+
+    def refresh(self, job: BatchJob) -> BatchJob: ...
+
+    def download(self, file_id: str) -> str: ...
+
+
+class OpenAIBatchBackend:
+    """Batch backend for the OpenAI-compatible ``/files`` + ``/batches`` API."""
+
+    def __init__(self, api_key: str, base_url: str, completion_window: str = "24h"):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.completion_window = completion_window
+
+    def submit(self, input_path: Path) -> BatchJob:
+        file_id = self._upload(input_path)["id"]
+        body = self._request_json(
+            "POST",
+            "/batches",
+            {
+                "input_file_id": file_id,
+                "endpoint": CHAT_COMPLETIONS_PATH,
+                "completion_window": self.completion_window,
+            },
+        )
+        return _job_from_payload(body)
+
+    def refresh(self, job: BatchJob) -> BatchJob:
+        return _job_from_payload(self._request_json("GET", f"/batches/{job.batch_id}"))
+
+    def download(self, file_id: str) -> str:
+        request = Request(
+            f"{self.base_url}/files/{file_id}/content",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            method="GET",
+        )
+        with urlopen(request, timeout=120) as response:
+            return response.read().decode("utf-8")
+
+    def _upload(self, input_path: Path) -> dict:
+        boundary = uuid.uuid4().hex
+        body = b"".join(
+            [
+                f"--{boundary}\r\n".encode("utf-8"),
+                b'Content-Disposition: form-data; name="purpose"\r\n\r\nbatch\r\n',
+                f"--{boundary}\r\n".encode("utf-8"),
+                f'Content-Disposition: form-data; name="file"; filename="{input_path.name}"\r\n'.encode("utf-8"),
+                b"Content-Type: application/jsonl\r\n\r\n",
+                input_path.read_bytes(),
+                f"\r\n--{boundary}--\r\n".encode("utf-8"),
+            ]
+        )
+        request = Request(
+            f"{self.base_url}/files",
+            data=body,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+            },
+            method="POST",
+        )
+        with urlopen(request, timeout=120) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def _request_json(self, method: str, path: str, payload: dict | None = None) -> dict:
+        request = Request(
+            f"{self.base_url}{path}",
+            data=json.dumps(payload).encode("utf-8") if payload is not None else None,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            method=method,
+        )
+        with urlopen(request, timeout=60) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+
+class LocalBatchBackend:
+    """In-process batch backend that answers each line with ``handler``.
+
+    ``handler`` receives the chat completion request body and returns a chat
+    completion response body, exactly like the remote endpoint would.
+    """
+
+    def __init__(self, handler: Callable[[dict], dict]):
+        self.handler = handler
+        self._outputs: dict[str, str] = {}
+        self.submitted: list[Path] = []
+
+    def submit(self, input_path: Path) -> BatchJob:
+        self.submitted.append(input_path)
+        result_lines: list[str] = []
+        for line in input_path.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            try:
+                response = {"status_code": 200, "body": self.handler(item["body"])}
+                error = None
+            except Exception as exc:
+                response = None
+                error = {"message": str(exc)}
+            result_lines.append(
+                json.dumps({"custom_id": item["custom_id"], "response": response, "error": error}, ensure_ascii=False)
+            )
+
+        batch_id = f"local-batch-{len(self.submitted)}"
+        output_file_id = f"{batch_id}-output"
+        self._outputs[output_file_id] = "\n".join(result_lines) + "\n"
+        return BatchJob(batch_id=batch_id, status="completed", output_file_id=output_file_id)
+
+    def refresh(self, job: BatchJob) -> BatchJob:
+        return job
+
+    def download(self, file_id: str) -> str:
+        return self._outputs[file_id]
+
+
+class BatchModelClient:
+    """Drop-in LLM client that routes chat requests through a batch backend.
+
+    ``chat_json_many`` submits every request in one batch file; ``chat_json``
+    is a batch of one and only exists so callers that have not been batched
+    still work. ``on_partial`` callbacks are accepted and never called.
+    """
+
+    prefers_batch = True
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        batch_dir: str | Path,
+        poll_seconds: float = 30.0,
+        max_wait_seconds: float = 24 * 3600,
+        usage_ledger: UsageLedger | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.backend = backend
+        self.batch_dir = Path(batch_dir)
+        self.poll_seconds = poll_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.usage_ledger = usage_ledger
+        self.sleep = sleep
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def chat_json(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        on_partial: Callable[[dict], None] | None = None,
+    ) -> dict:
+        # Batch results arrive whole, so there are no partial outputs to report.
+        result = self.chat_json_many(
+            [
+                {
+                    "model": model,
+                    "system_prompt": system_prompt,
+                    "user_prompt": user_prompt,
+                    "temperature": temperature,
+                }
+            ]
+        )[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def chat_json_many(self, requests: list[dict]) -> list[dict | Exception]:
+        """Submit all requests as one batch and return results in order.
+
+        Each request is a dict with ``chat_json`` keyword arguments. Failed
+        lines are returned as exception objects instead of being raised.
+        """
+
+        if not requests:
+            return []
+
+        stage = current_usage_stage()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        self.batch_dir.mkdir(parents=True, exist_ok=True)
+        input_path = self.batch_dir / f"{stamp}_{stage}_requests.jsonl"
+        write_batch_file(input_path, requests)
+
+        print(f"[STEP] Submitting LLM batch: stage={stage}, requests={len(requests)}, file={input_path}")
+        job = self.backend.submit(input_path)
+        waited = 0.0
+        while job.status not in TERMINAL_BATCH_STATUSES:
+            if waited >= self.max_wait_seconds:
+                raise TimeoutError(f"LLM batch {job.batch_id} did not finish within {self.max_wait_seconds:.0f}s")
+            self.sleep(self.poll_seconds)
+            waited += self.poll_seconds
+            job = self.backend.refresh(job)
+        print(f"[STEP] LLM batch finished: batch_id={job.batch_id}, status={job.status}")
+
+        output_text = self.backend.download(job.output_file_id) if job.output_file_id else ""
+        if job.error_file_id:
+            output_text += "\n" + self.backend.download(job.error_file_id)
+        output_path = self.batch_dir / f"{stamp}_{stage}_results.jsonl"
+        output_path.write_text(output_text, encoding="utf-8")
+
+        results = read_batch_results(output_text)
+        mapped: list[dict | Exception] = []
+        for index, request in enumerate(requests):
+            result = results.get(_custom_id(index))
+            if result is None:
+                mapped.append(RuntimeError(f"LLM batch {job.batch_id} returned no result for request {index}"))
+                continue
+            if isinstance(result, Exception):
+                mapped.append(result)
+                continue
+            try:
+                content = result["choices"][0]["message"]["content"]
+                mapped.append(_extract_json(content))
+            except Exception as exc:
+                mapped.append(exc)
+                continue
+            self._record_usage(stage, request, result, content)
+        return mapped
+
+    def _record_usage(self, stage: str, request: dict, body: dict, content: str) -> None:
+        if self.usage_ledger is None:
+            return
+        estimated = estimate_chat_tokens(request["system_prompt"], request["user_prompt"])
+        usage = body.get("usage") or {}
+        self.usage_ledger.record(
+            UsageRecord(
+                stage=stage,
+                model=str(body.get("model") or request["model"]),
+                endpoint="batch",
+                prompt_tokens=int(usage.get("prompt_tokens") or estimated),
+                completion_tokens=int(usage.get("completion_tokens") or estimate_tokens(content)),
+                estimated_prompt_tokens=estimated,
+            )
+        )
+
+
+def chat_json_many(client, requests: list[dict]) -> list[dict | Exception]:
+    """Run several chat requests, batching them when the client supports it.
+
+    Clients without ``chat_json_many`` are called sequentially; exceptions are
+    captured per request so one failure does not discard the others.
+    """
+
+    batch_call = getattr(client, "chat_json_many", None)
+    if batch_call is not None:
+        return batch_call(requests)
+
+    results: list[dict | Exception] = []
+    for request in requests:
+        try:
+            results.append(client.chat_json(**request))
+        except Exception as exc:
+            results.append(exc)
+    return results
+
+
+def write_batch_file(path: Path, requests: list[dict]) -> None:
+    """Write chat requests as batch API JSONL lines."""
+
+    lines = []
+    for index, request in enumerate(requests):
+        body = {
+            "model": request["model"],
+            "temperature": request.get("temperature", 0.1),
+            "messages": [
+                {"role": "system", "content": request["system_prompt"]},
+                {"role": "user", "content": request["user_prompt"]},
+            ],
+        }
+        lines.append(
+            json.dumps(
+                {"custom_id": _custom_id(index), "method": "POST", "url": CHAT_COMPLETIONS_PATH, "body": body},
+                ensure_ascii=False,
+            )
+        )
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def read_batch_results(text: str) -> dict[str, dict | Exception]:
+    """Map batch output lines to response bodies (or errors) by custom_id."""
+
+    results: dict[str, dict | Exception] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        custom_id = item.get("custom_id")
+        if not custom_id:
+            continue
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code", 200) >= 400:
+            message = (item.get("error") or {}).get("message") or f"HTTP {response.get('status_code')}"
+            results[custom_id] = RuntimeError(f"Batch request {custom_id} failed: {message}")
+            continue
+        results[custom_id] = response.get("body") or {}
+    return results
+
+
+def _custom_id(index: int) -> str:
+    return f"req-{index:05d}"
+
+
+def _job_from_payload(payload: dict) -> BatchJob:
+    return BatchJob(
+        batch_id=str(payload["id"]),
+        status=str(payload.get("status", "validating")),
+        output_file_id=payload.get("output_file_id"),
+        error_file_id=payload.get("error_file_id"),
+    )
@@ -0,0 +1,302 @@
+"""Local stand-in for an OpenAI-compatible chat completions endpoint.
+
+The server speaks the same contract ``AIModelClient`` uses (plain JSON and
+SSE streaming responses) and answers ranker and summarizer prompts with
+canned, deterministic JSON. Latency distribution, 5xx errors and 429 rate
+limits can be injected so the pipeline can be load-tested without paying
+for real LLM calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.models.tokens import estimate_tokens
+
+
+@dataclass(slots=True)
+class MockLLMConfig:
+    """Behavior knobs for the mock endpoint."""
+
+    latency_distribution: str = "fixed"
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    stream_chunk_chars: int = 24
+    stream_chunk_delay_ms: float = 0.0
+    seed: int | None = None
+
+
+@dataclass(slots=True)
+class MockLLMStats:
+    """Counters and per-request service latencies observed by the server."""
+
+    requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    latencies_ms: list[float] = field(default_factory=list)
+
+
+class MockLLMServer:
+    """Threaded mock chat completions server bound to a local port.
+
+    Usage:
+        with MockLLMServer(MockLLMConfig(latency_ms=200)) as server:
+            client = AIModelClient(api_key="mock", endpoint=server.url)
+    """
+
+    def __init__(self, config: MockLLMConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockLLMConfig()
+        self.stats = MockLLMStats()
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._httpd = ThreadingHTTPServer((host, port), _build_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def start(self) -> MockLLMServer:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True, name="mock-llm-server")
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> MockLLMServer:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def _draw(self) -> tuple[float, str | None]:
+        """Sample latency and injected failure for one request."""
+
+        config = self.config
+        with self._lock:
+            if config.latency_distribution == "uniform":
+                latency = self._random.uniform(
+                    max(0.0, config.latency_ms - config.latency_jitter_ms),
+                    config.latency_ms + config.latency_jitter_ms,
+                )
+            elif config.latency_distribution == "lognormal":
+                sigma = config.latency_jitter_ms / config.latency_ms if config.latency_ms else 0.0
+                latency = config.latency_ms * self._random.lognormvariate(0.0, sigma)
+            else:
+                latency = config.latency_ms
+
+            roll = self._random.random()
+            failure = None
+            if roll < config.rate_limit_rate:
+                failure = "rate_limit"
+            elif roll < config.rate_limit_rate + config.error_rate:
+                failure = "error"
+        return latency, failure
+
+    def _record(self, latency_ms: float, failure: str | None) -> None:
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.latencies_ms.append(latency_ms)
+            if failure == "rate_limit":
+                self.stats.rate_limited += 1
+            elif failure == "error":
+                self.stats.errors += 1
+
+
+def _build_handler(server: MockLLMServer) -> type[BaseHTTPRequestHandler]:
+    class MockChatHandler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802
+            started = time.perf_counter()
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length).decode("utf-8") or "{}")
+            latency_ms, failure = server._draw()
+            if latency_ms > 0:
+                time.sleep(latency_ms / 1000)
+
+            if failure == "rate_limit":
+                self._send_json(429, {"error": {"message": "Rate limit exceeded (mock)"}}, {"Retry-After": "1"})
+            elif failure == "error":
+                self._send_json(500, {"error": {"message": "Internal error (mock)"}})
+            else:
+                content = json.dumps(canned_response(body), ensure_ascii=False)
+                usage = _usage(body, content)
+                if body.get("stream"):
+                    self._send_stream(content, usage, body.get("model", "mock"))
+                else:
+                    self._send_json(
+                        200,
+                        {
+                            "id": "chatcmpl-mock",
+                            "object": "chat.completion",
+                            "model": body.get("model", "mock"),
+                            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                            "usage": usage,
+                        },
+                    )
+            server._record((time.perf_counter() - started) * 1000, failure)
+
+        def _send_json(self, status: int, payload: dict, headers: dict[str, str] | None = None) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_stream(self, content: str, usage: dict, model: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            size = max(1, server.config.stream_chunk_chars)
+            for start in range(0, len(content), size):
+                event = {"model": model, "choices": [{"index": 0, "delta": {"content": content[start : start + size]}}]}
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                if server.config.stream_chunk_delay_ms > 0:
+                    time.sleep(server.config.stream_chunk_delay_ms / 1000)
+            self.wfile.write(f"data: {json.dumps({'model': model, 'choices': [], 'usage': usage})}\n\n".encode("utf-8"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            return None
+
+    return MockChatHandler
+
+
+def canned_response(body: dict) -> dict:
+    """Build deterministic JSON matching the ranker or summarizer contract.
+
+    The trailing JSON document of the user prompt decides the shape: a list
+    of candidates under a relevance prompt gets scored items, any other list
+    gets batched summaries and a single object gets one summary.
+    """
+
+    messages = body.get("messages", [])
+    system_prompt = messages[0]["content"] if messages else ""
+    user_prompt = messages[-1]["content"] if messages else ""
+    payload = _trailing_json(user_prompt)
+
+    if isinstance(payload, list) and "relevance" in f"{system_prompt} {user_prompt}".lower():
+        return {
+            "items": [
+                {
+                    "external_id": item.get("external_id"),
+                    "relevance_score": _stable_score(str(item.get("external_id"))),
+                    "relevance_reason": "Mock relevance judgement.",
+                }
+                for item in payload
+                if isinstance(item, dict)
+            ]
+        }
+    if isinstance(payload, list):
+        return {"items": [_summary_for(item) for item in payload if isinstance(item, dict)]}
+    if isinstance(payload, dict):
+        return _summary_for(payload)
+    return {"message": "ok"}
+
+
+def _summary_for(paper: dict) -> dict:
+    title = str(paper.get("title", "Untitled"))
+    return {
+        "external_id": paper.get("external_id"),
+        "title": title,
+        "authors": paper.get("authors", []),
+        "affiliations": paper.get("affiliations", []),
+        "code_urls": paper.get("code_urls", []),
+        "problem": f"Mock problem statement for {title}.",
+        "approach": "Mock approach description.",
+        "methodological_novelty": "Mock methodological novelty.",
+        "empirical_novelty": "Mock empirical novelty.",
+        "tell_someone_in_4_5_sentences": [
+            f"{title} is summarized by the mock server.",
+            "It exercises the summarizer contract.",
+            "Latency and failures are injected on purpose.",
+            "No real model was called.",
+        ],
+    }
+
+
+def _trailing_json(text: str):
+    """Return the JSON document that ends the prompt, if any."""
+
+    decoder = json.JSONDecoder()
+    stripped = text.rstrip()
+    for index, char in enumerate(stripped):
+        if char not in "[{":
+            continue
+        try:
+            value, end = decoder.raw_decode(stripped, index)
+        except ValueError:
+            continue
+        if end == len(stripped):
+            return value
+    return None
+
+
+def _stable_score(external_id: str) -> float:
+    digest = hashlib.sha1(external_id.encode("utf-8")).digest()
+    return float(digest[0] % 101)
+
+
+def _usage(body: dict, content: str) -> dict:
+    prompt = " ".join(str(message.get("content", "")) for message in body.get("messages", []))
+    return {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(content)}
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run the mock server in the foreground."""
+
+    parser = argparse.ArgumentParser(description="Run a mock OpenAI-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-distribution", choices=["fixed", "uniform", "lognormal"], default="fixed")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--stream-chunk-delay-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = MockLLMServer(
+        MockLLMConfig(
+            latency_distribution=args.latency_distribution,
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.latency_jitter_ms,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            stream_chunk_delay_ms=args.stream_chunk_delay_ms,
+            seed=args.seed,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Mock LLM server listening on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
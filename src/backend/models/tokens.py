@@ -0,0 +1,100 @@
+"""Token estimation and usage accounting for LLM calls."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+
+TOKEN_PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+CHARS_PER_ALPHA_TOKEN = 6
+
+_current_stage: ContextVar[str] = ContextVar("llm_usage_stage", default="unknown")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate BPE token count without a tokenizer.
+
+    Alphabetic runs count one token per ``CHARS_PER_ALPHA_TOKEN`` characters,
+    digits are grouped in threes and every other non-space character counts
+    as one token. This tracks common BPE vocabularies closely enough for
+    batch sizing while staying a single regex pass.
+    """
+
+    count = 0
+    for piece in TOKEN_PIECE_PATTERN.findall(text):
+        if piece[0].isalpha():
+            count += -(-len(piece) // CHARS_PER_ALPHA_TOKEN)
+        else:
+            count += 1
+    return count
+
+
+def estimate_chat_tokens(system_prompt: str, user_prompt: str) -> int:
+    """Estimate prompt tokens for one system+user chat request."""
+
+    # Chat formats add a few framing tokens per message.
+    return estimate_tokens(system_prompt) + estimate_tokens(user_prompt) + 8
+
+
+@contextmanager
+def usage_stage(name: str) -> Iterator[None]:
+    """Label LLM calls made inside the block with a pipeline stage name."""
+
+    token = _current_stage.set(name)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+
+def current_usage_stage() -> str:
+    return _current_stage.get()
+
+
+@dataclass(slots=True)
+class UsageRecord:
+    """Token usage of one LLM call."""
+
+    stage: str
+    model: str
+    endpoint: str
+    prompt_tokens: int
+    completion_tokens: int
+    estimated_prompt_tokens: int
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class UsageLedger:
+    """Thread-safe collector of usage records for one pipeline run."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._records: list[UsageRecord] = []
+
+    def record(self, record: UsageRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def drain(self) -> list[UsageRecord]:
+        """Return and clear all collected records."""
+
+        with self._lock:
+            records = self._records
+            self._records = []
+        return records
+
+    def totals(self) -> dict[str, int]:
+        with self._lock:
+            records = list(self._records)
+        return {
+            "calls": len(records),
+            "prompt_tokens": sum(item.prompt_tokens for item in records),
+            "completion_tokens": sum(item.completion_tokens for item in records),
+        }
@@ -0,0 +1,187 @@
+"""Columnar container for large candidate batches.
+
+``CandidateBatch`` stores candidates column by column instead of as one
+``PaperCandidate`` per paper. Repeated strings (source names, authors,
+affiliations, categories, code URLs, identifiers) are interned once in a
+shared string table and referenced by index; list-valued fields are CSR
+columns (an offsets array plus one flat ``array('I')`` of string ids), and
+timestamps are float seconds in ``array('d')``. Dedup and ranking read the
+columns directly; ``PaperCandidate`` objects are only built on demand.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+
+from backend.paper_process.paper import PaperCandidate
+
+LIST_FIELDS = ("authors", "affiliations", "code_urls", "categories", "identifiers")
+
+
+class StringTable:
+    """Append-only table mapping each distinct string to a small integer."""
+
+    def __init__(self):
+        self.values: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def intern(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return string_id
+
+
+class CandidateBatch:
+    """Candidates stored as columns over an interned string table.
+
+    Args:
+        strings: Table to intern into; batches selected from another batch
+            share its table so string ids stay valid.
+    """
+
+    def __init__(self, strings: StringTable | None = None):
+        self.strings = strings or StringTable()
+        self.external_ids: list[str] = []
+        self.titles: list[str] = []
+        # Dedup keys, "" until ``normalize.batch_title_keys`` fills them.
+        self.title_norms: list[str] = []
+        self.abstracts: list[str] = []
+        self.arxiv_urls: list[str] = []
+        self.pdf_urls: list[str] = []
+        self._sources = array("I")
+        self._published = array("d")
+        self._updated = array("d")
+        self._offsets = {name: array("I", [0]) for name in LIST_FIELDS}
+        self._values = {name: array("I") for name in LIST_FIELDS}
+
+    @classmethod
+    def from_candidates(cls, candidates: Iterable[PaperCandidate]) -> CandidateBatch:
+        batch = cls()
+        for candidate in candidates:
+            batch.add(candidate)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.external_ids)
+
+    def __iter__(self) -> Iterator[PaperCandidate]:
+        return (self[index] for index in range(len(self)))
+
+    def __getitem__(self, index: int) -> PaperCandidate:
+        """Materialize one row as a ``PaperCandidate``."""
+
+        return PaperCandidate(
+            source=self.source(index),
+            external_id=self.external_ids[index],
+            title=self.titles[index],
+            abstract=self.abstracts[index],
+            authors=self.values("authors", index),
+            affiliations=self.values("affiliations", index),
+            published_at=self.published_at(index),
+            updated_at=datetime.fromtimestamp(self._updated[index], tz=timezone.utc),
+            arxiv_url=self.arxiv_urls[index],
+            pdf_url=self.pdf_urls[index],
+            code_urls=self.values("code_urls", index),
+            categories=self.values("categories", index),
+            identifiers=self.values("identifiers", index),
+            title_norm=self.title_norms[index],
+        )
+
+    def append(
+        self,
+        source: str,
+        external_id: str,
+        title: str,
+        abstract: str,
+        authors: Iterable[str],
+        affiliations: Iterable[str],
+        published_at: datetime,
+        updated_at: datetime,
+        arxiv_url: str,
+        pdf_url: str,
+        code_urls: Iterable[str],
+        categories: Iterable[str],
+        identifiers: Iterable[str] = (),
+        title_norm: str = "",
+    ) -> None:
+        """Add one row from field values, the way sources emit them."""
+
+        intern = self.strings.intern
+        self._sources.append(intern(source))
+        self.external_ids.append(external_id)
+        self.titles.append(title)
+        self.title_norms.append(title_norm)
+        self.abstracts.append(abstract)
+        self.arxiv_urls.append(arxiv_url)
+        self.pdf_urls.append(pdf_url)
+        self._published.append(published_at.timestamp())
+        self._updated.append(updated_at.timestamp())
+        for name, items in (
+            ("authors", authors),
+            ("affiliations", affiliations),
+            ("code_urls", code_urls),
+            ("categories", categories),
+            ("identifiers", identifiers),
+        ):
+            values = self._values[name]
+            values.extend(intern(item) for item in items)
+            self._offsets[name].append(len(values))
+
+    def add(self, candidate: PaperCandidate) -> None:
+        self.append(
+            candidate.source,
+            candidate.external_id,
+            candidate.title,
+            candidate.abstract,
+            candidate.authors,
+            candidate.affiliations,
+            candidate.published_at,
+            candidate.updated_at,
+            candidate.arxiv_url,
+            candidate.pdf_url,
+            candidate.code_urls,
+            candidate.categories,
+            candidate.identifiers,
+            candidate.title_norm,
+        )
+
+    def published_at(self, index: int) -> datetime:
+        return datetime.fromtimestamp(self._published[index], tz=timezone.utc)
+
+    def source(self, index: int) -> str:
+        return self.strings.values[self._sources[index]]
+
+    def values(self, name: str, index: int) -> list[str]:
+        """Strings of list field ``name`` (one of ``LIST_FIELDS``) for row ``index``."""
+
+        offsets = self._offsets[name]
+        strings = self.strings.values
+        return [strings[string_id] for string_id in self._values[name][offsets[index] : offsets[index + 1]]]
+
+    def select(self, indices: Iterable[int]) -> CandidateBatch:
+        """New batch holding rows ``indices`` in that order, sharing this string table."""
+
+        selected = CandidateBatch(self.strings)
+        for index in indices:
+            selected._sources.append(self._sources[index])
+            selected.external_ids.append(self.external_ids[index])
+            selected.titles.append(self.titles[index])
+            selected.title_norms.append(self.title_norms[index])
+            selected.abstracts.append(self.abstracts[index])
+            selected.arxiv_urls.append(self.arxiv_urls[index])
+            selected.pdf_urls.append(self.pdf_urls[index])
+            selected._published.append(self._published[index])
+            selected._updated.append(self._updated[index])
+            for name in LIST_FIELDS:
+                offsets = self._offsets[name]
+                values = selected._values[name]
+                values.extend(self._values[name][offsets[index] : offsets[index + 1]])
+                selected._offsets[name].append(len(values))
+        return selected
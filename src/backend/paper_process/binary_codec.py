@@ -0,0 +1,135 @@
+"""Compact binary encoding of ``PaperSummary`` for the cache's ``paper_summaries`` table.
+
+A record is a fixed header (magic, version, kind), the relevance score and
+list lengths as one ``struct``, the related papers' similarities as
+``array('d')``, the character length of every string as ``array('I')``, and
+finally all strings joined into a single UTF-8 block. Encoding and decoding
+therefore cost one ``struct`` call and one UTF-8 pass per record instead of a
+JSON round trip per list field.
+"""
+
+from __future__ import annotations
+
+import struct
+from array import array
+from collections.abc import Iterable
+from itertools import accumulate
+
+from backend.paper_process.paper import PaperSummary, RelatedPaper
+
+HEADER = struct.Struct("<2sBB")
+MAGIC = b"PB"
+VERSION = 1
+KIND_SUMMARY = 2
+# relevance_score; then authors, affiliations, code_urls, tell_someone_in_4_5_sentences, related_papers.
+SUMMARY_FIELDS = struct.Struct("<dIIIII")
+SUMMARY_LISTS = ("authors", "affiliations", "code_urls", "tell_someone_in_4_5_sentences")
+
+
+def _require_lists(record: PaperSummary, names: tuple[str, ...]) -> None:
+    for name in names:
+        value = getattr(record, name)
+        if type(value) is not list:
+            raise ValueError(f"{name} must be a list of strings, got {type(value).__name__}")
+
+
+def _pack(kind: int, fields: bytes, strings: list[str], tail: bytes = b"") -> bytes:
+    try:
+        lengths = array("I", [len(item) for item in strings])
+        text = "".join(strings)
+    except TypeError as exc:
+        raise ValueError(f"Paper records can only hold strings: {exc}") from None
+    return b"".join((HEADER.pack(MAGIC, VERSION, kind), fields, tail, lengths.tobytes(), text.encode()))
+
+
+def _unpack_strings(payload: bytes | memoryview, offset: int, count: int) -> list[str]:
+    end = offset + 4 * count
+    lengths = array("I")
+    lengths.frombytes(payload[offset:end])
+    text = str(payload[end:], "utf-8")
+    ends = list(accumulate(lengths))
+    return [text[start:end] for start, end in zip([0, *ends], ends)]
+
+
+def _split(strings: list[str], start: int, counts: Iterable[int]) -> list[list[str]]:
+    groups = []
+    for count in counts:
+        groups.append(strings[start : start + count])
+        start += count
+    return groups
+
+
+def _kind(payload: bytes | memoryview) -> int:
+    magic, version, kind = HEADER.unpack_from(payload, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a paper record or unsupported codec version")
+    return kind
+
+
+def encode_summary(summary: PaperSummary) -> bytes:
+    _require_lists(summary, SUMMARY_LISTS)
+    related = summary.related_papers
+    fields = SUMMARY_FIELDS.pack(
+        summary.relevance_score,
+        len(summary.authors),
+        len(summary.affiliations),
+        len(summary.code_urls),
+        len(summary.tell_someone_in_4_5_sentences),
+        len(related),
+    )
+    strings = [
+        summary.external_id,
+        summary.source,
+        summary.title,
+        summary.arxiv_url,
+        summary.pdf_url,
+        summary.problem,
+        summary.approach,
+        summary.methodological_novelty,
+        summary.empirical_novelty,
+        summary.relevance_reason,
+        *summary.authors,
+        *summary.affiliations,
+        *summary.code_urls,
+        *summary.tell_someone_in_4_5_sentences,
+    ]
+    for paper in related:
+        strings.extend((paper.external_id, paper.title, paper.url))
+    similarities = array("d", [paper.similarity for paper in related])
+    return _pack(KIND_SUMMARY, fields, strings, similarities.tobytes())
+
+
+def decode_summary(payload: bytes | memoryview) -> PaperSummary:
+    if _kind(payload) != KIND_SUMMARY:
+        raise ValueError("Record is not a paper summary")
+    score, *counts = SUMMARY_FIELDS.unpack_from(payload, HEADER.size)
+    related_count = counts[4]
+    offset = HEADER.size + SUMMARY_FIELDS.size
+    similarities = array("d")
+    similarities.frombytes(payload[offset : offset + 8 * related_count])
+    list_counts = counts[:4]
+    strings = _unpack_strings(payload, offset + 8 * related_count, 10 + sum(list_counts) + 3 * related_count)
+    authors, affiliations, code_urls, tell = _split(strings, 10, list_counts)
+    related = strings[10 + sum(list_counts) :]
+    return PaperSummary(
+        external_id=strings[0],
+        source=strings[1],
+        title=strings[2],
+        authors=authors,
+        affiliations=affiliations,
+        arxiv_url=strings[3],
+        pdf_url=strings[4],
+        code_urls=code_urls,
+        problem=strings[5],
+        approach=strings[6],
+        methodological_novelty=strings[7],
+        empirical_novelty=strings[8],
+        tell_someone_in_4_5_sentences=tell,
+        relevance_score=score,
+        relevance_reason=strings[9],
+        related_papers=[
+            RelatedPaper(related[3 * index], related[3 * index + 1], related[3 * index + 2], similarities[index])
+            for index in range(related_count)
+        ],
+    )
+
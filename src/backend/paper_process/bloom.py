@@ -0,0 +1,91 @@
+"""Persisted Bloom filter backed by a memory-mapped file.
+
+The file holds a small header (magic, capacity, bit count, hash count, item
+count) followed by the bit array. It is mapped with ``mmap`` so opening a
+multi-megabyte filter costs no read, and additions land in the page cache
+immediately; ``flush`` writes dirty pages back to disk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import mmap
+import struct
+from pathlib import Path
+from threading import Lock
+
+HEADER = struct.Struct("<4sIQQIQ")
+MAGIC = b"PBLM"
+VERSION = 1
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter stored in ``path``.
+
+    Args:
+        path: Filter file; created with ``capacity``/``error_rate`` sizing
+            when missing, otherwise opened with its stored parameters.
+        capacity: Expected number of distinct keys.
+        error_rate: Target false-positive rate at ``capacity`` keys.
+    """
+
+    def __init__(self, path: str | Path, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.path = Path(path)
+        self._lock = Lock()
+        if not self.path.exists():
+            self._create(capacity, error_rate)
+        self._file = self.path.open("r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, version, self.capacity, self.num_bits, self.num_hashes, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a Bloom filter file: {self.path}")
+
+    def _create(self, capacity: int, error_rate: float) -> None:
+        num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("wb") as handle:
+            handle.write(HEADER.pack(MAGIC, VERSION, capacity, num_bits, num_hashes, 0))
+            handle.truncate(HEADER.size + math.ceil(num_bits / 8))
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.num_bits for index in range(self.num_hashes)]
+
+    def __contains__(self, key: str) -> bool:
+        data = self._map
+        return all(data[HEADER.size + bit // 8] & (1 << (bit % 8)) for bit in self._positions(key))
+
+    def add(self, key: str) -> bool:
+        """Add ``key``; return True when it was not (probably) present."""
+
+        with self._lock:
+            data = self._map
+            added = False
+            for bit in self._positions(key):
+                offset = HEADER.size + bit // 8
+                mask = 1 << (bit % 8)
+                if not data[offset] & mask:
+                    data[offset] |= mask
+                    added = True
+            if added:
+                self.count += 1
+                HEADER.pack_into(
+                    data, 0, MAGIC, VERSION, self.capacity, self.num_bits, self.num_hashes, self.count
+                )
+            return added
+
+    @property
+    def saturated(self) -> bool:
+        return self.count > self.capacity
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
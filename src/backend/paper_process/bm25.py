@@ -0,0 +1,84 @@
+"""BM25 relevance scoring against the cached paper corpus.
+
+Document frequencies and lengths come from the cache (``paper_term_stats``
+and ``paper_lengths``), which keeps them up to date as papers are upserted,
+so scoring a day's candidates only has to tokenize the candidates
+themselves. Without a cache the candidate batch serves as the corpus.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from backend.paper_process.normalize import STOPWORDS
+
+K1 = 1.2
+B = 0.75
+# Same tokens as ``normalize_text(text).split()`` minus single characters.
+TERM_PATTERN = re.compile(r"[a-z0-9]{2,}")
+
+
+def document_terms(text: str) -> Counter[str]:
+    """Term frequencies of ``text`` as indexed by the cache."""
+
+    counts = Counter(TERM_PATTERN.findall(text.lower()))
+    for stopword in STOPWORDS.intersection(counts):
+        del counts[stopword]
+    return counts
+
+
+@dataclass(slots=True)
+class CorpusStats:
+    """Collection statistics needed for BM25 IDF and length normalization."""
+
+    doc_count: int
+    total_length: int
+    df: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def avg_length(self) -> float:
+        return self.total_length / self.doc_count if self.doc_count else 0.0
+
+    def idf(self, term: str) -> float:
+        df = self.df.get(term, 0)
+        return math.log(1.0 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+
+def batch_stats(documents: list[Counter[str]], terms: Iterable[str]) -> CorpusStats:
+    """Corpus statistics computed from ``documents`` alone."""
+
+    return CorpusStats(
+        doc_count=len(documents),
+        total_length=sum(sum(document.values()) for document in documents),
+        df={term: sum(1 for document in documents if term in document) for term in terms},
+    )
+
+
+def bm25_scores(query: Iterable[str], documents: list[Counter[str]], stats: CorpusStats) -> list[float]:
+    """Score documents against ``query`` as a fraction of the best possible score.
+
+    The best possible score is every query term saturating at average
+    document length, so results fall in ``[0, 1)`` and stay comparable
+    across queries.
+    """
+
+    weights = {term: stats.idf(term) for term in dict.fromkeys(query)}
+    ideal = sum(weights.values()) * (K1 + 1.0)
+    if not ideal:
+        return [0.0] * len(documents)
+
+    avg_length = stats.avg_length or 1.0
+    scores = []
+    for document in documents:
+        norm = K1 * (1.0 - B + B * sum(document.values()) / avg_length)
+        score = 0.0
+        for term, weight in weights.items():
+            tf = document.get(term)
+            if tf:
+                score += weight * tf * (K1 + 1.0) / (tf + norm)
+        scores.append(score / ideal)
+    return scores
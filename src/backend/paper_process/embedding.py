@@ -0,0 +1,197 @@
+"""Local embedding ranker built on a hashing vectorizer.
+
+Texts are embedded without a model download: unigrams and bigrams of the
+normalized text are hashed into ``dim`` signed buckets with sublinear term
+frequency, then L2-normalized. Candidate vectors are persisted next to the
+cache as a flat float32 matrix (``<db>.vectors.f32``) plus an id list, so
+later runs and the related-paper index reuse them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import mmap
+from array import array
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+
+from backend.paper_process.normalize import STOPWORDS, normalize_text
+from backend.paper_process.paper import PaperCandidate
+from backend.paper_process.selection import select_top_k
+
+DEFAULT_DIM = 512
+EXCLUDE_PENALTY = 0.5
+
+
+@lru_cache(maxsize=1 << 18)
+def _feature_slot(feature: str, dim: int) -> tuple[int, float]:
+    value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return value % dim, 1.0 if value >> 63 else -1.0
+
+
+class HashingEmbedder:
+    """Embed text into a fixed-size dense vector by feature hashing."""
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+
+    def features(self, text: str) -> Counter[str]:
+        tokens = [token for token in normalize_text(text).split() if token not in STOPWORDS and len(token) > 1]
+        counts = Counter(tokens)
+        counts.update(f"{left} {right}" for left, right in zip(tokens, tokens[1:]))
+        return counts
+
+    def embed(self, text: str) -> array:
+        weights: dict[int, float] = {}
+        for feature, count in self.features(text).items():
+            index, sign = _feature_slot(feature, self.dim)
+            weights[index] = weights.get(index, 0.0) + (sign if count == 1 else sign * (1.0 + math.log(count)))
+        vector = array("f", bytes(4 * self.dim))
+        norm = math.sqrt(sum(value * value for value in weights.values()))
+        if norm:
+            for index, value in weights.items():
+                vector[index] = value / norm
+        return vector
+
+
+def sparse(vector: array) -> list[tuple[int, float]]:
+    """Non-zero ``(index, weight)`` pairs, used as the query side of dot products."""
+
+    return [(index, value) for index, value in enumerate(vector) if value]
+
+
+def sparse_dot(query: list[tuple[int, float]], vector) -> float:
+    return sum(weight * vector[index] for index, weight in query)
+
+
+class EmbeddingStore:
+    """Append-only float32 matrix of paper vectors keyed by external id.
+
+    Rows live in ``path`` (raw little-endian float32, ``dim`` per row) and
+    ids in ``path.ids``, one per line in row order. ``matrix`` exposes the
+    rows through ``mmap`` without copying.
+    """
+
+    def __init__(self, path: str | Path, dim: int = DEFAULT_DIM):
+        self.path = Path(path)
+        self.ids_path = self.path.with_name(f"{self.path.name}.ids")
+        self.dim = dim
+        self._lock = Lock()
+        self._map: mmap.mmap | None = None
+        self.ids: list[str] = []
+        self.rows: dict[str, int] = {}
+        self._load()
+
+    def _load(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        ids = self.ids_path.read_text(encoding="utf-8").splitlines() if self.ids_path.exists() else []
+        row_bytes = 4 * self.dim
+        stored_bytes = self.path.stat().st_size if self.path.exists() else 0
+        count = min(len(ids), stored_bytes // row_bytes)
+        # An interrupted append can leave one file longer than the other.
+        if count != len(ids) or count * row_bytes != stored_bytes:
+            self.ids_path.write_text("".join(f"{item}\n" for item in ids[:count]), encoding="utf-8")
+            with self.path.open("ab") as handle:
+                handle.truncate(count * row_bytes)
+        self.ids = ids[:count]
+        self.rows = {external_id: row for row, external_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, external_id: str) -> bool:
+        return external_id in self.rows
+
+    @property
+    def matrix(self) -> memoryview:
+        """Flat float32 view of all rows; row ``r`` starts at ``r * dim``."""
+
+        if not self.ids:
+            return memoryview(array("f"))
+        if self._map is None or len(self._map) < len(self.ids) * 4 * self.dim:
+            # The previous mapping is left to the GC: callers may still hold views of it.
+            with self.path.open("rb") as handle:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._map)[: len(self.ids) * 4 * self.dim].cast("f")
+
+    def get(self, external_id: str) -> array | None:
+        row = self.rows.get(external_id)
+        if row is None:
+            return None
+        return array("f", self.matrix[row * self.dim : (row + 1) * self.dim])
+
+    def add_many(self, items: list[tuple[str, array]]) -> None:
+        """Append vectors for ids not stored yet."""
+
+        with self._lock:
+            fresh = [(key, vector) for key, vector in dict(items).items() if key not in self.rows]
+            if not fresh:
+                return
+            with self.path.open("ab") as handle:
+                for _, vector in fresh:
+                    handle.write(vector.tobytes())
+            with self.ids_path.open("a", encoding="utf-8") as handle:
+                handle.write("".join(f"{external_id}\n" for external_id, _ in fresh))
+            for external_id, _ in fresh:
+                self.rows[external_id] = len(self.ids)
+                self.ids.append(external_id)
+
+
+class EmbeddingRanker:
+    """Rank candidates by cosine similarity to the research profile.
+
+    Args:
+        research_field: Profile text; include keywords are appended to it.
+        exclude_keywords: Similarity to these is subtracted at half weight.
+        store: Optional vector store; cached vectors are reused and new
+            candidate vectors appended.
+    """
+
+    def __init__(
+        self,
+        research_field: str,
+        include_keywords: list[str],
+        exclude_keywords: list[str],
+        embedder: HashingEmbedder | None = None,
+        store: EmbeddingStore | None = None,
+    ):
+        self.embedder = embedder or HashingEmbedder(store.dim if store is not None else DEFAULT_DIM)
+        self.store = store
+        self._profile = sparse(self.embedder.embed(" ".join([research_field, *include_keywords])))
+        self._exclude = sparse(self.embedder.embed(" ".join(exclude_keywords))) if exclude_keywords else []
+
+    def embed_candidates(self, candidates: list[PaperCandidate]) -> list[array]:
+        vectors = []
+        fresh = []
+        for candidate in candidates:
+            vector = self.store.get(candidate.external_id) if self.store is not None else None
+            if vector is None:
+                vector = self.embedder.embed(f"{candidate.title} {candidate.abstract}")
+                fresh.append((candidate.external_id, vector))
+            vectors.append(vector)
+        if self.store is not None and fresh:
+            self.store.add_many(fresh)
+        return vectors
+
+    def rank(
+        self,
+        candidates: list[PaperCandidate],
+        top_k: int | None = None,
+    ) -> list[tuple[PaperCandidate, float, str]]:
+        """Score all candidates locally and return the best ``top_k`` (all when unset)."""
+
+        if not candidates:
+            return []
+
+        scored = []
+        for candidate, vector in zip(candidates, self.embed_candidates(candidates)):
+            similarity = sparse_dot(self._profile, vector)
+            exclude_similarity = max(0.0, sparse_dot(self._exclude, vector))
+            score = max(0.0, min(100.0, 100.0 * (similarity - EXCLUDE_PENALTY * exclude_similarity)))
+            reason = f"Embedding rank: similarity={similarity:.3f}, exclude_similarity={exclude_similarity:.3f}."
+            scored.append((candidate, round(score, 2), reason))
+
+        return select_top_k(scored, top_k)
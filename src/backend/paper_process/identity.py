@@ -0,0 +1,101 @@
+"""Canonical paper identifiers for cross-source deduplication.
+
+Identifiers are prefixed strings such as ``doi:10.1109/x.2026.1``,
+``arxiv:2501.00001`` (version stripped) or ``scopus:85123``. Each adapter
+fills ``PaperCandidate.identifiers``; the cache maps every identifier to the
+key of the first paper that carried it.
+"""
+
+from __future__ import annotations
+
+import re
+
+from backend.paper_process.paper import PaperCandidate
+
+DOI_PATTERN = re.compile(r"10\.\d{4,9}/[^\s\"<>]+", re.IGNORECASE)
+ARXIV_DOI_PREFIX = "10.48550/arxiv."
+ARXIV_ID_PATTERN = re.compile(r"(\d{4}\.\d{4,5}|[a-z\-]+(?:\.[a-z]{2})?/\d{7})(?:v\d+)?$", re.IGNORECASE)
+
+
+def doi_identifier(value: str | None) -> str | None:
+    """Return ``doi:<lowercase doi>`` from a bare DOI or DOI URL."""
+
+    if not value:
+        return None
+    match = DOI_PATTERN.search(value)
+    if match is None:
+        return None
+    return f"doi:{match.group(0).rstrip('.,;').lower()}"
+
+
+def arxiv_identifier(value: str | None) -> str | None:
+    """Return ``arxiv:<id>`` without version from an id, abs URL or arXiv DOI."""
+
+    if not value:
+        return None
+    text = value.strip()
+    if text.lower().startswith(ARXIV_DOI_PREFIX):
+        text = text[len(ARXIV_DOI_PREFIX) :]
+    text = text.rstrip("/").split("/abs/")[-1].removeprefix("arXiv:")
+    match = ARXIV_ID_PATTERN.search(text)
+    if match is None:
+        return None
+    return f"arxiv:{match.group(1).lower()}"
+
+
+def build_identifiers(*values: str | None) -> list[str]:
+    """Drop empty values and duplicates while keeping order."""
+
+    identifiers: list[str] = []
+    for value in values:
+        if value and value not in identifiers:
+            identifiers.append(value)
+    doi_values = [item for item in identifiers if item.startswith(f"doi:{ARXIV_DOI_PREFIX}")]
+    for item in doi_values:
+        arxiv_id = arxiv_identifier(item.removeprefix("doi:"))
+        if arxiv_id and arxiv_id not in identifiers:
+            identifiers.append(arxiv_id)
+    return identifiers
+
+
+def candidate_identifiers(candidate: PaperCandidate) -> list[str]:
+    """Identifiers of ``candidate`` including its source-scoped id."""
+
+    return build_identifiers(*candidate.identifiers, f"{candidate.source}:{candidate.external_id.lower()}")
+
+
+def collapse_by_identity(candidates: list[PaperCandidate], known: dict[str, str]) -> list[PaperCandidate]:
+    """Drop candidates whose identifiers resolve to another paper.
+
+    Args:
+        candidates: Candidates after exact dedup.
+        known: Identifier -> paper key mapping from the cache.
+
+    Returns:
+        Candidates that are new papers. A candidate sharing an identifier
+        with an earlier one in the batch is merged into it, so the kept
+        candidate carries every alias when its identities are recorded.
+    """
+
+    kept: list[PaperCandidate] = []
+    owners: dict[str, PaperCandidate] = {}
+    for candidate in candidates:
+        identifiers = candidate_identifiers(candidate)
+        known_key = next((known[item] for item in identifiers if item in known), None)
+        if known_key is not None and known_key != candidate.external_id:
+            print(f"[STEP] Identity duplicate skipped: {candidate.external_id} -> {known_key}")
+            continue
+
+        twin = next((owners[item] for item in identifiers if item in owners), None)
+        if twin is not None:
+            print(f"[STEP] Identity duplicate merged: {candidate.external_id} -> {twin.external_id}")
+            twin.identifiers = build_identifiers(*twin.identifiers, *identifiers)
+            for item in identifiers:
+                owners.setdefault(item, twin)
+            continue
+
+        candidate.identifiers = identifiers
+        kept.append(candidate)
+        for item in identifiers:
+            owners[item] = candidate
+    return kept
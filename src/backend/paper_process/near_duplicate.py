@@ -0,0 +1,159 @@
+"""Near-duplicate detection with MinHash signatures and LSH banding.
+
+Exact dedup only matches identical normalized titles. Here every candidate
+gets a MinHash signature over word shingles of its title and abstract; the
+signature is cut into bands and each band hashed to a bucket. Candidates
+sharing any bucket with a stored paper are compared by estimated Jaccard
+similarity, so lookups against the full history touch only a few rows.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from array import array
+
+from backend.paper_process.normalize import normalize_text
+from backend.paper_process.paper import PaperCandidate
+
+MINHASH_SEED = 1_234_567
+EMPTY_BIN = (1 << 64) - 1
+DENSIFY_OFFSET = 1 << 58
+
+
+def shingles(text: str, size: int = 3) -> set[bytes]:
+    """Return word ``size``-grams of the normalized text."""
+
+    words = normalize_text(text).split()
+    if len(words) <= size:
+        return {" ".join(words).encode("utf-8")} if words else set()
+    return {" ".join(words[index : index + size]).encode("utf-8") for index in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """Compute MinHash signatures with one-permutation hashing.
+
+    Each shingle is hashed once; the hash picks one of ``num_perm`` bins and
+    the bin keeps its minimum. Empty bins borrow from the next filled bin
+    (rotation densification), which keeps collision probability equal to
+    Jaccard similarity at a fraction of the cost of ``num_perm`` hashes.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = MINHASH_SEED):
+        self.num_perm = num_perm
+        self._key = seed.to_bytes(8, "little")
+
+    def signature(self, features: set[bytes]) -> array:
+        bins = [EMPTY_BIN] * self.num_perm
+        for item in features:
+            value = int.from_bytes(hashlib.blake2b(item, digest_size=8, key=self._key).digest(), "little")
+            index = value % self.num_perm
+            value //= self.num_perm
+            if value < bins[index]:
+                bins[index] = value
+        if EMPTY_BIN in bins and any(value != EMPTY_BIN for value in bins):
+            bins = _densify(bins)
+        return array("Q", bins)
+
+
+def _densify(bins: list[int]) -> list[int]:
+    size = len(bins)
+    dense = list(bins)
+    for index, value in enumerate(bins):
+        if value != EMPTY_BIN:
+            continue
+        distance = 1
+        while bins[(index + distance) % size] == EMPTY_BIN:
+            distance += 1
+        dense[index] = bins[(index + distance) % size] + distance * DENSIFY_OFFSET
+    return dense
+
+
+def band_buckets(signature: array, bands: int) -> list[int]:
+    """Hash each band of ``signature`` to a signed 64-bit bucket id."""
+
+    rows = len(signature) // bands
+    return [
+        int.from_bytes(
+            hashlib.blake2b(signature[band * rows : (band + 1) * rows].tobytes(), digest_size=8).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(bands)
+    ]
+
+
+def estimated_jaccard(left: array, right: array) -> float:
+    if not left:
+        return 0.0
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+class NearDuplicateDetector:
+    """Filter candidates that near-duplicate each other or cached papers.
+
+    Args:
+        cache: ``SQLiteCache`` (or compatible) storing signatures and buckets.
+        threshold: Minimum estimated Jaccard similarity to call a duplicate.
+        num_perm: Signature length; must be divisible by ``bands``.
+        bands: LSH band count. More bands raise recall at lower similarity.
+    """
+
+    def __init__(self, cache, threshold: float = 0.7, num_perm: int = 64, bands: int = 16, shingle_size: int = 3):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.cache = cache
+        self.threshold = threshold
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm=num_perm)
+        self._pending: dict[str, tuple[array, list[int]]] = {}
+
+    def filter(self, candidates: list[PaperCandidate]) -> list[PaperCandidate]:
+        """Drop near-duplicates of history and of earlier candidates in the batch."""
+
+        entries = [self._signature_entry(candidate) for candidate in candidates]
+        probes = [(index, band, bucket) for index, (_, buckets) in enumerate(entries) for band, bucket in enumerate(buckets)]
+        history: dict[int, dict[str, array]] = {}
+        for index, external_id, blob in self.cache.find_lsh_matches(probes):
+            stored = array("Q")
+            stored.frombytes(blob)
+            history.setdefault(index, {})[external_id] = stored
+
+        kept: list[PaperCandidate] = []
+        local_buckets: dict[tuple[int, int], list[int]] = {}
+        for index, candidate in enumerate(candidates):
+            signature, buckets = entries[index]
+            match = self._best_match(signature, history.get(index, {}))
+            if match is None:
+                peers = {peer for band, bucket in enumerate(buckets) for peer in local_buckets.get((band, bucket), [])}
+                match = self._best_match(signature, {candidates[peer].external_id: entries[peer][0] for peer in peers})
+            if match is not None and match != candidate.external_id:
+                print(f"[STEP] Near-duplicate skipped: {candidate.external_id} ~ {match}")
+                continue
+
+            kept.append(candidate)
+            self._pending[candidate.external_id] = entries[index]
+            for band, bucket in enumerate(buckets):
+                local_buckets.setdefault((band, bucket), []).append(index)
+        return kept
+
+    def remember(self, candidates: list[PaperCandidate]) -> None:
+        """Persist signatures of candidates that were stored in the cache."""
+
+        rows = []
+        for candidate in candidates:
+            signature, buckets = self._pending.pop(candidate.external_id, None) or self._signature_entry(candidate)
+            rows.append((candidate.external_id, signature.tobytes(), buckets))
+        self.cache.store_minhash(rows)
+
+    def _signature_entry(self, candidate: PaperCandidate) -> tuple[array, list[int]]:
+        signature = self.hasher.signature(shingles(f"{candidate.title} {candidate.abstract}", self.shingle_size))
+        return signature, band_buckets(signature, self.bands)
+
+    def _best_match(self, signature: array, others: dict[str, array]) -> str | None:
+        best_id, best_score = None, self.threshold
+        for external_id, other in others.items():
+            score = estimated_jaccard(signature, other)
+            if score >= best_score:
+                best_id, best_score = external_id, score
+        return best_id
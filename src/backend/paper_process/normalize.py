@@ -3,19 +3,56 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
+from backend.paper_process.batch import CandidateBatch
 from backend.paper_process.paper import PaperCandidate
 
 NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9]+")
-SPACES_PATTERN = re.compile(r"\s+")
+TITLE_CACHE_SIZE = 16_384
+# Dropped from the token streams of the lexical and embedding scorers.
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in into is it its of on or our that the this to we with".split()
+)
 
 
+def normalize_text(text: str) -> str:
+    """Lowercase ``text`` and collapse every non-alphanumeric run to one space."""
+
+    return NON_ALNUM_PATTERN.sub(" ", text.lower()).strip()
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
 def normalize_title(title: str) -> str:
-    """Normalize titles to deterministic dedup keys."""
+    """Normalize titles to deterministic dedup keys (memoized)."""
+
+    return normalize_text(title)
+
+
+def normalize_titles(titles: list[str]) -> list[str]:
+    """Normalize titles that are keyed once per paper, bypassing the LRU so a batch does not evict hot keys."""
+
+    return [normalize_text(title) for title in titles]
+
+
+def title_keys(candidates: list[PaperCandidate]) -> list[str]:
+    """Dedup keys of ``candidates``, computed once and kept on ``candidate.title_norm``."""
+
+    missing = [candidate for candidate in candidates if not candidate.title_norm]
+    if missing:
+        for candidate, key in zip(missing, normalize_titles([candidate.title for candidate in missing])):
+            candidate.title_norm = key
+    return [candidate.title_norm for candidate in candidates]
+
+
+def batch_title_keys(batch: CandidateBatch) -> list[str]:
+    """Same as ``title_keys`` for a batch: keys are kept in its ``title_norms`` column and carried by ``select``."""
 
-    lowered = title.strip().lower()
-    collapsed = NON_ALNUM_PATTERN.sub(" ", lowered)
-    return SPACES_PATTERN.sub(" ", collapsed).strip()
+    missing = [index for index, key in enumerate(batch.title_norms) if not key]
+    if missing:
+        for index, key in zip(missing, normalize_titles([batch.titles[index] for index in missing])):
+            batch.title_norms[index] = key
+    return batch.title_norms
 
 
 def deduplicate_candidates(
@@ -29,8 +66,7 @@ def deduplicate_candidates(
     local_ids = set(seen_external_ids)
     local_title_hashes = set(seen_title_hashes)
 
-    for item in candidates:
-        title_key = normalize_title(item.title)
+    for item, title_key in zip(candidates, title_keys(candidates)):
         if item.external_id in local_ids:
             continue
         if title_key in local_title_hashes:
@@ -41,3 +77,25 @@ def deduplicate_candidates(
         deduped.append(item)
 
     return deduped
+
+
+def deduplicate_batch(
+    batch: CandidateBatch,
+    seen_external_ids: set[str],
+    seen_title_hashes: set[str],
+) -> CandidateBatch:
+    """Same as ``deduplicate_candidates`` but over batch columns, keeping the batch form."""
+
+    keep: list[int] = []
+    local_ids = set(seen_external_ids)
+    local_title_hashes = set(seen_title_hashes)
+
+    for index, (external_id, title_key) in enumerate(zip(batch.external_ids, batch_title_keys(batch))):
+        if external_id in local_ids or title_key in local_title_hashes:
+            continue
+
+        local_ids.add(external_id)
+        local_title_hashes.add(title_key)
+        keep.append(index)
+
+    return batch.select(keep)
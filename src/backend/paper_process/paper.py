@@ -22,6 +22,19 @@ class PaperCandidate:
     pdf_url: str
     code_urls: list[str]
     categories: list[str]
+    identifiers: list[str] = field(default_factory=list)
+    # Dedup key from ``normalize.title_keys``; filled once and reused through upsert.
+    title_norm: str = field(default="", compare=False, repr=False)
+
+
+@dataclass(slots=True)
+class RelatedPaper:
+    """A previously digested paper similar to a new one."""
+
+    external_id: str
+    title: str
+    url: str
+    similarity: float
 
 
 @dataclass(slots=True)
@@ -43,6 +56,7 @@ class PaperSummary:
     tell_someone_in_4_5_sentences: list[str]
     relevance_score: float
     relevance_reason: str
+    related_papers: list[RelatedPaper] = field(default_factory=list)
 
 
 @dataclass(slots=True)
@@ -54,3 +68,4 @@ class PipelineRunResult:
     output_path: str | None
     skipped_reason: str | None = None
     emitted_ids: list[str] = field(default_factory=list)
+    profile_outputs: dict[str, str] = field(default_factory=dict)
@@ -2,65 +2,385 @@
 
 from __future__ import annotations
 
+import gzip
+import json
+import re
 import sqlite3
+from collections import Counter
+from collections.abc import Iterable
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
+from backend.models.tokens import UsageRecord
+from backend.paper_process.binary_codec import encode_summary
+from backend.paper_process.bloom import BloomFilter
+from backend.paper_process.bm25 import CorpusStats, document_terms
+from backend.paper_process.paper import PaperSummary
+from backend.paper_process.text_codec import TextCodec, train_dictionary
+
+IDENTITY_LOOKUP_CHUNK = 500
+PRUNED_PAPER_COLUMNS = {
+    "abstract_raw": "",
+    "authors_json": "[]",
+    "affiliations_json": "[]",
+    "code_urls_json": "[]",
+    "categories_json": "[]",
+}
+COMPRESSED_PAPER_COLUMNS = ("abstract_raw", "authors_json", "affiliations_json", "code_urls_json", "categories_json")
+DICTIONARY_TRAINING_MIN_PAPERS = 200
+DICTIONARY_TRAINING_SAMPLES = 2000
+PAPER_COLUMNS = (
+    "external_id",
+    "source",
+    "title_raw",
+    "title_norm",
+    "abstract_raw",
+    "authors_json",
+    "affiliations_json",
+    "published_at",
+    "updated_at",
+    "arxiv_url",
+    "pdf_url",
+    "code_urls_json",
+    "categories_json",
+    "first_seen_at",
+)
+
+SEARCH_TERM_PATTERN = re.compile(r"\w+")
+
+
+def _create_paper_search_index(conn: sqlite3.Connection) -> None:
+    """Create the contentless FTS5 index and fill it from existing papers."""
+
+    conn.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+            title, abstract, content='', tokenize='porter unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    rows = conn.execute("SELECT dict_id, dictionary FROM text_dictionaries").fetchall()
+    codec = TextCodec({int(row[0]): bytes(row[1]) for row in rows})
+    conn.executemany(
+        "INSERT INTO papers_fts (rowid, title, abstract) VALUES (?, ?, ?)",
+        (
+            (row[0], row[1], codec.decode(row[2]))
+            for row in conn.execute("SELECT rowid, title_raw, abstract_raw FROM papers").fetchall()
+        ),
+    )
+
+
+def _update_term_index(
+    conn: sqlite3.Connection,
+    rowid: int,
+    old_terms: Counter[str],
+    new_terms: Counter[str] | None,
+) -> None:
+    """Move one paper's index entries from ``old_terms`` to ``new_terms`` (``None`` removes it)."""
+
+    removing = new_terms is None
+    new_terms = new_terms or Counter()
+    removed = [(term,) for term in old_terms if term not in new_terms]
+    added = [(term,) for term in new_terms if term not in old_terms]
+    if removed:
+        conn.executemany("UPDATE paper_term_stats SET df = df - 1 WHERE term = ?", removed)
+    if added:
+        conn.executemany(
+            "INSERT INTO paper_term_stats (term, df) VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET df = df + 1",
+            added,
+        )
+    if removing:
+        conn.execute("DELETE FROM paper_lengths WHERE paper_rowid = ?", (rowid,))
+    else:
+        conn.execute(
+            "INSERT OR REPLACE INTO paper_lengths (paper_rowid, length) VALUES (?, ?)",
+            (rowid, sum(new_terms.values())),
+        )
+
+
+def _create_paper_term_index(conn: sqlite3.Connection) -> None:
+    """Create the BM25 document-frequency and length tables and fill them."""
+
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS paper_term_stats (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS paper_lengths (paper_rowid INTEGER PRIMARY KEY, length INTEGER NOT NULL)")
+    rows = conn.execute("SELECT dict_id, dictionary FROM text_dictionaries").fetchall()
+    codec = TextCodec({int(row[0]): bytes(row[1]) for row in rows})
+    for rowid, title, abstract in conn.execute("SELECT rowid, title_raw, abstract_raw FROM papers").fetchall():
+        _update_term_index(conn, rowid, Counter(), document_terms(f"{title} {codec.decode(abstract)}"))
+
+
+# Each entry upgrades the schema by one ``PRAGMA user_version``. Entries are
+# append-only: never edit a released migration, add a new one instead.
+# Version 1 is the schema from before versioning; its IF NOT EXISTS
+# statements adopt databases created by older releases. Callables run inside
+# the migration transaction for steps that need Python (e.g. decompression).
+SCHEMA_MIGRATIONS = [
+    # 1: base tables
+    """
+    CREATE TABLE IF NOT EXISTS papers (
+        external_id TEXT PRIMARY KEY,
+        source TEXT NOT NULL,
+        title_raw TEXT NOT NULL,
+        title_norm TEXT NOT NULL,
+        abstract_raw TEXT NOT NULL,
+        authors_json TEXT NOT NULL,
+        affiliations_json TEXT NOT NULL,
+        published_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        arxiv_url TEXT NOT NULL,
+        pdf_url TEXT NOT NULL,
+        code_urls_json TEXT NOT NULL,
+        categories_json TEXT NOT NULL,
+        first_seen_at TEXT NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_papers_title_norm ON papers(title_norm);
+
+    CREATE TABLE IF NOT EXISTS digests (
+        digest_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_at TEXT NOT NULL,
+        output_path TEXT NOT NULL,
+        model_used TEXT NOT NULL,
+        window_days INTEGER NOT NULL,
+        top_k INTEGER NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS digest_items (
+        digest_id INTEGER NOT NULL,
+        external_id TEXT NOT NULL,
+        rank_order INTEGER NOT NULL,
+        PRIMARY KEY (digest_id, external_id),
+        FOREIGN KEY(digest_id) REFERENCES digests(digest_id)
+    );
+
+    CREATE TABLE IF NOT EXISTS llm_usage (
+        usage_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_at TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        model TEXT NOT NULL,
+        endpoint TEXT NOT NULL,
+        prompt_tokens INTEGER NOT NULL,
+        completion_tokens INTEGER NOT NULL,
+        estimated_prompt_tokens INTEGER NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS llm_usage_runs (
+        run_at TEXT PRIMARY KEY,
+        call_count INTEGER NOT NULL,
+        prompt_tokens INTEGER NOT NULL,
+        completion_tokens INTEGER NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS paper_identities (
+        identifier TEXT PRIMARY KEY,
+        paper_key TEXT NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_paper_identities_key ON paper_identities(paper_key);
+
+    CREATE TABLE IF NOT EXISTS paper_minhash (
+        external_id TEXT PRIMARY KEY,
+        signature BLOB NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS paper_lsh_buckets (
+        band INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        external_id TEXT NOT NULL,
+        PRIMARY KEY (band, bucket, external_id)
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS text_dictionaries (
+        dict_id INTEGER PRIMARY KEY,
+        trained_at TEXT NOT NULL,
+        dictionary BLOB NOT NULL
+    );
+    """,
+    # 2: generated date columns and indexes for date and recency lookups
+    """
+    ALTER TABLE papers ADD COLUMN first_seen_date TEXT GENERATED ALWAYS AS (substr(first_seen_at, 1, 10)) VIRTUAL;
+    ALTER TABLE digests ADD COLUMN run_date TEXT GENERATED ALWAYS AS (substr(run_at, 1, 10)) VIRTUAL;
+    ALTER TABLE llm_usage ADD COLUMN run_date TEXT GENERATED ALWAYS AS (substr(run_at, 1, 10)) VIRTUAL;
+    ALTER TABLE llm_usage_runs ADD COLUMN run_date TEXT GENERATED ALWAYS AS (substr(run_at, 1, 10)) VIRTUAL;
+
+    CREATE INDEX IF NOT EXISTS idx_papers_first_seen_at ON papers(first_seen_at);
+    CREATE INDEX IF NOT EXISTS idx_papers_first_seen_date ON papers(first_seen_date);
+    CREATE INDEX IF NOT EXISTS idx_digests_run_at ON digests(run_at);
+    CREATE INDEX IF NOT EXISTS idx_digests_run_date ON digests(run_date);
+    CREATE INDEX IF NOT EXISTS idx_llm_usage_run_at ON llm_usage(run_at);
+    CREATE INDEX IF NOT EXISTS idx_llm_usage_run_date ON llm_usage(run_date);
+    CREATE INDEX IF NOT EXISTS idx_llm_usage_runs_run_date ON llm_usage_runs(run_date);
+    """,
+    # 3: full-text index over titles and abstracts
+    _create_paper_search_index,
+    # 4: BM25 term statistics (document frequencies and lengths)
+    _create_paper_term_index,
+    # 5: generated summaries, binary encoded with ``binary_codec``
+    """
+    CREATE TABLE IF NOT EXISTS paper_summaries (
+        external_id TEXT PRIMARY KEY,
+        summarized_at TEXT NOT NULL,
+        summarized_date TEXT GENERATED ALWAYS AS (substr(summarized_at, 1, 10)) VIRTUAL,
+        payload BLOB NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_paper_summaries_date ON paper_summaries(summarized_date);
+    """,
+    # 6: digested paper ids, kept when old digests are archived
+    """
+    CREATE TABLE IF NOT EXISTS digested_papers (
+        external_id TEXT PRIMARY KEY,
+        digest_count INTEGER NOT NULL
+    ) WITHOUT ROWID;
+
+    INSERT OR IGNORE INTO digested_papers (external_id, digest_count)
+    SELECT external_id, COUNT(*) FROM digest_items GROUP BY external_id;
+    """,
+]
+
+
+def _forget_digest_items(conn: sqlite3.Connection, digest_ids: list[int]) -> None:
+    """Delete the items of ``digest_ids`` and drop papers no digest still lists."""
+
+    for start in range(0, len(digest_ids), IDENTITY_LOOKUP_CHUNK):
+        chunk = digest_ids[start : start + IDENTITY_LOOKUP_CHUNK]
+        placeholders = ",".join("?" for _ in chunk)
+        conn.execute(
+            f"""
+            UPDATE digested_papers SET digest_count = digest_count - (
+                SELECT COUNT(*) FROM digest_items
+                WHERE digest_items.external_id = digested_papers.external_id AND digest_id IN ({placeholders})
+            )
+            WHERE external_id IN (SELECT external_id FROM digest_items WHERE digest_id IN ({placeholders}))
+            """,
+            chunk + chunk,
+        )
+        conn.execute(f"DELETE FROM digest_items WHERE digest_id IN ({placeholders})", chunk)
+    conn.execute("DELETE FROM digested_papers WHERE digest_count <= 0")
+
 
 class SQLiteCache:
     """SQLite-backed cache for dedup and digest history."""
 
-    def __init__(self, db_path: str | Path):
+    def __init__(self, db_path: str | Path, seen_filter_capacity: int = 1_000_000, read_only: bool = False):
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.read_only = read_only
+        if not read_only:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.seen_filter_path = self.db_path.with_name(f"{self.db_path.name}.bloom")
+        self.seen_filter_capacity = seen_filter_capacity
+        self._seen_filter: BloomFilter | None = None
+        self.digest_archive_path = self.db_path.with_name(f"{self.db_path.name}.digests.jsonl.gz")
+        self._text_codec: TextCodec | None = None
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+        if self.read_only:
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
     def init_db(self) -> None:
+        """Create or upgrade the schema to the latest ``SCHEMA_MIGRATIONS`` version."""
+
         with self._connect() as conn:
-            conn.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS papers (
-                    external_id TEXT PRIMARY KEY,
-                    source TEXT NOT NULL,
-                    title_raw TEXT NOT NULL,
-                    title_norm TEXT NOT NULL,
-                    abstract_raw TEXT NOT NULL,
-                    authors_json TEXT NOT NULL,
-                    affiliations_json TEXT NOT NULL,
-                    published_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    arxiv_url TEXT NOT NULL,
-                    pdf_url TEXT NOT NULL,
-                    code_urls_json TEXT NOT NULL,
-                    categories_json TEXT NOT NULL,
-                    first_seen_at TEXT NOT NULL
-                );
-
-                CREATE INDEX IF NOT EXISTS idx_papers_title_norm ON papers(title_norm);
-
-                CREATE TABLE IF NOT EXISTS digests (
-                    digest_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    run_at TEXT NOT NULL,
-                    output_path TEXT NOT NULL,
-                    model_used TEXT NOT NULL,
-                    window_days INTEGER NOT NULL,
-                    top_k INTEGER NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS digest_items (
-                    digest_id INTEGER NOT NULL,
-                    external_id TEXT NOT NULL,
-                    rank_order INTEGER NOT NULL,
-                    PRIMARY KEY (digest_id, external_id),
-                    FOREIGN KEY(digest_id) REFERENCES digests(digest_id)
-                );
-                """
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            version = int(conn.execute("PRAGMA user_version").fetchone()[0])
+            for target, migration in enumerate(SCHEMA_MIGRATIONS[version:], start=version + 1):
+                print(f"[STEP] Migrating cache schema: version {target - 1} -> {target}")
+                try:
+                    if callable(migration):
+                        conn.execute("BEGIN IMMEDIATE")
+                        migration(conn)
+                        conn.execute(f"PRAGMA user_version = {target}")
+                        conn.commit()
+                    else:
+                        conn.executescript(f"BEGIN IMMEDIATE;\n{migration}\nPRAGMA user_version = {target};\nCOMMIT;")
+                except sqlite3.OperationalError:
+                    # Another process may have applied the same migration first.
+                    conn.rollback()
+                    if int(conn.execute("PRAGMA user_version").fetchone()[0]) < target:
+                        raise
+        self._text_codec = None
+        self._train_text_dictionary_if_ready()
+
+    def require_current_schema(self) -> None:
+        """Raise ``RuntimeError`` unless the pipeline has migrated this database to the latest schema."""
+
+        with self._connect() as conn:
+            version = int(conn.execute("PRAGMA user_version").fetchone()[0])
+        if version < len(SCHEMA_MIGRATIONS):
+            raise RuntimeError(
+                f"Cache {self.db_path} has schema version {version}, expected {len(SCHEMA_MIGRATIONS)}; "
+                "run the pipeline once to migrate it"
             )
 
+    def _load_text_codec(self) -> TextCodec:
+        if self._text_codec is not None:
+            return self._text_codec
+        with self._connect() as conn:
+            rows = conn.execute("SELECT dict_id, dictionary FROM text_dictionaries ORDER BY dict_id").fetchall()
+        dictionaries = {int(row["dict_id"]): bytes(row["dictionary"]) for row in rows}
+        self._text_codec = TextCodec(dictionaries, dict_id=max(dictionaries, default=0))
+        return self._text_codec
+
+    def _train_text_dictionary_if_ready(self) -> None:
+        """Train the abstract dictionary once enough papers exist, then recompress.
+
+        This is also the migration for rows stored as plain TEXT before
+        compression: every payload column is rewritten with the new codec.
+        """
+
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM text_dictionaries LIMIT 1").fetchone() is not None:
+                return
+            rows = conn.execute(
+                "SELECT abstract_raw FROM papers WHERE abstract_raw != '' LIMIT ?",
+                (DICTIONARY_TRAINING_SAMPLES,),
+            ).fetchall()
+        if len(rows) < DICTIONARY_TRAINING_MIN_PAPERS:
+            return
+
+        plain = TextCodec(self._load_text_codec().dictionaries)
+        dictionary = train_dictionary([plain.decode(row["abstract_raw"]) for row in rows])
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO text_dictionaries (trained_at, dictionary) VALUES (?, ?)",
+                (datetime.now(timezone.utc).isoformat(), dictionary),
+            )
+            dict_id = int(cursor.lastrowid or 0)
+        self._text_codec = None
+        codec = self._load_text_codec()
+        print(f"[STEP] Trained text compression dictionary {dict_id} ({len(dictionary)} bytes); recompressing papers")
+        self._recompress_papers(codec)
+
+    def _recompress_papers(self, codec: TextCodec, batch_size: int = 500) -> None:
+        columns = ", ".join(COMPRESSED_PAPER_COLUMNS)
+        assignments = ", ".join(f"{column} = ?" for column in COMPRESSED_PAPER_COLUMNS)
+        with self._connect() as conn:
+            last_id = ""
+            while True:
+                rows = conn.execute(
+                    f"SELECT external_id, {columns} FROM papers WHERE external_id > ? ORDER BY external_id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+                if not rows:
+                    break
+                conn.executemany(
+                    f"UPDATE papers SET {assignments} WHERE external_id = ?",
+                    [
+                        (
+                            *(codec.encode(codec.decode(row[column])) for column in COMPRESSED_PAPER_COLUMNS),
+                            row["external_id"],
+                        )
+                        for row in rows
+                    ],
+                )
+                last_id = rows[-1]["external_id"]
+
     def should_run(self, now: datetime, min_interval_hours: int) -> bool:
         """Apply 48h gate based on the last successful digest run."""
 
@@ -85,13 +405,95 @@ class SQLiteCache:
         title_norms = {row["title_norm"] for row in rows}
         return external_ids, title_norms
 
+    def fetch_seen_keys_for(
+        self,
+        external_ids: list[str],
+        title_norms: list[str],
+    ) -> tuple[set[str], set[str]]:
+        """Return which of the given ids and title keys are already cached.
+
+        The Bloom filter answers definite misses; only probable positives
+        are confirmed against SQLite, so cost scales with the batch rather
+        than the history.
+        """
+
+        seen_filter = self._load_seen_filter()
+        maybe_ids = sorted({item for item in external_ids if f"id:{item}" in seen_filter})
+        maybe_titles = sorted({item for item in title_norms if f"title:{item}" in seen_filter})
+        with self._connect() as conn:
+            seen_ids = self._select_existing(conn, "external_id", maybe_ids)
+            seen_titles = self._select_existing(conn, "title_norm", maybe_titles)
+        return seen_ids, seen_titles
+
+    @staticmethod
+    def _select_existing(conn: sqlite3.Connection, column: str, values: list[str]) -> set[str]:
+        found: set[str] = set()
+        for start in range(0, len(values), IDENTITY_LOOKUP_CHUNK):
+            chunk = values[start : start + IDENTITY_LOOKUP_CHUNK]
+            placeholders = ",".join("?" for _ in chunk)
+            rows = conn.execute(f"SELECT {column} FROM papers WHERE {column} IN ({placeholders})", chunk).fetchall()
+            found.update(row[column] for row in rows)
+        return found
+
+    def _load_seen_filter(self) -> BloomFilter:
+        if self._seen_filter is not None:
+            return self._seen_filter
+
+        self.init_db()
+        with self._connect() as conn:
+            paper_count = int(conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0])
+        seen_filter = BloomFilter(self.seen_filter_path, capacity=max(self.seen_filter_capacity, paper_count * 2))
+        # Each paper adds up to two keys, so fewer keys than papers means the
+        # filter missed writes (deleted file, restored DB) and must be rebuilt.
+        if seen_filter.count < paper_count:
+            seen_filter = self._rebuild_seen_filter(seen_filter, capacity=max(self.seen_filter_capacity, paper_count * 2))
+        self._seen_filter = seen_filter
+        return seen_filter
+
+    def _rebuild_seen_filter(self, current: BloomFilter | None, capacity: int) -> BloomFilter:
+        if current is not None:
+            current.close()
+        self.seen_filter_path.unlink(missing_ok=True)
+        seen_filter = BloomFilter(self.seen_filter_path, capacity=capacity)
+        print(f"[STEP] Rebuilding seen-paper Bloom filter: {self.seen_filter_path}")
+        with self._connect() as conn:
+            for row in conn.execute("SELECT external_id, title_norm FROM papers"):
+                seen_filter.add(f"id:{row['external_id']}")
+                seen_filter.add(f"title:{row['title_norm']}")
+        seen_filter.flush()
+        return seen_filter
+
+    def _add_to_seen_filter(self, external_id: str, title_norm: str) -> None:
+        seen_filter = self._load_seen_filter()
+        seen_filter.add(f"id:{external_id}")
+        seen_filter.add(f"title:{title_norm}")
+        if seen_filter.saturated:
+            self._seen_filter = self._rebuild_seen_filter(seen_filter, capacity=seen_filter.capacity * 2)
+
+    def _reset_seen_filter(self) -> None:
+        if self._seen_filter is not None:
+            self._seen_filter.close()
+            self._seen_filter = None
+        self.seen_filter_path.unlink(missing_ok=True)
+
     def clear_history(self) -> None:
         """Clear cached papers and digest history for a fresh run."""
 
         with self._connect() as conn:
             conn.execute("DELETE FROM digest_items")
+            conn.execute("DELETE FROM digested_papers")
             conn.execute("DELETE FROM digests")
             conn.execute("DELETE FROM papers")
+            conn.execute("INSERT INTO papers_fts (papers_fts) VALUES ('delete-all')")
+            conn.execute("DELETE FROM paper_term_stats")
+            conn.execute("DELETE FROM paper_lengths")
+            conn.execute("DELETE FROM paper_identities")
+            conn.execute("DELETE FROM paper_lsh_buckets")
+            conn.execute("DELETE FROM paper_minhash")
+            conn.execute("DELETE FROM paper_summaries")
+            conn.execute("DELETE FROM llm_usage")
+            conn.execute("DELETE FROM llm_usage_runs")
+        self._reset_seen_filter()
 
     def clear_history_for_date(self, target_date: date) -> None:
         """Clear papers and digests created on the target date only."""
@@ -99,21 +501,45 @@ class SQLiteCache:
         target_date_iso = target_date.isoformat()
         with self._connect() as conn:
             digest_rows = conn.execute(
-                "SELECT digest_id FROM digests WHERE substr(run_at, 1, 10) = ?",
+                "SELECT digest_id FROM digests WHERE run_date = ?",
                 (target_date_iso,),
             ).fetchall()
-            digest_ids = [int(row["digest_id"]) for row in digest_rows]
-            if digest_ids:
-                placeholders = ",".join("?" for _ in digest_ids)
-                conn.execute(f"DELETE FROM digest_items WHERE digest_id IN ({placeholders})", digest_ids)
+            _forget_digest_items(conn, [int(row["digest_id"]) for row in digest_rows])
+            conn.execute(
+                "DELETE FROM digests WHERE run_date = ?",
+                (target_date_iso,),
+            )
             conn.execute(
-                "DELETE FROM digests WHERE substr(run_at, 1, 10) = ?",
+                """
+                DELETE FROM paper_identities WHERE paper_key IN (
+                    SELECT external_id FROM papers WHERE first_seen_date = ?
+                )
+                """,
                 (target_date_iso,),
             )
+            for table in ("paper_lsh_buckets", "paper_minhash"):
+                conn.execute(
+                    f"""
+                    DELETE FROM {table} WHERE external_id IN (
+                        SELECT external_id FROM papers WHERE first_seen_date = ?
+                    )
+                    """,
+                    (target_date_iso,),
+                )
+            rows = conn.execute(
+                "SELECT rowid, title_raw, abstract_raw FROM papers WHERE first_seen_date = ?",
+                (target_date_iso,),
+            ).fetchall()
+            for row in rows:
+                self._unindex_paper_text(conn, row)
+                _update_term_index(conn, row["rowid"], self._paper_terms(row), None)
             conn.execute(
-                "DELETE FROM papers WHERE substr(first_seen_at, 1, 10) = ?",
+                "DELETE FROM papers WHERE first_seen_date = ?",
                 (target_date_iso,),
             )
+            conn.execute("DELETE FROM paper_summaries WHERE summarized_date = ?", (target_date_iso,))
+            conn.execute("DELETE FROM llm_usage WHERE run_date = ?", (target_date_iso,))
+            conn.execute("DELETE FROM llm_usage_runs WHERE run_date = ?", (target_date_iso,))
 
     def delete_last_digest(self) -> str | None:
         """Delete latest digest row (and items) and return its output path."""
@@ -132,7 +558,7 @@ class SQLiteCache:
 
             digest_id = row["digest_id"]
             output_path = row["output_path"]
-            conn.execute("DELETE FROM digest_items WHERE digest_id = ?", (digest_id,))
+            _forget_digest_items(conn, [digest_id])
             conn.execute("DELETE FROM digests WHERE digest_id = ?", (digest_id,))
 
         return str(output_path)
@@ -140,36 +566,157 @@ class SQLiteCache:
     def upsert_paper(self, **kwargs: str) -> None:
         """Upsert a paper row using keyword args matching table columns."""
 
-        columns = [
-            "external_id",
-            "source",
-            "title_raw",
-            "title_norm",
-            "abstract_raw",
-            "authors_json",
-            "affiliations_json",
-            "published_at",
-            "updated_at",
-            "arxiv_url",
-            "pdf_url",
-            "code_urls_json",
-            "categories_json",
-            "first_seen_at",
-        ]
+        self.upsert_papers([kwargs])
+
+    def upsert_papers(self, rows: Iterable[dict[str, str]]) -> None:
+        """Upsert paper rows in one transaction.
+
+        Search index rows and term statistics are written once for the whole
+        batch; a paper repeated in ``rows`` keeps its last values.
+        """
 
-        values = [kwargs[col] for col in columns]
+        rows = list({row["external_id"]: row for row in rows}.values())
+        if not rows:
+            return
+        columns = PAPER_COLUMNS
+        codec = self._load_text_codec()
+        self._load_seen_filter()
         placeholders = ",".join(["?"] * len(columns))
         updates = ", ".join(f"{col}=excluded.{col}" for col in columns if col not in {"external_id", "first_seen_at"})
 
+        df_delta: Counter[str] = Counter()
+        fts_rows: list[tuple[int, str, str]] = []
+        lengths: list[tuple[int, int]] = []
         with self._connect() as conn:
-            conn.execute(
-                f"""
-                INSERT INTO papers ({','.join(columns)})
-                VALUES ({placeholders})
-                ON CONFLICT(external_id) DO UPDATE SET {updates}
+            for row in rows:
+                values = [codec.encode(row[col]) if col in COMPRESSED_PAPER_COLUMNS else row[col] for col in columns]
+                previous = conn.execute(
+                    "SELECT rowid, title_raw, abstract_raw FROM papers WHERE external_id = ?",
+                    (row["external_id"],),
+                ).fetchone()
+                cursor = conn.execute(
+                    f"""
+                    INSERT INTO papers ({','.join(columns)})
+                    VALUES ({placeholders})
+                    ON CONFLICT(external_id) DO UPDATE SET {updates}
+                    """,
+                    values,
+                )
+                old_terms = Counter()
+                if previous is not None:
+                    self._unindex_paper_text(conn, previous)
+                    old_terms = self._paper_terms(previous)
+                rowid = previous["rowid"] if previous is not None else cursor.lastrowid
+                fts_rows.append((rowid, row["title_raw"], row["abstract_raw"]))
+                new_terms = document_terms(f"{row['title_raw']} {row['abstract_raw']}")
+                df_delta.update(new_terms.keys() - old_terms.keys())
+                df_delta.subtract(old_terms.keys() - new_terms.keys())
+                lengths.append((rowid, sum(new_terms.values())))
+            conn.executemany("INSERT INTO papers_fts (rowid, title, abstract) VALUES (?, ?, ?)", fts_rows)
+            conn.executemany(
+                """
+                INSERT INTO paper_term_stats (term, df) VALUES (?, ?)
+                ON CONFLICT(term) DO UPDATE SET df = df + excluded.df
                 """,
-                values,
+                [(term, delta) for term, delta in df_delta.items() if delta],
             )
+            conn.executemany("INSERT OR REPLACE INTO paper_lengths (paper_rowid, length) VALUES (?, ?)", lengths)
+        for row in rows:
+            self._add_to_seen_filter(row["external_id"], row["title_norm"])
+
+    def _unindex_paper_text(self, conn: sqlite3.Connection, row: sqlite3.Row) -> None:
+        # A contentless FTS5 delete must repeat the exact indexed values.
+        conn.execute(
+            "INSERT INTO papers_fts (papers_fts, rowid, title, abstract) VALUES ('delete', ?, ?, ?)",
+            (row["rowid"], row["title_raw"], self._load_text_codec().decode(row["abstract_raw"])),
+        )
+
+    def _paper_terms(self, row: sqlite3.Row) -> Counter[str]:
+        return document_terms(f"{row['title_raw']} {self._load_text_codec().decode(row['abstract_raw'])}")
+
+    def fetch_term_stats(self, terms: Iterable[str]) -> CorpusStats:
+        """Return corpus size, total length and document frequencies of ``terms``."""
+
+        terms = list(dict.fromkeys(terms))
+        df: dict[str, int] = {}
+        with self._connect() as conn:
+            doc_count, total_length = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM paper_lengths"
+            ).fetchone()
+            for start in range(0, len(terms), IDENTITY_LOOKUP_CHUNK):
+                chunk = terms[start : start + IDENTITY_LOOKUP_CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"SELECT term, df FROM paper_term_stats WHERE term IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                df.update((row["term"], int(row["df"])) for row in rows)
+        return CorpusStats(doc_count=int(doc_count), total_length=int(total_length), df=df)
+
+    def search_papers(self, query: str, limit: int = 20) -> list[dict]:
+        """Full-text search over cached titles and abstracts.
+
+        Args:
+            query: Free text; every word is matched as a term (OR), so the
+                BM25 order rewards papers matching more and rarer terms.
+            limit: Maximum number of results.
+
+        Returns:
+            Rows with ``external_id``, ``source``, ``title``, ``published_at``,
+            ``first_seen_at`` and ``score`` (higher is more relevant).
+        """
+
+        terms = dict.fromkeys(SEARCH_TERM_PATTERN.findall(query.lower()))
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in terms)
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT p.external_id, p.source, p.title_raw, p.published_at, p.first_seen_at,
+                       bm25(papers_fts, 2.0, 1.0) AS score
+                FROM papers_fts
+                JOIN papers AS p ON p.rowid = papers_fts.rowid
+                WHERE papers_fts MATCH ?
+                ORDER BY score
+                LIMIT ?
+                """,
+                (match, limit),
+            ).fetchall()
+        return [
+            {
+                "external_id": row["external_id"],
+                "source": row["source"],
+                "title": row["title_raw"],
+                "published_at": row["published_at"],
+                "first_seen_at": row["first_seen_at"],
+                "score": round(-float(row["score"]), 4),
+            }
+            for row in rows
+        ]
+
+    def fetch_digested_ids(self) -> set[str]:
+        """Return ids of papers that appeared in any recorded digest, archived ones included."""
+
+        with self._connect() as conn:
+            rows = conn.execute("SELECT external_id FROM digested_papers").fetchall()
+        return {row["external_id"] for row in rows}
+
+    def fetch_paper(self, external_id: str) -> dict[str, str] | None:
+        """Return one cached paper row with payload columns decompressed."""
+
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(PAPER_COLUMNS)} FROM papers WHERE external_id = ?",
+                (external_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        codec = self._load_text_codec()
+        return {
+            key: codec.decode(row[key]) if key in COMPRESSED_PAPER_COLUMNS else row[key]
+            for key in row.keys()
+        }
 
     def record_digest(
         self,
@@ -203,5 +750,250 @@ class SQLiteCache:
                     """,
                     (digest_id, external_id, index),
                 )
+                conn.execute(
+                    """
+                    INSERT INTO digested_papers (external_id, digest_count) VALUES (?, 1)
+                    ON CONFLICT(external_id) DO UPDATE SET digest_count = digest_count + 1
+                    """,
+                    (external_id,),
+                )
 
         return digest_id
+
+    def record_summaries(self, run_at: datetime, summaries: list[PaperSummary]) -> None:
+        """Store generated summaries, replacing earlier ones for the same papers."""
+
+        run_at_iso = run_at.astimezone(timezone.utc).isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO paper_summaries (external_id, summarized_at, payload) VALUES (?, ?, ?)",
+                [(summary.external_id, run_at_iso, encode_summary(summary)) for summary in summaries],
+            )
+
+    def fetch_identity_keys(self, identifiers: list[str]) -> dict[str, str]:
+        """Map known identifiers to the paper key they were first seen with."""
+
+        found: dict[str, str] = {}
+        with self._connect() as conn:
+            for start in range(0, len(identifiers), IDENTITY_LOOKUP_CHUNK):
+                chunk = identifiers[start : start + IDENTITY_LOOKUP_CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"SELECT identifier, paper_key FROM paper_identities WHERE identifier IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                found.update({row["identifier"]: row["paper_key"] for row in rows})
+        return found
+
+    def record_identities(self, paper_key: str, identifiers: list[str]) -> None:
+        """Attach identifiers to ``paper_key``; existing mappings are kept."""
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO paper_identities (identifier, paper_key) VALUES (?, ?)",
+                [(identifier, paper_key) for identifier in identifiers],
+            )
+
+    def store_minhash(self, rows: list[tuple[str, bytes, list[int]]]) -> None:
+        """Store MinHash signatures and their LSH band buckets.
+
+        Args:
+            rows: ``(external_id, signature_bytes, bucket_per_band)`` tuples.
+        """
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO paper_minhash (external_id, signature) VALUES (?, ?)",
+                [(external_id, signature) for external_id, signature, _ in rows],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO paper_lsh_buckets (band, bucket, external_id) VALUES (?, ?, ?)",
+                [
+                    (band, bucket, external_id)
+                    for external_id, _, buckets in rows
+                    for band, bucket in enumerate(buckets)
+                ],
+            )
+
+    def find_lsh_matches(self, probes: list[tuple[int, int, int]]) -> list[tuple[int, str, bytes]]:
+        """Return stored papers sharing an LSH bucket with any probe.
+
+        Args:
+            probes: ``(probe_id, band, bucket)`` tuples.
+
+        Returns:
+            Distinct ``(probe_id, external_id, signature_bytes)`` rows.
+        """
+
+        if not probes:
+            return []
+        with self._connect() as conn:
+            conn.execute("CREATE TEMP TABLE lsh_probe (probe_id INTEGER, band INTEGER, bucket INTEGER)")
+            conn.executemany("INSERT INTO lsh_probe VALUES (?, ?, ?)", probes)
+            rows = conn.execute(
+                """
+                SELECT DISTINCT p.probe_id, b.external_id, m.signature
+                FROM lsh_probe AS p
+                JOIN paper_lsh_buckets AS b ON b.band = p.band AND b.bucket = p.bucket
+                JOIN paper_minhash AS m ON m.external_id = b.external_id
+                """
+            ).fetchall()
+            conn.execute("DROP TABLE lsh_probe")
+        return [(int(row["probe_id"]), row["external_id"], bytes(row["signature"])) for row in rows]
+
+    def prune_paper_payloads(self, before: datetime) -> int:
+        """Blank abstracts and metadata of papers first seen before ``before``.
+
+        Dedup keys (id, normalized title, identities, MinHash signatures)
+        are kept so old papers are still recognised as seen; the search
+        index keeps their titles only. Stored summaries written before
+        ``before`` are deleted as well.
+        """
+
+        before_iso = before.astimezone(timezone.utc).isoformat()
+        assignments = ", ".join(f"{column} = ?" for column in PRUNED_PAPER_COLUMNS)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT rowid, title_raw, abstract_raw FROM papers WHERE first_seen_at < ? AND abstract_raw != ''",
+                (before_iso,),
+            ).fetchall()
+            for row in rows:
+                self._unindex_paper_text(conn, row)
+                _update_term_index(conn, row["rowid"], self._paper_terms(row), document_terms(row["title_raw"]))
+            conn.executemany(
+                "INSERT INTO papers_fts (rowid, title, abstract) VALUES (?, ?, '')",
+                [(row["rowid"], row["title_raw"]) for row in rows],
+            )
+            cursor = conn.execute(
+                f"UPDATE papers SET {assignments} WHERE first_seen_at < ? AND abstract_raw != ''",
+                [*PRUNED_PAPER_COLUMNS.values(), before_iso],
+            )
+            conn.execute("DELETE FROM paper_summaries WHERE summarized_at < ?", (before_iso,))
+        return cursor.rowcount
+
+    def archive_digests(self, before: datetime, archive_path: str | Path | None = None) -> int:
+        """Move digests run before ``before`` to a gzip JSON-lines archive.
+
+        Each archived digest is appended as one line with its items in rank
+        order; per-call LLM usage rows of the same period are dropped since
+        ``llm_usage_runs`` keeps the run totals. ``digested_papers`` is left
+        alone so related-paper lookups still see archived digests.
+        """
+
+        before_iso = before.astimezone(timezone.utc).isoformat()
+        path = Path(archive_path) if archive_path else self.digest_archive_path
+        with self._connect() as conn:
+            digests = conn.execute(
+                "SELECT * FROM digests WHERE run_at < ? ORDER BY run_at, digest_id",
+                (before_iso,),
+            ).fetchall()
+            if digests:
+                digest_ids = [int(row["digest_id"]) for row in digests]
+                items: dict[int, list[str]] = {}
+                for start in range(0, len(digest_ids), IDENTITY_LOOKUP_CHUNK):
+                    chunk = digest_ids[start : start + IDENTITY_LOOKUP_CHUNK]
+                    placeholders = ",".join("?" for _ in chunk)
+                    for row in conn.execute(
+                        f"""
+                        SELECT digest_id, external_id FROM digest_items
+                        WHERE digest_id IN ({placeholders})
+                        ORDER BY digest_id, rank_order
+                        """,
+                        chunk,
+                    ):
+                        items.setdefault(int(row["digest_id"]), []).append(row["external_id"])
+
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with gzip.open(path, "at", encoding="utf-8") as handle:
+                    for row in digests:
+                        record = {**dict(row), "items": items.get(int(row["digest_id"]), [])}
+                        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+                conn.execute(
+                    "DELETE FROM digest_items WHERE digest_id IN (SELECT digest_id FROM digests WHERE run_at < ?)",
+                    (before_iso,),
+                )
+                conn.execute("DELETE FROM digests WHERE run_at < ?", (before_iso,))
+            conn.execute("DELETE FROM llm_usage WHERE run_at < ?", (before_iso,))
+        return len(digests)
+
+    def incremental_vacuum(self, max_pages: int | None = None) -> int:
+        """Return free pages to the OS and report how many were released.
+
+        Databases created before incremental auto-vacuum was enabled are
+        converted once with a full ``VACUUM``.
+        """
+
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            free_before = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+            if int(conn.execute("PRAGMA auto_vacuum").fetchone()[0]) != 2:
+                print(f"[STEP] Enabling incremental auto-vacuum: {self.db_path}")
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            else:
+                pragma = "PRAGMA incremental_vacuum" if max_pages is None else f"PRAGMA incremental_vacuum({int(max_pages)})"
+                conn.execute(pragma).fetchall()
+            free_after = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+        finally:
+            conn.close()
+        return free_before - free_after
+
+    def record_llm_usage(self, run_at: datetime, records: list[UsageRecord]) -> None:
+        """Store per-call token usage and accumulate the run total."""
+
+        run_at_iso = run_at.astimezone(timezone.utc).isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO llm_usage (
+                    run_at, stage, model, endpoint, prompt_tokens, completion_tokens, estimated_prompt_tokens
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        run_at_iso,
+                        item.stage,
+                        item.model,
+                        item.endpoint,
+                        item.prompt_tokens,
+                        item.completion_tokens,
+                        item.estimated_prompt_tokens,
+                    )
+                    for item in records
+                ],
+            )
+            conn.execute(
+                """
+                INSERT INTO llm_usage_runs (run_at, call_count, prompt_tokens, completion_tokens)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(run_at) DO UPDATE SET
+                    call_count = call_count + excluded.call_count,
+                    prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                    completion_tokens = completion_tokens + excluded.completion_tokens
+                """,
+                (
+                    run_at_iso,
+                    len(records),
+                    sum(item.prompt_tokens for item in records),
+                    sum(item.completion_tokens for item in records),
+                ),
+            )
+
+    def fetch_llm_usage_totals(self, run_at: datetime) -> dict[str, int] | None:
+        """Return token totals recorded for one run, or None if absent."""
+
+        run_at_iso = run_at.astimezone(timezone.utc).isoformat()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT call_count, prompt_tokens, completion_tokens FROM llm_usage_runs WHERE run_at = ?",
+                (run_at_iso,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "calls": int(row["call_count"]),
+            "prompt_tokens": int(row["prompt_tokens"]),
+            "completion_tokens": int(row["completion_tokens"]),
+        }
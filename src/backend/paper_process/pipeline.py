@@ -3,19 +3,41 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, time, timezone
+from itertools import groupby
 
 from backend.common.protocols import (
     CacheInterface,
+    NearDuplicateFilterInterface,
     RankerInterface,
+    RelatedPaperFinderInterface,
     RendererInterface,
+    RetentionPolicyInterface,
     SourceInterface,
     SummarizerInterface,
     WriterInterface,
 )
-from backend.paper_process.paper import PipelineRunResult
-from backend.paper_process.normalize import deduplicate_candidates, normalize_title
+from backend.models.tokens import UsageLedger
+from backend.paper_process.identity import candidate_identifiers, collapse_by_identity
+from backend.paper_process.paper import PaperCandidate, PaperSummary, PipelineRunResult
+from backend.paper_process.batch import CandidateBatch
+from backend.paper_process.normalize import batch_title_keys, deduplicate_batch, deduplicate_candidates, title_keys
+
+
+BACKFILL_WORKERS = 2
+
+
+@dataclass(slots=True)
+class DigestProfile:
+    """A research profile ranked against the shared candidate pool."""
+
+    name: str
+    ranker: RankerInterface
+    top_k: int | None = None
 
 
 @dataclass(slots=True)
@@ -34,11 +56,113 @@ class DailyPaperPipeline:
     model_used: str = "sonnet-4.6"
     require_llm: bool = False
     llm_enabled: bool = True
+    usage_ledger: UsageLedger | None = None
+    near_duplicate_filter: NearDuplicateFilterInterface | None = None
+    retention_policy: RetentionPolicyInterface | None = None
+    related_finder: RelatedPaperFinderInterface | None = None
+    profiles: list[DigestProfile] = field(default_factory=list)
 
     def run(self, now: datetime | None = None) -> PipelineRunResult:
         """Run the full pipeline once."""
 
         now_utc = now.astimezone(timezone.utc) if now else datetime.now(timezone.utc)
+        try:
+            return self._run(now_utc)
+        finally:
+            self._record_usage(now_utc)
+
+    def backfill(
+        self,
+        start: date,
+        end: date,
+        workers: int = BACKFILL_WORKERS,
+    ) -> Iterator[tuple[date, PipelineRunResult]]:
+        """Generate one digest per day from ``start`` to ``end`` (inclusive).
+
+        The range is fetched once through the source's newest-first
+        ``search_range_batches`` (or ``search_range``) stream and split into
+        days as it arrives. Each day is held as a columnar ``CandidateBatch``;
+        exact dedup reads its columns and only the surviving rows become
+        ``PaperCandidate`` objects for identity and near-duplicate checks and
+        caching, all on the calling thread. Survivors are then ranked
+        (``rank_batch`` when the ranker has it), summarized and written on
+        ``workers`` threads, which also bounds concurrent LLM calls. At most
+        ``workers + 1`` days are held at once; results are yielded newest day
+        first. The interval gate and retention policy do not apply.
+        """
+
+        if not hasattr(self.source, "search_range_batches") and not hasattr(self.source, "search_range"):
+            raise ValueError(f"{type(self.source).__name__} does not support date-range search")
+        if self.require_llm and not self.llm_enabled:
+            raise RuntimeError("require_llm=True but AI_MODEL_API_KEY / AI_MODEL_URL not configured")
+
+        print("[STEP] Initializing cache database")
+        self.cache.init_db()
+        print(f"[STEP] Backfill started: {start} -> {end}, workers={workers}")
+        digest = self._run_profiles if self.profiles else self._digest
+        pending: deque[tuple[date, Future[PipelineRunResult] | PipelineRunResult]] = deque()
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as executor:
+                for day, batch in self._range_days(start, end):
+                    day_utc = datetime.combine(day, time(), tzinfo=timezone.utc)
+                    print(f"[STEP] Backfill day fetched: {day}, candidates={len(batch)}")
+                    deduped = self._ingest_batch(batch, day_utc)
+                    if len(deduped):
+                        pending.append((day, executor.submit(digest, deduped, day_utc)))
+                    else:
+                        pending.append(
+                            (
+                                day,
+                                PipelineRunResult(
+                                    generated=False,
+                                    summary_count=0,
+                                    output_path=None,
+                                    skipped_reason="No new papers after deduplication",
+                                ),
+                            )
+                        )
+                    while len(pending) > workers:
+                        yield _settle(*pending.popleft())
+                while pending:
+                    yield _settle(*pending.popleft())
+        finally:
+            self._record_usage(datetime.now(timezone.utc))
+        print("[STEP] Backfill completed")
+
+    def _range_days(self, start: date, end: date) -> Iterator[tuple[date, CandidateBatch]]:
+        """The source's range as ``(day, batch)`` pairs, newest first, limited to ``start``..``end``."""
+
+        search_range_batches = getattr(self.source, "search_range_batches", None)
+        if search_range_batches is not None:
+            days = ((batch.published_at(0).date(), batch) for batch in search_range_batches(start, end))
+        else:
+            stream = self.source.search_range(start, end)
+            days = (
+                (day, CandidateBatch.from_candidates(group))
+                for day, group in groupby(stream, key=lambda item: item.published_at.date())
+            )
+        return ((day, batch) for day, batch in days if start <= day <= end)
+
+    def _record_usage(self, now_utc: datetime) -> None:
+        """Persist the ledger's records; runs in ``finally`` blocks, so failures are logged, not raised."""
+
+        if self.usage_ledger is None:
+            return
+        records = self.usage_ledger.drain()
+        if not records:
+            return
+        prompt_tokens = sum(item.prompt_tokens for item in records)
+        completion_tokens = sum(item.completion_tokens for item in records)
+        print(
+            "[STEP] LLM token usage: "
+            f"calls={len(records)}, prompt_tokens={prompt_tokens}, completion_tokens={completion_tokens}"
+        )
+        try:
+            self.cache.record_llm_usage(run_at=now_utc, records=records)
+        except Exception as exc:
+            print(f"[STEP] Recording LLM usage failed: {exc}")
+
+    def _run(self, now_utc: datetime) -> PipelineRunResult:
 
         if self.require_llm and not self.llm_enabled:
             print("[STEP] Aborted: require_llm=True but AI_MODEL_API_KEY / AI_MODEL_URL not configured")
@@ -74,30 +198,68 @@ class DailyPaperPipeline:
             )
         print(f"[STEP] Source fetch completed: candidates={len(candidates)}")
 
-        seen_ids, seen_title_hashes = self.cache.fetch_seen_keys()
+        deduped = self._ingest(candidates, now_utc)
+        if not deduped:
+            return PipelineRunResult(
+                generated=False,
+                summary_count=0,
+                output_path=None,
+                skipped_reason="No new papers after deduplication",
+            )
+
+        result = self._run_profiles(deduped, now_utc) if self.profiles else self._digest(deduped, now_utc)
+        if result.generated:
+            self._apply_retention(now_utc)
+            print("[STEP] Pipeline completed")
+        return result
+
+    def _ingest(self, candidates: list[PaperCandidate], now_utc: datetime) -> list[PaperCandidate]:
+        """Drop already-seen and duplicate candidates, then cache the rest as first seen at ``now_utc``."""
+
+        seen_ids, seen_title_hashes = self.cache.fetch_seen_keys_for(
+            external_ids=[candidate.external_id for candidate in candidates],
+            title_norms=title_keys(candidates),
+        )
         print("[STEP] Deduplicating candidates: " f"seen_ids={len(seen_ids)}, seen_title_hashes={len(seen_title_hashes)}")
         deduped = deduplicate_candidates(
             candidates=candidates,
             seen_external_ids=seen_ids,
             seen_title_hashes=seen_title_hashes,
         )
+        return self._store(deduped, now_utc)
+
+    def _ingest_batch(self, batch: CandidateBatch, now_utc: datetime) -> CandidateBatch:
+        """Same as ``_ingest`` over a columnar batch; only rows surviving exact dedup are materialized."""
+
+        seen_ids, seen_title_hashes = self.cache.fetch_seen_keys_for(
+            external_ids=batch.external_ids,
+            title_norms=batch_title_keys(batch),
+        )
+        print("[STEP] Deduplicating candidates: " f"seen_ids={len(seen_ids)}, seen_title_hashes={len(seen_title_hashes)}")
+        fresh = deduplicate_batch(batch, seen_ids, seen_title_hashes)
+        kept = {candidate.external_id for candidate in self._store(list(fresh), now_utc)}
+        return fresh.select(index for index, external_id in enumerate(fresh.external_ids) if external_id in kept)
+
+    def _store(self, deduped: list[PaperCandidate], now_utc: datetime) -> list[PaperCandidate]:
+        """Collapse identity and near duplicates, then cache the rest as first seen at ``now_utc``."""
+
+        identifiers = sorted({item for candidate in deduped for item in candidate_identifiers(candidate)})
+        deduped = collapse_by_identity(deduped, self.cache.fetch_identity_keys(identifiers))
         print(f"[STEP] Deduplication completed: remaining={len(deduped)}")
+        if self.near_duplicate_filter is not None and deduped:
+            deduped = self.near_duplicate_filter.filter(deduped)
+            print(f"[STEP] Near-duplicate filtering completed: remaining={len(deduped)}")
 
         if not deduped:
-            return PipelineRunResult(
-                generated=False,
-                summary_count=0,
-                output_path=None,
-                skipped_reason="No new papers after deduplication",
-            )
+            return []
 
         print("[STEP] Upserting deduplicated papers into cache")
-        for candidate in deduped:
-            self.cache.upsert_paper(
+        self.cache.upsert_papers(
+            dict(
                 external_id=candidate.external_id,
                 source=candidate.source,
                 title_raw=candidate.title,
-                title_norm=normalize_title(candidate.title),
+                title_norm=candidate.title_norm,
                 abstract_raw=candidate.abstract,
                 authors_json=json.dumps(candidate.authors, ensure_ascii=False),
                 affiliations_json=json.dumps(candidate.affiliations, ensure_ascii=False),
@@ -109,9 +271,19 @@ class DailyPaperPipeline:
                 categories_json=json.dumps(candidate.categories, ensure_ascii=False),
                 first_seen_at=now_utc.isoformat(),
             )
+            for candidate in deduped
+        )
+        for candidate in deduped:
+            self.cache.record_identities(candidate.external_id, candidate.identifiers)
+        if self.near_duplicate_filter is not None:
+            self.near_duplicate_filter.remember(deduped)
+        return deduped
+
+    def _digest(self, deduped: list[PaperCandidate] | CandidateBatch, now_utc: datetime) -> PipelineRunResult:
+        """Rank, summarize and write one digest dated ``now_utc``."""
 
         print("[STEP] Ranking candidates")
-        ranked = self.ranker.rank(deduped)
+        ranked = _rank(self.ranker, deduped, self.top_k)
         if not ranked:
             return PipelineRunResult(
                 generated=False,
@@ -123,14 +295,11 @@ class DailyPaperPipeline:
 
         ranked_top = ranked[: self.top_k]
         print(f"[STEP] Summarizing selected papers: selected={len(ranked_top)}")
-        summaries = [
-            self.summarizer.summarize(
-                candidate=item[0],
-                relevance_score=float(item[1]),
-                relevance_reason=item[2],
-            )
-            for item in ranked_top
-        ]
+        summaries = self.summarizer.summarize_many(
+            [(candidate, float(score), reason) for candidate, score, reason in ranked_top]
+        )
+        self._attach_related(summaries, [candidate for candidate, _, _ in ranked_top])
+        self.cache.record_summaries(now_utc, summaries)
 
         print("[STEP] Rendering and writing outputs")
         markdown_text = self.renderer.render(run_date=now_utc.date(), summaries=summaries)
@@ -147,7 +316,6 @@ class DailyPaperPipeline:
             top_k=self.top_k,
             items=emitted_ids,
         )
-        print("[STEP] Pipeline completed")
 
         return PipelineRunResult(
             generated=True,
@@ -155,3 +323,103 @@ class DailyPaperPipeline:
             output_path=output_path,
             emitted_ids=emitted_ids,
         )
+
+    def _run_profiles(self, deduped: list[PaperCandidate] | CandidateBatch, now_utc: datetime) -> PipelineRunResult:
+        """Rank the shared pool per profile, summarize the union once and write one digest per profile."""
+
+        print(f"[STEP] Ranking candidates for profiles: {[profile.name for profile in self.profiles]}")
+        rankings = [(profile.name, self._rank_profile(profile, deduped)) for profile in self.profiles]
+        selections = {name: ranked for name, ranked in rankings if ranked}
+        if not selections:
+            return PipelineRunResult(
+                generated=False,
+                summary_count=0,
+                output_path=None,
+                skipped_reason="No candidate survives ranking",
+            )
+
+        # Summaries do not depend on the profile: summarize each selected paper once.
+        unique: dict[str, tuple[PaperCandidate, float, str]] = {}
+        for ranked in selections.values():
+            for candidate, score, reason in ranked:
+                unique.setdefault(candidate.external_id, (candidate, float(score), reason))
+        shared = sum(len(ranked) for ranked in selections.values()) - len(unique)
+        print(f"[STEP] Summarizing selected papers: selected={len(unique)}, shared_across_profiles={shared}")
+        summaries = {item.external_id: item for item in self.summarizer.summarize_many(list(unique.values()))}
+        self._attach_related(list(summaries.values()), [item[0] for item in unique.values()])
+        self.cache.record_summaries(now_utc, list(summaries.values()))
+
+        print("[STEP] Rendering and writing profile outputs")
+        outputs: dict[str, str] = {}
+        emitted: dict[str, None] = {}
+        for name, ranked in selections.items():
+            profile_summaries: list[PaperSummary] = [
+                replace(summaries[candidate.external_id], relevance_score=float(score), relevance_reason=reason)
+                for candidate, score, reason in ranked
+            ]
+            markdown_text = self.renderer.render(run_date=now_utc.date(), summaries=profile_summaries)
+            outputs[name] = self.writer.write(run_date=now_utc.date(), text=markdown_text, name=name)
+            print(f"[STEP] Output written: profile={name}, path={outputs[name]}")
+            items = [candidate.external_id for candidate, _, _ in ranked]
+            emitted.update(dict.fromkeys(items))
+            self.cache.record_digest(
+                run_at=now_utc,
+                output_path=outputs[name],
+                model_used=self.model_used,
+                window_days=self.window_days,
+                top_k=len(items),
+                items=items,
+            )
+
+        return PipelineRunResult(
+            generated=True,
+            summary_count=len(summaries),
+            output_path=next(iter(outputs.values())),
+            emitted_ids=list(emitted),
+            profile_outputs=outputs,
+        )
+
+    def _rank_profile(
+        self,
+        profile: DigestProfile,
+        candidates: list[PaperCandidate] | CandidateBatch,
+    ) -> list[tuple[PaperCandidate, float, str]]:
+        top_k = profile.top_k or self.top_k
+        ranked = _rank(profile.ranker, candidates, top_k)[:top_k]
+        print(f"[STEP] Ranking completed: profile={profile.name}, selected={len(ranked)}")
+        return ranked
+
+    def _attach_related(self, summaries: list[PaperSummary], candidates: list[PaperCandidate]) -> None:
+        if self.related_finder is None:
+            return
+        print("[STEP] Looking up related earlier papers")
+        related = self.related_finder.find_related(candidates)
+        for summary in summaries:
+            summary.related_papers = related.get(summary.external_id, [])
+
+    def _apply_retention(self, now_utc: datetime) -> None:
+        if self.retention_policy is not None:
+            print("[STEP] Applying cache retention policy")
+            self.retention_policy.apply(self.cache, now=now_utc)
+
+
+def _rank(
+    ranker: RankerInterface,
+    candidates: list[PaperCandidate] | CandidateBatch,
+    top_k: int | None,
+) -> list[tuple[PaperCandidate, float, str]]:
+    """Rank ``candidates``, keeping a batch columnar when the ranker supports it."""
+
+    if not isinstance(candidates, CandidateBatch):
+        return ranker.rank(candidates, top_k=top_k)
+    rank_batch = getattr(ranker, "rank_batch", None)
+    if rank_batch is None:
+        return ranker.rank(list(candidates), top_k=top_k)
+    return rank_batch(candidates, top_k=top_k)
+
+
+def _settle(
+    day: date,
+    result: Future[PipelineRunResult] | PipelineRunResult,
+) -> tuple[date, PipelineRunResult]:
+    return day, result.result() if isinstance(result, Future) else result
@@ -1,15 +1,25 @@
-"""Candidate ranking module with GLM and heuristic fallback."""
+"""Candidate ranking module with GLM and BM25 fallback."""
 
 from __future__ import annotations
 
 import json
 
+from backend.common.protocols import TermStatsInterface
 from backend.models.ai_model_client import AIModelClient
+from backend.models.batch_client import chat_json_many
+from backend.models.tokens import estimate_chat_tokens, estimate_tokens, usage_stage
+from backend.paper_process.batch import CandidateBatch
+from backend.paper_process.bm25 import batch_stats, bm25_scores, document_terms
 from backend.paper_process.paper import PaperCandidate
+from backend.paper_process.selection import select_top_k
 
 
 class RelevanceRanker:
-    """Rank papers by relevance to target research profile."""
+    """Rank papers by relevance to target research profile.
+
+    Candidates the LLM cannot score fall back to BM25 against the profile,
+    with document frequencies from ``term_stats`` (the cache) when given.
+    """
 
     def __init__(
         self,
@@ -20,6 +30,8 @@ class RelevanceRanker:
         system_prompt: str,
         user_prompt_template: str | None = None,
         llm_client: AIModelClient | None = None,
+        max_prompt_tokens: int | None = None,
+        term_stats: TermStatsInterface | None = None,
     ):
         self.research_field = research_field
         self.include_keywords = include_keywords
@@ -39,81 +51,182 @@ class RelevanceRanker:
             "{candidates_json}"
         )
         self.llm_client = llm_client or AIModelClient()
+        self.max_prompt_tokens = max_prompt_tokens
+        self.term_stats = term_stats
+
+    def rank(
+        self,
+        candidates: list[PaperCandidate],
+        top_k: int | None = None,
+    ) -> list[tuple[PaperCandidate, float, str]]:
+        """Rank candidates, preferring LLM scoring when available.
 
-    def rank(self, candidates: list[PaperCandidate]) -> list[tuple[PaperCandidate, float, str]]:
-        """Rank candidates, preferring LLM scoring when available."""
+        Returns only the best ``top_k`` when it is given.
+        """
 
         if not candidates:
             return []
 
         if self.llm_client.enabled:
-            llm_result = self._rank_with_llm(candidates)
+            llm_result = self._rank_with_llm(candidates, top_k)
             if llm_result:
                 return llm_result
 
-        return self._rank_with_heuristics(candidates)
+        return self._rank_with_heuristics(candidates, top_k)
+
+    def rank_batch(
+        self,
+        batch: CandidateBatch,
+        top_k: int | None = None,
+    ) -> list[tuple[PaperCandidate, float, str]]:
+        """Rank a columnar batch, materializing only the candidates returned.
+
+        The LLM path needs full payloads and ranks the materialized batch;
+        BM25 scores straight from the title and abstract columns.
+        """
+
+        if not len(batch):
+            return []
 
-    def _rank_with_llm(self, candidates: list[PaperCandidate]) -> list[tuple[PaperCandidate, float, str]]:
-        payload = [
+        if self.llm_client.enabled:
+            llm_result = self._rank_with_llm(list(batch), top_k)
+            if llm_result:
+                return llm_result
+
+        texts = [f"{title} {abstract}" for title, abstract in zip(batch.titles, batch.abstracts)]
+        scored = [(index, score, reason) for index, (score, reason) in enumerate(self._heuristic_scores(texts))]
+        return [(batch[index], score, reason) for index, score, reason in select_top_k(scored, top_k)]
+
+    def _rank_with_llm(
+        self,
+        candidates: list[PaperCandidate],
+        top_k: int | None = None,
+    ) -> list[tuple[PaperCandidate, float, str]]:
+        batches, refused = self._plan_batches(candidates)
+        if refused:
+            print(f"[STEP] Ranker refused oversized prompts: candidates={len(refused)}")
+
+        requests = [
             {
-                "external_id": item.external_id,
-                "title": item.title,
-                "abstract": item.abstract,
-                "categories": item.categories,
+                "model": self.model_name,
+                "system_prompt": self.system_prompt,
+                "user_prompt": self._format_prompt([payload for _, payload in batch]),
             }
-            for item in candidates
+            for batch in batches
         ]
-        user_prompt = self.user_prompt_template.format(
-            research_field=self.research_field,
-            include_keywords=self.include_keywords,
-            exclude_keywords=self.exclude_keywords,
-            candidates_json=json.dumps(payload, ensure_ascii=False),
-        )
+        with usage_stage("rank"):
+            outputs = chat_json_many(self.llm_client, requests)
+
+        scored: dict[str, tuple[float, str]] = {}
+        unscored: list[PaperCandidate] = list(refused)
+        for batch, output in zip(batches, outputs):
+            if isinstance(output, Exception):
+                unscored.extend(item for item, _ in batch)
+                continue
+            scored.update(_parse_scores(output))
 
-        try:
-            output = self.llm_client.chat_json(
-                model=self.model_name,
-                system_prompt=self.system_prompt,
-                user_prompt=user_prompt,
-            )
-        except Exception:
+        if not scored:
             return []
 
-        scored = {
-            item["external_id"]: (float(item["relevance_score"]), str(item["relevance_reason"]))
-            for item in output.get("items", [])
-            if "external_id" in item and "relevance_score" in item
-        }
-
         ranked: list[tuple[PaperCandidate, float, str]] = []
         for candidate in candidates:
             if candidate.external_id not in scored:
                 continue
             score, reason = scored[candidate.external_id]
             ranked.append((candidate, score, reason))
+        if unscored:
+            ranked.extend(self._rank_with_heuristics(unscored))
 
-        ranked.sort(key=lambda item: item[1], reverse=True)
-        return ranked
-
-    def _rank_with_heuristics(self, candidates: list[PaperCandidate]) -> list[tuple[PaperCandidate, float, str]]:
-        ranked: list[tuple[PaperCandidate, float, str]] = []
-
-        include_tokens = [kw.lower() for kw in self.include_keywords]
-        exclude_tokens = [kw.lower() for kw in self.exclude_keywords]
-        field_tokens = [token for token in self.research_field.lower().split() if len(token) > 2]
+        return select_top_k(ranked, top_k)
 
-        for candidate in candidates:
-            joined = f"{candidate.title} {candidate.abstract}".lower()
-
-            include_hits = sum(1 for kw in include_tokens if kw in joined)
-            field_hits = sum(1 for token in field_tokens if token in joined)
-            exclude_hits = sum(1 for bad in exclude_tokens if bad in joined)
-            category_bonus = 5 if any(cat.startswith("cs.") for cat in candidate.categories) else 0
-
-            score = 40 + include_hits * 10 + field_hits * 3 + category_bonus - exclude_hits * 15
-            score = max(0.0, min(100.0, float(score)))
-            reason = f"Heuristic rank: include_hits={include_hits}, " f"field_hits={field_hits}, exclude_hits={exclude_hits}."
-            ranked.append((candidate, score, reason))
+    def _plan_batches(
+        self,
+        candidates: list[PaperCandidate],
+    ) -> tuple[list[list[tuple[PaperCandidate, dict]]], list[PaperCandidate]]:
+        """Pack candidates into prompts that fit ``max_prompt_tokens``.
+
+        Returns:
+            Batches of (candidate, payload) pairs and the candidates whose
+            payload alone would overflow the prompt budget.
+        """
+
+        payloads = [(item, _ranking_payload(item)) for item in candidates]
+        if self.max_prompt_tokens is None:
+            return [payloads], []
+
+        base_tokens = estimate_chat_tokens(self.system_prompt, self._format_prompt([]))
+        budget = self.max_prompt_tokens - base_tokens
+        batches: list[list[tuple[PaperCandidate, dict]]] = []
+        refused: list[PaperCandidate] = []
+        current: list[tuple[PaperCandidate, dict]] = []
+        current_tokens = 0
+        for candidate, payload in payloads:
+            cost = estimate_tokens(json.dumps(payload, ensure_ascii=False)) + 1
+            if cost > budget:
+                refused.append(candidate)
+                continue
+            if current and current_tokens + cost > budget:
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append((candidate, payload))
+            current_tokens += cost
+        if current:
+            batches.append(current)
+        return batches, refused
+
+    def _format_prompt(self, payload: list[dict]) -> str:
+        return self.user_prompt_template.format(
+            research_field=self.research_field,
+            include_keywords=self.include_keywords,
+            exclude_keywords=self.exclude_keywords,
+            candidates_json=json.dumps(payload, ensure_ascii=False),
+        )
 
-        ranked.sort(key=lambda item: item[1], reverse=True)
-        return ranked
+    def _rank_with_heuristics(
+        self,
+        candidates: list[PaperCandidate],
+        top_k: int | None = None,
+    ) -> list[tuple[PaperCandidate, float, str]]:
+        texts = [f"{candidate.title} {candidate.abstract}" for candidate in candidates]
+        scored = [
+            (candidate, score, reason)
+            for candidate, (score, reason) in zip(candidates, self._heuristic_scores(texts))
+        ]
+        return select_top_k(scored, top_k)
+
+    def _heuristic_scores(self, texts: list[str]) -> list[tuple[float, str]]:
+        documents = [document_terms(text) for text in texts]
+        include_query = list(document_terms(" ".join([self.research_field, *self.include_keywords])))
+        exclude_query = list(document_terms(" ".join(self.exclude_keywords)))
+
+        stats = None
+        if self.term_stats is not None:
+            stats = self.term_stats.fetch_term_stats([*include_query, *exclude_query])
+        if stats is None or not stats.doc_count:
+            stats = batch_stats(documents, [*include_query, *exclude_query])
+
+        scores: list[tuple[float, str]] = []
+        include_scores = bm25_scores(include_query, documents, stats)
+        exclude_scores = bm25_scores(exclude_query, documents, stats)
+        for include_score, exclude_score in zip(include_scores, exclude_scores):
+            score = max(0.0, min(100.0, 100.0 * (include_score - exclude_score)))
+            reason = f"Heuristic rank: bm25={include_score:.3f}, exclude_bm25={exclude_score:.3f}."
+            scores.append((round(score, 2), reason))
+        return scores
+
+
+def _parse_scores(output: dict) -> dict[str, tuple[float, str]]:
+    return {
+        item["external_id"]: (float(item["relevance_score"]), str(item["relevance_reason"]))
+        for item in output.get("items", [])
+        if "external_id" in item and "relevance_score" in item
+    }
+
+
+def _ranking_payload(candidate: PaperCandidate) -> dict:
+    return {
+        "external_id": candidate.external_id,
+        "title": candidate.title,
+        "abstract": candidate.abstract,
+        "categories": candidate.categories,
+    }
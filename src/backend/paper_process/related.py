@@ -0,0 +1,264 @@
+"""Approximate nearest-neighbour lookup of related earlier papers.
+
+``IvfIndex`` is an inverted-file index over ``EmbeddingStore`` rows. The
+coarse quantizer is a set of random hyperplanes, each thresholded at the
+median projection of the indexed rows so lists stay balanced even though
+paper vectors share a dominant direction; the resulting bit pattern picks
+one of ``2**bits`` lists. Several independent tables are kept. A query
+takes its own list and the lists one bit away in every table, pre-scores
+those rows on its heaviest terms and re-ranks a short list exactly. Lists
+are stored CSR style in one memory-mapped file; rows appended after the
+last build are scanned directly until the tail is large enough to trigger
+a rebuild.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import mmap
+import os
+import random
+import struct
+from array import array
+from collections.abc import Callable
+from pathlib import Path
+from threading import Lock
+
+from backend.paper_process.embedding import EmbeddingStore, HashingEmbedder, sparse, sparse_dot
+from backend.paper_process.paper import PaperCandidate, RelatedPaper
+
+HEADER = struct.Struct("<4sIIIIQ")
+MAGIC = b"PIVF"
+VERSION = 1
+HYPERPLANE_SEED = 20_260_101
+TARGET_LIST_SIZE = 64
+MAX_BITS = 14
+DEFAULT_TABLES = 4
+MIN_REBUILD_TAIL = 256
+PRESCORE_TERMS = 32
+RERANK_FACTOR = 4
+
+
+class _Table:
+    """One hyperplane partition: planes, thresholds and CSR lists."""
+
+    __slots__ = ("planes", "thresholds", "offsets", "rows")
+
+    def __init__(self, planes: list[list[tuple[int, float]]], thresholds, offsets, rows):
+        self.planes = planes
+        self.thresholds = thresholds
+        self.offsets = offsets
+        self.rows = rows
+
+    def code(self, vector) -> int:
+        code = 0
+        for bit, plane in enumerate(self.planes):
+            if sparse_dot(plane, vector) >= self.thresholds[bit]:
+                code |= 1 << bit
+        return code
+
+
+class IvfIndex:
+    """Hyperplane-partitioned inverted file over an embedding store.
+
+    Args:
+        path: Index file, rewritten atomically on rebuild.
+        store: Vectors being indexed; rows are referenced by position.
+        tables: Independent partitions built on rebuild; a query unions the
+            lists it probes in each, trading scan cost for recall.
+    """
+
+    def __init__(self, path: str | Path, store: EmbeddingStore, tables: int = DEFAULT_TABLES):
+        self.path = Path(path)
+        self.store = store
+        self.tables = tables
+        self.bits = 0
+        self.count = 0
+        self._map: mmap.mmap | None = None
+        self._tables: list[_Table] = []
+        self._open()
+
+    def _open(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open("rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, dim, bits, tables, count = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != VERSION or dim != self.store.dim or count > len(self.store):
+            mapped.close()
+            return
+
+        view = memoryview(mapped)
+        offset = HEADER.size
+        loaded = []
+        for _ in range(tables):
+            planes = view[offset : offset + 4 * bits * dim].cast("f")
+            offset += 4 * bits * dim
+            thresholds = array("f", view[offset : offset + 4 * bits].cast("f"))
+            offset += 4 * bits
+            offsets = view[offset : offset + 4 * ((1 << bits) + 1)].cast("I")
+            offset += 4 * ((1 << bits) + 1)
+            rows = view[offset : offset + 4 * count].cast("I")
+            offset += 4 * count
+            loaded.append(
+                _Table(
+                    [sparse(array("f", planes[index * dim : (index + 1) * dim])) for index in range(bits)],
+                    thresholds,
+                    offsets,
+                    rows,
+                )
+            )
+        self._map, self._tables, self.bits, self.count = mapped, loaded, bits, count
+
+    @property
+    def stale(self) -> bool:
+        tail = len(self.store) - self.count
+        return self._map is None or tail > max(MIN_REBUILD_TAIL, self.count // 10)
+
+    def build(self) -> None:
+        """Partition every stored row and rewrite the index file."""
+
+        dim = self.store.dim
+        count = len(self.store)
+        bits = max(1, min(MAX_BITS, round(math.log2(max(2, count / TARGET_LIST_SIZE)))))
+        rng = random.Random(HYPERPLANE_SEED)
+        plane_vectors = [array("f", (rng.gauss(0.0, 1.0) for _ in range(dim))) for _ in range(bits * self.tables)]
+
+        matrix = self.store.matrix
+        projections: list[list[float]] = []
+        for row in range(count):
+            base = row * dim
+            # Stored rows are sparse, so dot each plane against the row's non-zeros.
+            nonzero = [(index, value) for index, value in enumerate(matrix[base : base + dim]) if value]
+            projections.append([sum(value * plane[index] for index, value in nonzero) for plane in plane_vectors])
+        del matrix
+
+        # Median thresholds keep lists balanced; compare at float32 precision as queries do.
+        thresholds = array("f", [0.0] * len(plane_vectors))
+        for plane in range(len(plane_vectors)):
+            ordered = sorted(item[plane] for item in projections)
+            thresholds[plane] = ordered[len(ordered) // 2] if ordered else 0.0
+
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with tmp_path.open("wb") as handle:
+            handle.write(HEADER.pack(MAGIC, VERSION, dim, bits, self.tables, count))
+            for table in range(self.tables):
+                first = table * bits
+                lists: list[list[int]] = [[] for _ in range(1 << bits)]
+                for row, values in enumerate(projections):
+                    code = 0
+                    for bit in range(bits):
+                        if values[first + bit] >= thresholds[first + bit]:
+                            code |= 1 << bit
+                    lists[code].append(row)
+                offsets = array("I", [0])
+                rows = array("I")
+                for members in lists:
+                    rows.extend(members)
+                    offsets.append(len(rows))
+                for plane in plane_vectors[first : first + bits]:
+                    handle.write(plane.tobytes())
+                handle.write(thresholds[first : first + bits].tobytes())
+                handle.write(offsets.tobytes())
+                handle.write(rows.tobytes())
+        os.replace(tmp_path, self.path)
+        print(f"[STEP] Related-paper index built: rows={count}, tables={self.tables}, lists={1 << bits}")
+
+        self._map, self._tables = None, []
+        self._open()
+
+    def search(
+        self,
+        query: array,
+        k: int,
+        accept: Callable[[int], bool] | None = None,
+    ) -> list[tuple[int, float]]:
+        """Return up to ``k`` ``(row, cosine)`` pairs, best first."""
+
+        dim = self.store.dim
+        candidates = set(range(self.count, len(self.store)))
+        for table in self._tables:
+            code = table.code(query)
+            for probe in [code, *(code ^ (1 << bit) for bit in range(self.bits))]:
+                candidates.update(table.rows[table.offsets[probe] : table.offsets[probe + 1]])
+
+        rows = [row for row in candidates if accept(row)] if accept is not None else list(candidates)
+        query_sparse = sparse(query)
+        # Pre-score with the heaviest query weights only, then re-rank a short list exactly.
+        heavy = heapq.nlargest(PRESCORE_TERMS, query_sparse, key=lambda item: abs(item[1]))
+        matrix = self.store.matrix
+        shortlist = heapq.nlargest(
+            k * RERANK_FACTOR,
+            rows,
+            key=lambda row: sum(weight * matrix[row * dim + index] for index, weight in heavy),
+        )
+        scored = [
+            (row, sum(weight * matrix[row * dim + index] for index, weight in query_sparse)) for row in shortlist
+        ]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:k]
+
+
+class RelatedPaperFinder:
+    """Attach the most similar previously digested papers to new ones.
+
+    Args:
+        cache: ``SQLiteCache`` used for digest history and paper titles.
+        store: Shared embedding store (the one the embedding ranker uses).
+        k: Related papers per new paper.
+        min_similarity: Cosine below which a neighbour is not shown.
+    """
+
+    def __init__(
+        self,
+        cache,
+        store: EmbeddingStore,
+        embedder: HashingEmbedder | None = None,
+        index_path: str | Path | None = None,
+        k: int = 3,
+        min_similarity: float = 0.3,
+    ):
+        self.cache = cache
+        self.store = store
+        self.embedder = embedder or HashingEmbedder(store.dim)
+        self.index = IvfIndex(index_path or store.path.with_name(f"{store.path.name}.ivf"), store)
+        self.k = k
+        self.min_similarity = min_similarity
+        self._lock = Lock()
+
+    def find_related(self, candidates: list[PaperCandidate]) -> dict[str, list[RelatedPaper]]:
+        if not candidates:
+            return {}
+
+        fresh = [
+            (item.external_id, self.embedder.embed(f"{item.title} {item.abstract}"))
+            for item in candidates
+            if item.external_id not in self.store
+        ]
+        # Concurrent backfill days share the index; only one may rebuild it.
+        with self._lock:
+            self.store.add_many(fresh)
+            if self.index.stale:
+                self.index.build()
+
+        digested = self.cache.fetch_digested_ids()
+        related: dict[str, list[RelatedPaper]] = {}
+        ids = self.store.ids
+        for candidate in candidates:
+            query = self.store.get(candidate.external_id)
+            if query is None:
+                continue
+            own_id = candidate.external_id
+            hits = self.index.search(query, self.k, accept=lambda row: ids[row] in digested and ids[row] != own_id)
+            papers = []
+            for row, similarity in hits:
+                if similarity < self.min_similarity:
+                    continue
+                external_id = self.store.ids[row]
+                paper = self.cache.fetch_paper(external_id)
+                if paper is None:
+                    continue
+                papers.append(RelatedPaper(external_id, paper["title_raw"], paper["arxiv_url"], round(similarity, 3)))
+            related[candidate.external_id] = papers
+        return related
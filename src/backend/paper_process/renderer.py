@@ -16,6 +16,10 @@ def render_markdown_digest(run_date: date, summaries: list[PaperSummary]) -> str
     for index, summary in enumerate(summaries, start=1):
         code_links = "; ".join(summary.code_urls) if summary.code_urls else "N/A"
         affiliations = "; ".join(summary.affiliations) if summary.affiliations else "N/A"
+        related = []
+        if summary.related_papers:
+            links = "; ".join(f"[{item.title}]({item.url}) ({item.similarity:.2f})" for item in summary.related_papers)
+            related.append(f"- **Related Earlier Work**: {links}")
 
         blocks.extend(
             [
@@ -30,6 +34,7 @@ def render_markdown_digest(run_date: date, summaries: list[PaperSummary]) -> str
                 f"- **Code Repository**: {code_links}",
                 f"- **Relevance Score**: {summary.relevance_score:.1f}",
                 f"- **Relevance Reason**: {summary.relevance_reason}",
+                *related,
                 "",
                 "### Problem Addressed",
                 summary.problem,
@@ -0,0 +1,55 @@
+"""Retention policy that keeps the cache database small.
+
+Old papers lose their abstracts, metadata and stored summaries but keep
+every dedup key, old digests move to a compressed archive next to the
+database, and freed pages are returned with incremental vacuum so the
+working set stays in page cache.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+@dataclass(slots=True)
+class RetentionPolicy:
+    """Prune cache rows older than the configured ages.
+
+    Args:
+        paper_days: Keep full paper payloads this many days; None keeps all.
+        digest_days: Keep digest rows this many days; None keeps all.
+        archive_path: Digest archive file; defaults to one next to the DB.
+        vacuum_pages: Max pages released per run; None releases all free pages.
+    """
+
+    paper_days: int | None = None
+    digest_days: int | None = None
+    archive_path: str | Path | None = None
+    vacuum_pages: int | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.paper_days is not None or self.digest_days is not None
+
+    def apply(self, cache, now: datetime) -> dict[str, int]:
+        """Apply the policy to ``cache`` and return per-step counts."""
+
+        stats = {"pruned_papers": 0, "archived_digests": 0, "vacuumed_pages": 0}
+        if not self.enabled:
+            return stats
+        if self.paper_days is not None:
+            stats["pruned_papers"] = cache.prune_paper_payloads(before=now - timedelta(days=self.paper_days))
+        if self.digest_days is not None:
+            stats["archived_digests"] = cache.archive_digests(
+                before=now - timedelta(days=self.digest_days),
+                archive_path=self.archive_path,
+            )
+        stats["vacuumed_pages"] = cache.incremental_vacuum(max_pages=self.vacuum_pages)
+        print(
+            "[STEP] Retention applied: "
+            f"pruned_papers={stats['pruned_papers']}, archived_digests={stats['archived_digests']}, "
+            f"vacuumed_pages={stats['vacuumed_pages']}"
+        )
+        return stats
@@ -0,0 +1,22 @@
+"""Top-k selection shared by the rankers."""
+
+from __future__ import annotations
+
+import heapq
+from operator import itemgetter
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def select_top_k(scored: list[tuple[T, float, str]], top_k: int | None) -> list[tuple[T, float, str]]:
+    """Order ``(item, score, reason)`` rows best first, keeping input order among equal scores.
+
+    ``item`` is whatever the caller ranks: a ``PaperCandidate`` or a batch
+    row index. With ``top_k`` set, a bounded heap picks the winners in
+    ``O(n log k)`` instead of sorting every row.
+    """
+
+    if top_k is not None and top_k < len(scored):
+        return heapq.nlargest(top_k, scored, key=itemgetter(1))
+    return sorted(scored, key=itemgetter(1), reverse=True)
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Callable
 
 from backend.models.ai_model_client import AIModelClient
+from backend.models.batch_client import chat_json_many
+from backend.models.tokens import estimate_chat_tokens, usage_stage
 from backend.paper_process.paper import PaperCandidate, PaperSummary
 
 
@@ -17,6 +20,10 @@ class PaperSummarizer:
         system_prompt: str,
         user_prompt_template: str | None = None,
         llm_client: AIModelClient | None = None,
+        on_partial: Callable[[str, dict], None] | None = None,
+        max_prompt_tokens: int | None = None,
+        batch_size: int = 1,
+        batch_user_prompt_template: str | None = None,
     ):
         self.model_name = model_name
         self.system_prompt = system_prompt
@@ -28,6 +35,17 @@ class PaperSummarizer:
             "{paper_json}"
         )
         self.llm_client = llm_client or AIModelClient()
+        self.on_partial = on_partial
+        self.max_prompt_tokens = max_prompt_tokens
+        self.batch_size = max(1, batch_size)
+        self.batch_user_prompt_template = batch_user_prompt_template or (
+            "Read these papers and summarize each one in English. Return JSON only with key 'items', "
+            "a list with one object per paper, each with keys: external_id, title, authors, affiliations, "
+            "code_urls, problem, approach, methodological_novelty, empirical_novelty, "
+            "tell_someone_in_4_5_sentences.\n\n"
+            "Papers JSON:\n"
+            "{papers_json}"
+        )
 
     def summarize(
         self,
@@ -40,39 +58,106 @@ class PaperSummarizer:
         if self.llm_client.enabled:
             output = self._summarize_with_llm(candidate)
             if output:
-                return PaperSummary(
-                    external_id=candidate.external_id,
-                    source=candidate.source,
-                    title=output.get("title", candidate.title),
-                    authors=output.get("authors", candidate.authors),
-                    affiliations=output.get("affiliations", candidate.affiliations),
-                    arxiv_url=candidate.arxiv_url,
-                    pdf_url=candidate.pdf_url,
-                    code_urls=output.get("code_urls", candidate.code_urls),
-                    problem=output.get("problem", ""),
-                    approach=output.get("approach", ""),
-                    methodological_novelty=output.get("methodological_novelty", ""),
-                    empirical_novelty=output.get("empirical_novelty", ""),
-                    tell_someone_in_4_5_sentences=_normalize_talk_track(output.get("tell_someone_in_4_5_sentences", [])),
-                    relevance_score=relevance_score,
-                    relevance_reason=relevance_reason,
-                )
+                return _build_summary(candidate, output, relevance_score, relevance_reason)
 
         return self._fallback_summary(candidate, relevance_score, relevance_reason)
 
+    def summarize_many(self, ranked: list[tuple[PaperCandidate, float, str]]) -> list[PaperSummary]:
+        """Summarize ranked papers, packing ``batch_size`` papers per request.
+
+        Requests are sent in rounds through ``chat_json_many`` so a batch-mode
+        client submits each round as one batch file. Multi-paper groups whose
+        response is malformed, truncated or missing papers are split in half
+        for the next round; a single paper keeps any non-empty output and
+        falls back to the deterministic summary only when it gets none.
+        """
+
+        if not self.llm_client.enabled:
+            return [self.summarize(candidate, score, reason) for candidate, score, reason in ranked]
+
+        candidates = [item[0] for item in ranked]
+        pending = [candidates[start : start + self.batch_size] for start in range(0, len(candidates), self.batch_size)]
+        outputs: dict[str, dict] = {}
+        while pending:
+            pending = self._summarize_round(pending, outputs)
+
+        summaries: list[PaperSummary] = []
+        for candidate, score, reason in ranked:
+            output = outputs.get(candidate.external_id)
+            if output:
+                summaries.append(_build_summary(candidate, output, score, reason))
+            else:
+                summaries.append(self._fallback_summary(candidate, score, reason))
+        return summaries
+
+    def _summarize_round(
+        self,
+        groups: list[list[PaperCandidate]],
+        outputs: dict[str, dict],
+    ) -> list[list[PaperCandidate]]:
+        """Send one request per group, collect outputs and return groups to retry."""
+
+        requests = [self._group_request(group) for group in groups]
+        sendable = [request for request in requests if request is not None]
+        with usage_stage("summarize"):
+            responses = iter(chat_json_many(self.llm_client, sendable))
+
+        retry: list[list[PaperCandidate]] = []
+        for group, request in zip(groups, requests):
+            response = next(responses) if request is not None else {}
+            items = _group_items(group, response)
+            if len(group) == 1:
+                # A lone paper keeps any non-empty output, as ``summarize`` does.
+                outputs.update(items)
+                continue
+            missing = [item for item in group if not _is_complete_summary(items.get(item.external_id))]
+            outputs.update({key: value for key, value in items.items() if _is_complete_summary(value)})
+            if not missing:
+                continue
+            if len(missing) < len(group):
+                retry.append(missing)
+            else:
+                middle = len(group) // 2
+                retry.extend([group[:middle], group[middle:]])
+        return retry
+
     def _summarize_with_llm(self, candidate: PaperCandidate) -> dict:
-        user_prompt = self.user_prompt_template.format(paper_json=json.dumps(_candidate_payload(candidate), ensure_ascii=False))
+        request = self._group_request([candidate])
+        if request is None:
+            return {}
 
         try:
-            return self.llm_client.chat_json(
-                model=self.model_name,
-                system_prompt=self.system_prompt,
-                user_prompt=user_prompt,
-                temperature=0.2,
-            )
+            with usage_stage("summarize"):
+                return self.llm_client.chat_json(**request)
         except Exception:
             return {}
 
+    def _group_request(self, group: list[PaperCandidate]) -> dict | None:
+        if len(group) == 1:
+            user_prompt = self.user_prompt_template.format(
+                paper_json=json.dumps(_candidate_payload(group[0]), ensure_ascii=False)
+            )
+        else:
+            payload = [_candidate_payload(item) for item in group]
+            user_prompt = self.batch_user_prompt_template.format(papers_json=json.dumps(payload, ensure_ascii=False))
+        if (
+            self.max_prompt_tokens is not None
+            and estimate_chat_tokens(self.system_prompt, user_prompt) > self.max_prompt_tokens
+        ):
+            return None
+
+        request = {
+            "model": self.model_name,
+            "system_prompt": self.system_prompt,
+            "user_prompt": user_prompt,
+            "temperature": 0.2,
+        }
+        if len(group) == 1 and self.on_partial is not None:
+            on_partial = self.on_partial
+            external_id = group[0].external_id
+            request["on_partial"] = lambda partial: on_partial(external_id, partial)
+        return request
+
     def _fallback_summary(
         self,
         candidate: PaperCandidate,
@@ -107,6 +192,67 @@ class PaperSummarizer:
         )
 
 
+def _build_summary(
+    candidate: PaperCandidate,
+    output: dict,
+    relevance_score: float,
+    relevance_reason: str,
+) -> PaperSummary:
+    return PaperSummary(
+        external_id=candidate.external_id,
+        source=candidate.source,
+        title=_text(output.get("title"), candidate.title),
+        authors=_string_list(output.get("authors"), candidate.authors),
+        affiliations=_string_list(output.get("affiliations"), candidate.affiliations),
+        arxiv_url=candidate.arxiv_url,
+        pdf_url=candidate.pdf_url,
+        code_urls=_string_list(output.get("code_urls"), candidate.code_urls),
+        problem=_text(output.get("problem")),
+        approach=_text(output.get("approach")),
+        methodological_novelty=_text(output.get("methodological_novelty")),
+        empirical_novelty=_text(output.get("empirical_novelty")),
+        tell_someone_in_4_5_sentences=_normalize_talk_track(
+            _string_list(output.get("tell_someone_in_4_5_sentences"), [])
+        ),
+        relevance_score=relevance_score,
+        relevance_reason=relevance_reason,
+    )
+
+
+def _text(value: object, fallback: str = "") -> str:
+    """LLM string field, or ``fallback`` when the model sent null or a non-string."""
+
+    return value if isinstance(value, str) else fallback
+
+
+def _string_list(value: object, fallback: list[str]) -> list[str]:
+    """LLM list field as strings, or a copy of ``fallback`` when the model sent null or a non-list."""
+
+    if not isinstance(value, list):
+        return list(fallback)
+    return [str(item) for item in value if item is not None]
+
+
+def _group_items(group: list[PaperCandidate], response: dict | Exception) -> dict[str, dict]:
+    if isinstance(response, Exception) or not isinstance(response, dict) or not response:
+        return {}
+    if len(group) == 1:
+        return {group[0].external_id: response}
+
+    expected = {item.external_id for item in group}
+    return {
+        str(item["external_id"]): item
+        for item in response.get("items", [])
+        if isinstance(item, dict) and str(item.get("external_id")) in expected
+    }
+
+
+def _is_complete_summary(output: dict | None) -> bool:
+    if not output:
+        return False
+    return all(output.get(key) for key in ("problem", "approach", "tell_someone_in_4_5_sentences"))
+
+
 def _candidate_payload(candidate: PaperCandidate) -> dict:
     return {
         "external_id": candidate.external_id,
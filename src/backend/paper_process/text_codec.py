@@ -0,0 +1,95 @@
+"""zlib compression for large text columns with a trained shared dictionary.
+
+Values at least ``min_size`` bytes long are stored as BLOBs of
+``b"z" + dict_id (uint16) + zlib stream``; shorter values and rows written
+before compression existed stay plain TEXT, so ``decode`` accepts both.
+``dict_id`` 0 means no dictionary. zlib has no trainer, so the dictionary is
+built from the most frequent word n-grams of sample texts, most valuable
+last where deflate finds them at the shortest distance.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from collections import Counter
+
+HEADER = struct.Struct("<cH")
+MARKER = b"z"
+MAX_DICTIONARY_BYTES = 32 * 1024
+DEFAULT_MIN_SIZE = 64
+
+
+def train_dictionary(samples: list[str], size: int = MAX_DICTIONARY_BYTES) -> bytes:
+    """Build a zlib preset dictionary from frequent word 1-3 grams."""
+
+    counts: Counter[str] = Counter()
+    for text in samples:
+        words = text.split()
+        for width in (1, 2, 3):
+            for index in range(len(words) - width + 1):
+                counts[" ".join(words[index : index + width]) + " "] += 1
+
+    scored = sorted(
+        ((count * len(gram.encode("utf-8")), gram) for gram, count in counts.items() if count > 1),
+        reverse=True,
+    )
+    picked: list[bytes] = []
+    total = 0
+    for _, gram in scored:
+        encoded = gram.encode("utf-8")
+        if total + len(encoded) > size:
+            continue
+        picked.append(encoded)
+        total += len(encoded)
+    return b"".join(reversed(picked))
+
+
+class TextCodec:
+    """Encode/decode column values with an optional preset dictionary.
+
+    Args:
+        dictionaries: Known ``dict_id -> dictionary`` entries for decoding.
+        dict_id: Dictionary used for new values; 0 compresses without one.
+        min_size: Values shorter than this many bytes are stored as text.
+        level: zlib compression level.
+    """
+
+    def __init__(
+        self,
+        dictionaries: dict[int, bytes] | None = None,
+        dict_id: int = 0,
+        min_size: int = DEFAULT_MIN_SIZE,
+        level: int = 6,
+    ):
+        self.dictionaries = dict(dictionaries or {})
+        self.dict_id = dict_id
+        self.min_size = min_size
+        self.level = level
+
+    def encode(self, value: str) -> str | bytes:
+        raw = value.encode("utf-8")
+        if len(raw) < self.min_size:
+            return value
+        dictionary = self.dictionaries.get(self.dict_id) if self.dict_id else None
+        if dictionary:
+            compressor = zlib.compressobj(self.level, zdict=dictionary)
+        else:
+            compressor = zlib.compressobj(self.level)
+        return HEADER.pack(MARKER, self.dict_id if dictionary else 0) + compressor.compress(raw) + compressor.flush()
+
+    def decode(self, value: str | bytes | None) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, str):
+            return value
+        marker, dict_id = HEADER.unpack_from(value, 0)
+        if marker != MARKER:
+            raise ValueError("Unknown compressed column format")
+        if dict_id:
+            if dict_id not in self.dictionaries:
+                raise KeyError(f"Compression dictionary {dict_id} is not loaded")
+            decompressor = zlib.decompressobj(zdict=self.dictionaries[dict_id])
+        else:
+            decompressor = zlib.decompressobj()
+        return (decompressor.decompress(value[HEADER.size :]) + decompressor.flush()).decode("utf-8")
@@ -24,8 +24,10 @@ class MarkdownWriter:
         self.markdown_dir.mkdir(parents=True, exist_ok=True)
         self.pdf_dir.mkdir(parents=True, exist_ok=True)
 
-    def write(self, run_date: date, text: str) -> str:
-        stem = f"{run_date.strftime('%m%d')}_papers"
+    def write(self, run_date: date, text: str, name: str | None = None) -> str:
+        """Write one digest; ``name`` (a profile) is appended to the file stem."""
+
+        stem = f"{run_date.strftime('%m%d')}_papers" + (f"_{name}" if name else "")
         markdown_path = self.markdown_dir / f"{stem}.md"
         pdf_path = self.pdf_dir / f"{stem}.pdf"
 
@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+import time
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta, timezone
 from urllib.parse import quote
 from urllib.request import urlopen
 import xml.etree.ElementTree as ET
 
 from backend.common.utils import extract_code_urls
+from backend.paper_process.batch import CandidateBatch
+from backend.paper_process.identity import arxiv_identifier, build_identifiers, doi_identifier
 from backend.paper_process.paper import PaperCandidate
+from backend.sources.http_archive import HttpArchive, fetch_bytes, source_now
 
 ARXIV_API_URL = "http://export.arxiv.org/api/query"
 ATOM_NS = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+# arXiv asks API clients to wait three seconds between consecutive requests.
+PAGE_PAUSE_SECONDS = 3.0
 
 
 class ArxivSource:
@@ -25,6 +32,8 @@ class ArxivSource:
         categories: list[str],
         max_results: int,
         window_days: int,
+        http_archive: HttpArchive | None = None,
+        page_size: int = 200,
     ):
         self.research_field = research_field
         self.include_keywords = include_keywords
@@ -32,6 +41,8 @@ class ArxivSource:
         self.categories = categories
         self.max_results = max_results
         self.window_days = window_days
+        self.http_archive = http_archive
+        self.page_size = page_size
 
     def search_recent(self) -> list[PaperCandidate]:
         """Search arXiv and return candidates filtered to recent window."""
@@ -55,19 +66,68 @@ class ArxivSource:
         query = " AND ".join(query_parts)
         return query
 
-    def _fetch_atom_feed(self) -> str:
-        query = self._build_query()
+    def search_range(self, start: date, end: date) -> Iterator[PaperCandidate]:
+        """Stream papers submitted from ``start`` to ``end`` (inclusive), newest first.
+
+        Results are requested ``page_size`` at a time until arXiv returns a
+        short page, so a long range is never held in memory at once.
+        """
+
+        for fields in self._range_fields(start, end):
+            yield PaperCandidate(**fields)
+
+    def search_range_batches(self, start: date, end: date) -> Iterator[CandidateBatch]:
+        """Stream the same papers as ``search_range`` as one ``CandidateBatch`` per published day.
+
+        Rows are appended to the batch straight from the parsed feed entries,
+        so no ``PaperCandidate`` is built here.
+        """
+
+        batch, day = CandidateBatch(), None
+        for fields in self._range_fields(start, end):
+            published = fields["published_at"].date()
+            if published != day and len(batch):
+                yield batch
+                batch = CandidateBatch()
+            day = published
+            batch.append(**fields)
+        if len(batch):
+            yield batch
+
+    def _range_fields(self, start: date, end: date) -> Iterator[dict]:
+        query = f"{self._build_query()} AND submittedDate:[{start:%Y%m%d}0000 TO {end:%Y%m%d}2359]"
+        offset = 0
+        while True:
+            root = ET.fromstring(self._fetch_atom_feed(query=query, offset=offset, limit=self.page_size))
+            entries = root.findall("atom:entry", ATOM_NS)
+            print(f"[STEP] arXiv range page fetched: offset={offset}, entries={len(entries)}")
+            for entry in entries:
+                fields = self._entry_fields(entry)
+                if fields is not None:
+                    yield fields
+            if len(entries) < self.page_size:
+                return
+            offset += len(entries)
+            if self.http_archive is None or not self.http_archive.is_offline:
+                time.sleep(PAGE_PAUSE_SECONDS)
+
+    def _fetch_atom_feed(self, query: str | None = None, offset: int = 0, limit: int | None = None) -> str:
+        query = query or self._build_query()
         url = (
             f"{ARXIV_API_URL}?search_query={quote(query)}"
-            f"&start=0&max_results={self.max_results}"
+            f"&start={offset}&max_results={limit or self.max_results}"
             "&sortBy=submittedDate&sortOrder=descending"
         )
-        with urlopen(url, timeout=30) as response:
-            return response.read().decode("utf-8")
+
+        def fetch() -> bytes:
+            with urlopen(url, timeout=30) as response:
+                return response.read()
+
+        return fetch_bytes(self.http_archive, url, fetch).decode("utf-8")
 
     def _parse_feed(self, xml_text: str) -> list[PaperCandidate]:
         root = ET.fromstring(xml_text)
-        now_utc = datetime.now(timezone.utc)
+        now_utc = source_now(self.http_archive)
         earliest = now_utc - timedelta(days=self.window_days)
         candidates: list[PaperCandidate] = []
 
@@ -82,6 +142,10 @@ class ArxivSource:
         return candidates
 
     def _entry_to_candidate(self, entry: ET.Element) -> PaperCandidate | None:
+        fields = self._entry_fields(entry)
+        return PaperCandidate(**fields) if fields is not None else None
+
+    def _entry_fields(self, entry: ET.Element) -> dict | None:
         title = _read_text(entry, "atom:title")
         abstract = _read_text(entry, "atom:summary")
         published = _parse_dt(_read_text(entry, "atom:published"))
@@ -110,20 +174,24 @@ class ArxivSource:
         comment = _read_text(entry, "arxiv:comment")
         code_urls = extract_code_urls("\n".join([abstract, comment]))
 
-        return PaperCandidate(
-            source="arxiv",
-            external_id=external_id,
-            title=title,
-            abstract=abstract,
-            authors=authors,
-            affiliations=affiliations,
-            published_at=published,
-            updated_at=updated,
-            arxiv_url=arxiv_url,
-            pdf_url=pdf_url,
-            code_urls=code_urls,
-            categories=categories,
-        )
+        return {
+            "source": "arxiv",
+            "external_id": external_id,
+            "title": title,
+            "abstract": abstract,
+            "authors": authors,
+            "affiliations": affiliations,
+            "published_at": published,
+            "updated_at": updated,
+            "arxiv_url": arxiv_url,
+            "pdf_url": pdf_url,
+            "code_urls": code_urls,
+            "categories": categories,
+            "identifiers": build_identifiers(
+                arxiv_identifier(external_id),
+                doi_identifier(_read_text(entry, "arxiv:doi")),
+            ),
+        }
 
 
 def _read_text(node: ET.Element, path: str) -> str:
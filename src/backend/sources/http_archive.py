@@ -0,0 +1,151 @@
+"""Record/replay archive for raw source HTTP responses.
+
+In ``record`` mode every response body fetched by a source is stored in a
+zip archive (deflate-compressed) keyed by a hash of its URL; in ``replay``
+mode the same bodies are served from the archive without touching the
+network. Secret query parameters are dropped before hashing, so recordings
+replay regardless of which API key was used. Each response also stores when
+it was recorded; on replay ``source_now`` returns that time, so sources
+apply their ``window_days`` filter exactly as they did during the live run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import zipfile
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+ARCHIVE_MODES = {"off", "record", "replay"}
+SECRET_QUERY_PARAMS = {"apikey", "api_key", "apiKey", "key", "token"}
+
+
+class ArchiveMiss(LookupError):
+    """Raised in replay mode when a URL was never recorded."""
+
+
+class HttpArchive:
+    """Zip-backed store of response bodies keyed by normalized URL."""
+
+    def __init__(self, path: str | Path, mode: str = "replay", simulate_latency: bool = False):
+        if mode not in ARCHIVE_MODES:
+            raise ValueError(f"Unsupported http archive mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self._lock = Lock()
+        self._meta: dict[str, dict] | None = None
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                backup = self.path.with_name(f"{self.path.name}.bak")
+                self.path.replace(backup)
+                print(f"[STEP] HTTP archive already existed; previous recording moved to {backup}")
+            self._meta = {}
+
+    @property
+    def is_offline(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def recorded_at(self) -> datetime | None:
+        """When the archived responses were recorded (the earliest one), if the archive stores it."""
+
+        with self._lock:
+            stamps = [meta["recorded_at"] for meta in self._load_meta().values() if "recorded_at" in meta]
+        return datetime.fromisoformat(min(stamps)) if stamps else None
+
+    def now(self) -> datetime:
+        """Clock for source window filters: the recording time on replay, the current time otherwise."""
+
+        recorded_at = self.recorded_at if self.mode == "replay" else None
+        return recorded_at or _utc_now()
+
+    def fetch(self, url: str, fetch: Callable[[], bytes]) -> bytes:
+        """Return the body for ``url``, recording or replaying as configured."""
+
+        if self.mode == "off":
+            return fetch()
+        key = archive_key(url)
+        if self.mode == "replay":
+            return self._replay(key, url)
+
+        started = time.perf_counter()
+        body = fetch()
+        elapsed = time.perf_counter() - started
+        self._record(key, url, body, elapsed)
+        return body
+
+    def _replay(self, key: str, url: str) -> bytes:
+        with self._lock:
+            meta = self._load_meta().get(key)
+            if meta is None:
+                raise ArchiveMiss(f"No recorded response for {strip_secrets(url)} in {self.path}")
+            with zipfile.ZipFile(self.path) as archive:
+                body = archive.read(f"{key}.body")
+        if self.simulate_latency:
+            time.sleep(float(meta.get("elapsed_seconds", 0.0)))
+        return body
+
+    def _record(self, key: str, url: str, body: bytes, elapsed: float) -> None:
+        meta = {
+            "url": strip_secrets(url),
+            "bytes": len(body),
+            "elapsed_seconds": round(elapsed, 4),
+            "recorded_at": _utc_now().isoformat(),
+        }
+        with self._lock:
+            recorded = self._load_meta()
+            if key in recorded:
+                return
+            with zipfile.ZipFile(self.path, "a", compression=zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr(f"{key}.body", body)
+                archive.writestr(f"{key}.json", json.dumps(meta))
+            recorded[key] = meta
+
+    def _load_meta(self) -> dict[str, dict]:
+        if self._meta is None:
+            self._meta = {}
+            if self.path.exists():
+                with zipfile.ZipFile(self.path) as archive:
+                    for name in archive.namelist():
+                        if name.endswith(".json"):
+                            self._meta[name.removesuffix(".json")] = json.loads(archive.read(name))
+        return self._meta
+
+
+def fetch_bytes(archive: HttpArchive | None, url: str, fetch: Callable[[], bytes]) -> bytes:
+    """Fetch through ``archive`` when one is configured."""
+
+    if archive is None:
+        return fetch()
+    return archive.fetch(url, fetch)
+
+
+def source_now(archive: HttpArchive | None) -> datetime:
+    """Current UTC time for a source's window filter, or the recording time when ``archive`` replays."""
+
+    if archive is None:
+        return _utc_now()
+    return archive.now()
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def strip_secrets(url: str) -> str:
+    """Drop API-key style query parameters from ``url``."""
+
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if name not in SECRET_QUERY_PARAMS]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(query)), ""))
+
+
+def archive_key(url: str) -> str:
+    return hashlib.sha1(strip_secrets(url).encode("utf-8")).hexdigest()
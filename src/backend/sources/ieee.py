@@ -9,7 +9,9 @@ from urllib.parse import urlencode
 from urllib.error import URLError
 from urllib.request import urlopen
 
+from backend.paper_process.identity import build_identifiers, doi_identifier
 from backend.paper_process.paper import PaperCandidate
+from backend.sources.http_archive import HttpArchive, fetch_bytes, source_now
 
 IEEE_API_URL = "https://ieeexploreapi.ieee.org/api/v1/search/articles"
 
@@ -27,6 +29,7 @@ class IeeeXploreSource:
         api_key: str,
         start_year: int = 2023,
         end_year: int | None = None,
+        http_archive: HttpArchive | None = None,
     ):
         self.research_field = research_field
         self.include_keywords = include_keywords
@@ -36,6 +39,7 @@ class IeeeXploreSource:
         self.api_key = api_key
         self.start_year = start_year
         self.end_year = end_year if end_year is not None else datetime.now(timezone.utc).year
+        self.http_archive = http_archive
 
     def search_recent(self) -> list[PaperCandidate]:
         articles = self._fetch_articles()
@@ -80,18 +84,22 @@ class IeeeXploreSource:
             "end_year": self.end_year,
         }
         url = f"{IEEE_API_URL}?{urlencode(params)}"
-        attempts = 3
-        for attempt in range(1, attempts + 1):
-            try:
-                with urlopen(url, timeout=30) as resp:
-                    return json.loads(resp.read().decode("utf-8"))
-            except URLError:
-                if attempt == attempts:
-                    raise
-                time.sleep(attempt)
+
+        def fetch() -> bytes:
+            attempts = 3
+            for attempt in range(1, attempts + 1):
+                try:
+                    with urlopen(url, timeout=30) as resp:
+                        return resp.read()
+                except URLError:
+                    if attempt == attempts:
+                        raise
+                    time.sleep(attempt)
+
+        return json.loads(fetch_bytes(self.http_archive, url, fetch).decode("utf-8"))
 
     def _parse_articles(self, articles: list[dict]) -> list[PaperCandidate]:
-        earliest = datetime.now(timezone.utc) - timedelta(days=self.window_days)
+        earliest = source_now(self.http_archive) - timedelta(days=self.window_days)
 
         candidates: list[PaperCandidate] = []
         for article in articles:
@@ -128,6 +136,10 @@ class IeeeXploreSource:
                     pdf_url=pdf_url,
                     code_urls=[],
                     categories=keywords,
+                    identifiers=build_identifiers(
+                        doi_identifier(str(article.get("doi") or "")),
+                        f"ieee_xplore:{external_id.lower()}",
+                    ),
                 )
             )
 
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import heapq
+from collections.abc import Iterator
+from datetime import date
+
 from backend.common.protocols import SourceInterface
+from backend.paper_process.paper import PaperCandidate
 
 
 class MultiSource:
@@ -31,3 +36,11 @@ class MultiSource:
             raise RuntimeError("; ".join(errors))
 
         return all_candidates
+
+    def search_range(self, start: date, end: date) -> Iterator[PaperCandidate]:
+        """Merge the newest-first range streams of sources that support ranges."""
+
+        streams = [source.search_range(start, end) for source in self.sources if hasattr(source, "search_range")]
+        if not streams:
+            raise RuntimeError("No enabled source supports date-range search")
+        return heapq.merge(*streams, key=lambda item: item.published_at, reverse=True)
@@ -7,7 +7,9 @@ from datetime import datetime, timedelta, timezone
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
+from backend.paper_process.identity import build_identifiers, doi_identifier
 from backend.paper_process.paper import PaperCandidate
+from backend.sources.http_archive import HttpArchive, fetch_bytes, source_now
 
 SCOPUS_SEARCH_URL = "https://api.elsevier.com/content/search/scopus"
 
@@ -23,6 +25,7 @@ class ScopusSource:
         max_results: int,
         window_days: int,
         api_key: str,
+        http_archive: HttpArchive | None = None,
     ):
         self.research_field = research_field
         self.include_keywords = include_keywords
@@ -30,6 +33,7 @@ class ScopusSource:
         self.max_results = max_results
         self.window_days = window_days
         self.api_key = api_key
+        self.http_archive = http_archive
 
     def search_recent(self) -> list[PaperCandidate]:
         payload = self._fetch_json()
@@ -61,12 +65,16 @@ class ScopusSource:
             },
             method="GET",
         )
-        with urlopen(req, timeout=30) as resp:
-            return json.loads(resp.read().decode("utf-8"))
+
+        def fetch() -> bytes:
+            with urlopen(req, timeout=30) as resp:
+                return resp.read()
+
+        return json.loads(fetch_bytes(self.http_archive, url, fetch).decode("utf-8"))
 
     def _parse_payload(self, payload: dict) -> list[PaperCandidate]:
         entries = payload.get("search-results", {}).get("entry", [])
-        earliest = datetime.now(timezone.utc) - timedelta(days=self.window_days)
+        earliest = source_now(self.http_archive) - timedelta(days=self.window_days)
 
         candidates: list[PaperCandidate] = []
         for entry in entries:
@@ -114,6 +122,10 @@ class ScopusSource:
                     pdf_url=source_url,
                     code_urls=[],
                     categories=keywords,
+                    identifiers=build_identifiers(
+                        doi_identifier(entry.get("prism:doi")),
+                        f"scopus:{external_id.lower()}",
+                    ),
                 )
             )
 
@@ -16,7 +16,9 @@ from urllib.parse import urlencode, urljoin
 from urllib.request import Request, urlopen
 
 from backend.common.utils import extract_code_urls
+from backend.paper_process.identity import build_identifiers, doi_identifier
 from backend.paper_process.paper import PaperCandidate
+from backend.sources.http_archive import HttpArchive, fetch_bytes, source_now
 
 SEARCH_URL = "https://papers.ssrn.com/searchresults.cfm"
 ABSTRACT_URL_TEMPLATE = "https://papers.ssrn.com/sol3/papers.cfm?abstract_id={abstract_id}"
@@ -41,6 +43,7 @@ class SsrnSource:
         request_pause_seconds: float = 1.5,
         timeout_seconds: int = 30,
         feed_url: str | None = None,
+        http_archive: HttpArchive | None = None,
     ):
         self.research_field = research_field
         self.include_keywords = include_keywords
@@ -51,6 +54,7 @@ class SsrnSource:
         self.request_pause_seconds = request_pause_seconds
         self.timeout_seconds = timeout_seconds
         self.feed_url = feed_url
+        self.http_archive = http_archive
 
     def search_recent(self) -> list[PaperCandidate]:
         """Search SSRN using the configured backend."""
@@ -69,7 +73,7 @@ class SsrnSource:
     def _search_recent_via_html(self) -> list[PaperCandidate]:
         search_html = self._fetch_search_html()
         abstract_ids = self._extract_abstract_ids(search_html)
-        earliest = datetime.now(timezone.utc) - timedelta(days=self.window_days)
+        earliest = source_now(self.http_archive) - timedelta(days=self.window_days)
         candidates: list[PaperCandidate] = []
 
         for index, abstract_id in enumerate(abstract_ids):
@@ -92,7 +96,8 @@ class SsrnSource:
 
             candidates.append(candidate)
 
-            if index < len(abstract_ids) - 1 and len(candidates) < self.max_results:
+            offline = self.http_archive is not None and self.http_archive.is_offline
+            if index < len(abstract_ids) - 1 and len(candidates) < self.max_results and not offline:
                 time.sleep(self.request_pause_seconds)
 
         return candidates
@@ -113,10 +118,14 @@ class SsrnSource:
 
     def _fetch_html(self, url: str, label: str) -> str:
         request = Request(url, headers={"User-Agent": USER_AGENT}, method="GET")
-        try:
+
+        def fetch() -> bytes:
             with urlopen(request, timeout=self.timeout_seconds) as response:
                 charset = response.headers.get_content_charset() or "utf-8"
-                return response.read().decode(charset, errors="replace")
+                return response.read().decode(charset, errors="replace").encode("utf-8")
+
+        try:
+            return fetch_bytes(self.http_archive, url, fetch).decode("utf-8")
         except HTTPError as exc:
             raise RuntimeError(_format_ssrn_http_error(label=label, error=exc)) from exc
         except Exception as exc:
@@ -159,6 +168,10 @@ class SsrnSource:
             pdf_url=pdf_url,
             code_urls=extract_code_urls(abstract),
             categories=keywords,
+            identifiers=build_identifiers(
+                doi_identifier(_extract_meta_content(html_text, "citation_doi")),
+                f"ssrn:{abstract_id.lower()}",
+            ),
         )
 
     def _extract_title(self, html_text: str) -> str:
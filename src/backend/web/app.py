@@ -5,10 +5,10 @@ from __future__ import annotations
 from pathlib import Path
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from backend.config.web_config import WebAppConfig
 from backend.web.service import PaperSummaryService
@@ -19,6 +19,7 @@ class RunRequest(BaseModel):
 
     delete_last_file: bool = False
     config_path: str | None = None
+    profile: str | None = Field(default=None, pattern="^(cprofile|sample)$")
 
 
 def create_app(
@@ -47,6 +48,7 @@ def create_app(
         job = active_service.create_job(
             delete_last_file=request.delete_last_file,
             config_path=request.config_path,
+            profile=request.profile,
         )
         if hasattr(active_service, "start_job"):
             active_service.start_job(job["job_id"])
@@ -70,6 +72,15 @@ def create_app(
             raise HTTPException(status_code=404, detail="No newspaper generated yet")
         return newspaper
 
+    @app.get("/api/papers/search")
+    async def search_papers(q: str = Query(min_length=1), limit: int = Query(default=20, ge=1, le=100)) -> dict:
+        active_service = app.state.paper_summary_service
+        try:
+            items = active_service.search_papers(q, limit=limit)
+        except RuntimeError as exc:
+            raise HTTPException(status_code=503, detail=str(exc)) from exc
+        return {"query": q, "items": items}
+
     return app
 
 
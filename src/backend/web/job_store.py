@@ -18,10 +18,12 @@ class JobRecord:
     status: str
     delete_last_file: bool
     config_path: str | None
+    profile: str | None = None
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     result: dict | None = None
     error: str | None = None
+    partial_summaries: dict[str, dict] = field(default_factory=dict)
 
     def to_dict(self) -> dict:
         """Serialize job record for API responses."""
@@ -31,10 +33,12 @@ class JobRecord:
             "status": self.status,
             "delete_last_file": self.delete_last_file,
             "config_path": self.config_path,
+            "profile": self.profile,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "result": self.result,
             "error": self.error,
+            "partial_summaries": self.partial_summaries,
         }
 
 
@@ -46,7 +50,13 @@ class InMemoryJobStore:
         self._jobs: dict[str, JobRecord] = {}
         self._counter = 0
 
-    def create_job(self, *, delete_last_file: bool, config_path: str | None) -> JobRecord:
+    def create_job(
+        self,
+        *,
+        delete_last_file: bool,
+        config_path: str | None,
+        profile: str | None = None,
+    ) -> JobRecord:
         with self._lock:
             self._counter += 1
             job_id = f"job-{self._counter:04d}"
@@ -55,6 +65,7 @@ class InMemoryJobStore:
                 status="queued",
                 delete_last_file=delete_last_file,
                 config_path=config_path,
+                profile=profile,
             )
             self._jobs[job_id] = record
             return record
@@ -75,6 +86,15 @@ class InMemoryJobStore:
     def mark_failed(self, job_id: str, error: str) -> JobRecord:
         return self._update(job_id=job_id, status="failed", error=error, result=None)
 
+    def record_partial_summary(self, job_id: str, external_id: str, summary: dict) -> JobRecord:
+        with self._lock:
+            if job_id not in self._jobs:
+                raise KeyError(f"Unknown job_id: {job_id}")
+            record = self._jobs[job_id]
+            record.partial_summaries = {**record.partial_summaries, external_id: summary}
+            record.updated_at = datetime.now(timezone.utc)
+            return JobRecord(**asdict(record))
+
     def _update(self, job_id: str, **changes) -> JobRecord:
         with self._lock:
             if job_id not in self._jobs:
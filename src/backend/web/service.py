@@ -8,6 +8,8 @@ import threading
 from pathlib import Path
 
 from backend.app import run_pipeline
+from backend.config.paper_config import load_config
+from backend.paper_process.paper_cache import SQLiteCache
 from backend.paper_process.writer import _parse_markdown_blocks
 from backend.web.job_store import InMemoryJobStore
 
@@ -20,16 +22,27 @@ class PaperSummaryService:
         *,
         job_store: InMemoryJobStore | None = None,
         markdown_dir: Path | None = None,
+        db_path: Path | None = None,
+        config_path: Path | None = None,
         pipeline_runner=run_pipeline,
     ) -> None:
         self.job_store = job_store or InMemoryJobStore()
         self.markdown_dir = markdown_dir or Path("newspaper/markdown")
+        self.db_path = db_path
+        self.config_path = config_path
         self.pipeline_runner = pipeline_runner
 
-    def create_job(self, *, delete_last_file: bool, config_path: str | None) -> dict:
+    def create_job(
+        self,
+        *,
+        delete_last_file: bool,
+        config_path: str | None,
+        profile: str | None = None,
+    ) -> dict:
         record = self.job_store.create_job(
             delete_last_file=delete_last_file,
             config_path=config_path,
+            profile=profile,
         )
         return record.to_dict()
 
@@ -52,6 +65,8 @@ class PaperSummaryService:
             result = self.pipeline_runner(
                 config_path=record.config_path,
                 delete_last_file=record.delete_last_file,
+                on_progress=lambda event: self._handle_progress(job_id, event),
+                profile=record.profile,
             )
         except Exception as exc:
             self.job_store.mark_failed(job_id, str(exc))
@@ -59,18 +74,32 @@ class PaperSummaryService:
 
         self.job_store.mark_succeeded(job_id, result)
 
+    def _handle_progress(self, job_id: str, event: dict) -> None:
+        if event.get("type") == "partial_summary":
+            self.job_store.record_partial_summary(job_id, event["external_id"], event["summary"])
+
     def get_job(self, job_id: str) -> dict | None:
         record = self.job_store.get_job(job_id)
         if record is None:
             return None
         return record.to_dict()
 
+    def search_papers(self, query: str, limit: int = 20) -> list[dict]:
+        """Search the pipeline's cache read-only; schema upgrades are left to the pipeline."""
+
+        db_path = self.db_path or Path(load_config(self.config_path).runtime.db_path)
+        if not db_path.exists():
+            return []
+        cache = SQLiteCache(db_path, read_only=True)
+        cache.require_current_schema()
+        return cache.search_papers(query, limit=limit)
+
     def get_latest_newspaper(self) -> dict[str, str] | None:
         if not self.markdown_dir.exists():
             return None
 
         candidates = sorted(
-            self.markdown_dir.glob("*_papers.md"),
+            self.markdown_dir.glob("*_papers*.md"),
             key=lambda path: path.stat().st_mtime,
             reverse=True,
         )
@@ -34,6 +34,13 @@ function renderJobStatus(job) {
   }
 
   if (!job.result) {
+    const partials = Object.values(job.partial_summaries ?? {});
+    if (partials.length > 0) {
+      const latest = partials[partials.length - 1];
+      const title = latest.title ?? "未命名论文";
+      jobResultElement.textContent = `正在生成第 ${partials.length} 篇摘要：${title}`;
+      return;
+    }
     jobResultElement.textContent = "任务已提交，等待后端完成。";
     return;
   }
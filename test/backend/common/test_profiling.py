@@ -0,0 +1,33 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from backend.common.profiling import profile_call
+
+
+def _busy_work() -> int:
+    deadline = time.perf_counter() + 0.05
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+@pytest.mark.parametrize("mode, suffix", [("cprofile", ".prof"), ("sample", ".folded")])
+def test_profile_call_writes_artifacts_and_memory_peak(tmp_path: Path, mode: str, suffix: str) -> None:
+    result, report = profile_call(_busy_work, mode=mode, output_dir=tmp_path)
+
+    assert result > 0
+    assert report["peak_memory_bytes"] > 0
+    assert any(path.endswith(suffix) for path in report["artifacts"])
+    report_path = next(Path(path) for path in report["artifacts"] if path.endswith("_profile.json"))
+    assert json.loads(report_path.read_text(encoding="utf-8"))["mode"] == mode
+    if mode == "sample":
+        assert "_busy_work" in Path(report["artifacts"][0]).read_text(encoding="utf-8")
+
+
+def test_profile_call_rejects_unknown_mode(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        profile_call(lambda: None, mode="perf", output_dir=tmp_path)
@@ -2,6 +2,8 @@ import json
 from datetime import datetime, timezone
 from pathlib import Path
 
+import pytest
+
 from backend.config.paper_config import load_config
 
 
@@ -148,3 +150,52 @@ def test_prompt_templates_loaded_from_config(tmp_path: Path) -> None:
     assert config.prompts.ranker_user_template == "ranker-user={research_field}"
     assert config.prompts.summarizer_system == "summarizer-system"
     assert config.prompts.summarizer_user_template == "summarizer-user={paper_json}"
+
+
+def test_llm_stream_settings_loaded_from_nested_block(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    _write_config(
+        config_path,
+        runtime={"llm": {"stream": True, "max_stream_seconds": 45, "max_stream_tokens": 900}},
+    )
+
+    config = load_config(config_path)
+
+    assert config.runtime.llm_stream is True
+    assert config.runtime.llm_max_stream_seconds == 45.0
+    assert config.runtime.llm_max_stream_tokens == 900
+
+
+def test_retention_settings_loaded_from_nested_block(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    _write_config(config_path, runtime={"retention": {"paper_days": 90, "digest_days": 365, "vacuum_pages": 500}})
+
+    config = load_config(config_path)
+
+    assert config.runtime.retention_paper_days == 90
+    assert config.runtime.retention_digest_days == 365
+    assert config.runtime.retention_vacuum_pages == 500
+
+
+def test_profiles_loaded_and_validated(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    payload = {
+        "query": {"research_field": "Traffic engineering", "categories": ["cs.AI"]},
+        "profiles": [
+            {"name": "safety", "research_field": "Pedestrian safety", "exclude_keywords": ["protein"]},
+            {"name": "planning", "research_field": "Motion planning", "top_k": 5, "categories": ["cs.RO"]},
+        ],
+    }
+    config_path.write_text(json.dumps(payload), encoding="utf-8")
+
+    config = load_config(config_path)
+
+    assert [item.name for item in config.profiles] == ["safety", "planning"]
+    assert config.profiles[0].query.exclude_keywords == ["protein"]
+    assert config.profiles[0].query.categories == ["cs.AI"]
+    assert (config.profiles[1].top_k, config.profiles[1].query.categories) == (5, ["cs.RO"])
+
+    payload["profiles"][1]["name"] = "safety"
+    config_path.write_text(json.dumps(payload), encoding="utf-8")
+    with pytest.raises(ValueError, match="unique"):
+        load_config(config_path)
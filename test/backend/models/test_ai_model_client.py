@@ -3,12 +3,19 @@
 from __future__ import annotations
 
 import json
+import threading
 from io import BytesIO
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from backend.models.ai_model_client import AIModelClient
+from backend.models.ai_model_client import (
+    AIModelClient,
+    IncrementalJsonParser,
+    ModelEndpoint,
+    StreamBudgetExceeded,
+)
+from backend.models.tokens import estimate_tokens
 
 
 def test_client_is_disabled_without_api_key(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -77,3 +84,212 @@ def test_chat_json_sends_correct_request(monkeypatch: pytest.MonkeyPatch) -> Non
     assert sent_payload["model"] == "claude-sonnet-4-6"
     assert sent_payload["messages"][0]["role"] == "system"
     assert sent_payload["messages"][1]["role"] == "user"
+
+
+def _sse_response(chunks: list[str]) -> MagicMock:
+    lines = [
+        f"data: {json.dumps({'choices': [{'delta': {'content': chunk}}]})}\n".encode("utf-8")
+        for chunk in chunks
+    ]
+    lines.append(b"data: [DONE]\n")
+    mock_response = MagicMock()
+    mock_response.__iter__ = lambda s: iter(lines)
+    mock_response.__enter__ = lambda s: s
+    mock_response.__exit__ = MagicMock(return_value=False)
+    return mock_response
+
+
+def test_chat_json_streams_sse_chunks_and_reports_partials() -> None:
+    client = AIModelClient(api_key="test-key", endpoint="https://api.example.com/v1/chat/completions", stream=True)
+    chunks = ['```json\n{"title": "Traffic', ' GNN", "problem": "delays', '", "approach": "graph"}', "\n```"]
+    partials: list[dict] = []
+
+    with patch("backend.models.ai_model_client.urlopen", return_value=_sse_response(chunks)) as mock_urlopen:
+        result = client.chat_json(model="m", system_prompt="sys", user_prompt="user", on_partial=partials.append)
+
+    assert result == {"title": "Traffic GNN", "problem": "delays", "approach": "graph"}
+    assert partials[0] == {"title": "Traffic GNN", "problem": "delays"}
+    assert partials[-1] == result
+    sent_payload = json.loads(mock_urlopen.call_args[0][0].data.decode("utf-8"))
+    assert sent_payload["stream"] is True
+    assert client.last_stream_stats is not None
+    assert client.last_stream_stats.chunk_count == 4
+    assert client.last_stream_stats.time_to_first_token is not None
+
+
+def test_chat_json_stream_aborts_when_token_budget_exceeded() -> None:
+    client = AIModelClient(
+        api_key="test-key",
+        endpoint="https://api.example.com/v1/chat/completions",
+        stream=True,
+        max_stream_tokens=2,
+    )
+    chunks = ['{"a": "', "x", "y", "z", '"}']
+
+    with patch("backend.models.ai_model_client.urlopen", return_value=_sse_response(chunks)):
+        with pytest.raises(StreamBudgetExceeded, match="token budget"):
+            client.chat_json(model="m", system_prompt="sys", user_prompt="user")
+
+    assert client.last_stream_stats is not None
+    assert client.last_stream_stats.aborted is True
+
+
+def test_incremental_json_parser_falls_back_to_last_complete_field() -> None:
+    parser = IncrementalJsonParser()
+
+    assert parser.feed('{"title": "A", "auth') == {"title": "A"}
+    assert parser.feed('ors": ["x", "y"') == {"title": "A", "authors": ["x", "y"]}
+
+
+def test_incremental_json_parser_only_parses_when_a_member_completes(monkeypatch) -> None:
+    parser = IncrementalJsonParser()
+    parses = []
+    original = parser.partial
+    monkeypatch.setattr(parser, "partial", lambda: parses.append(len(parser.text)) or original())
+
+    results = [parser.feed(chunk) for chunk in ['{"title": "A", "problem": "', *["word, "] * 500, '", "x": [1]}']]
+
+    assert len(parses) == 2
+    assert results[0] == {"title": "A", "problem": ""}
+    assert results[-1] == {"title": "A", "problem": "word, " * 500, "x": [1]}
+    assert all(result is None for result in results[1:-1])
+
+
+def _json_response(content: str) -> MagicMock:
+    mock_response = MagicMock()
+    mock_response.read.return_value = json.dumps({"choices": [{"message": {"content": content}}]}).encode("utf-8")
+    mock_response.__enter__ = lambda s: s
+    mock_response.__exit__ = MagicMock(return_value=False)
+    return mock_response
+
+
+def test_chat_json_fails_over_to_next_endpoint_and_parks_unhealthy_one() -> None:
+    client = AIModelClient(
+        api_key="test-key",
+        endpoints=[
+            ModelEndpoint(url="https://primary.example.com"),
+            ModelEndpoint(url="https://backup.example.com", model="backup-model"),
+        ],
+        failure_threshold=1,
+    )
+    called: list[tuple[str, str]] = []
+
+    def fake_urlopen(request, timeout):
+        called.append((request.full_url, json.loads(request.data.decode("utf-8"))["model"]))
+        if request.full_url == "https://primary.example.com":
+            raise OSError("connection refused")
+        return _json_response('{"ok": true}')
+
+    with patch("backend.models.ai_model_client.urlopen", side_effect=fake_urlopen):
+        assert client.chat_json(model="m", system_prompt="sys", user_prompt="user") == {"ok": True}
+        assert client.chat_json(model="m", system_prompt="sys", user_prompt="user") == {"ok": True}
+
+    assert called == [
+        ("https://primary.example.com", "m"),
+        ("https://backup.example.com", "backup-model"),
+        ("https://backup.example.com", "backup-model"),
+    ]
+
+
+def test_chat_json_raises_when_every_endpoint_fails() -> None:
+    client = AIModelClient(api_key="test-key", endpoint="https://a.example.com,https://b.example.com")
+
+    with patch("backend.models.ai_model_client.urlopen", side_effect=OSError("down")):
+        with pytest.raises(RuntimeError, match="All AI model endpoints failed"):
+            client.chat_json(model="m", system_prompt="sys", user_prompt="user")
+
+
+def test_hedged_request_returns_backup_answer_when_primary_is_slow() -> None:
+    client = AIModelClient(
+        api_key="test-key",
+        endpoints=[ModelEndpoint(url="https://slow.example.com"), ModelEndpoint(url="https://fast.example.com")],
+        hedge=True,
+        hedge_min_samples=1,
+    )
+    client.health["https://slow.example.com"].latencies.append(0.01)
+    release = threading.Event()
+
+    def fake_urlopen(request, timeout):
+        if request.full_url == "https://slow.example.com":
+            release.wait(timeout=2)
+            return _json_response('{"from": "slow"}')
+        return _json_response('{"from": "fast"}')
+
+    with patch("backend.models.ai_model_client.urlopen", side_effect=fake_urlopen):
+        result = client.chat_json(model="m", system_prompt="sys", user_prompt="user")
+    release.set()
+
+    assert result == {"from": "fast"}
+
+
+def _hedged_client(**kwargs) -> AIModelClient:
+    client = AIModelClient(
+        api_key="test-key",
+        endpoints=[ModelEndpoint(url="https://slow.example.com"), ModelEndpoint(url="https://fast.example.com")],
+        hedge=True,
+        hedge_min_samples=1,
+        failure_threshold=10,
+        **kwargs,
+    )
+    client.health["https://slow.example.com"].latencies.append(0.01)
+    return client
+
+
+def test_hedged_request_reports_each_endpoint_error_and_closes() -> None:
+    release = threading.Event()
+
+    def fake_urlopen(request, timeout):
+        if request.full_url == "https://slow.example.com":
+            release.wait(timeout=2)
+            raise OSError("slow down")
+        release.set()
+        raise OSError("fast down")
+
+    with _hedged_client() as client:
+        with patch("backend.models.ai_model_client.urlopen", side_effect=fake_urlopen):
+            with pytest.raises(RuntimeError) as raised:
+                client.chat_json(model="m", system_prompt="sys", user_prompt="user")
+        assert client._executor is not None
+
+    assert "https://fast.example.com: fast down" in str(raised.value)
+    assert "https://slow.example.com: slow down" in str(raised.value)
+    assert client._executor is None
+
+
+def test_hedged_stream_budget_error_is_reraised_with_winner_stats() -> None:
+    client = _hedged_client(stream=True, max_stream_seconds=0.0)
+    release = threading.Event()
+
+    def fake_urlopen(request, timeout):
+        if request.full_url == "https://slow.example.com":
+            release.wait(timeout=2)
+        return _sse_response(['{"a": 1}'])
+
+    with patch("backend.models.ai_model_client.urlopen", side_effect=fake_urlopen):
+        with pytest.raises(StreamBudgetExceeded):
+            client.chat_json(model="m", system_prompt="sys", user_prompt="user")
+    release.set()
+    client.close()
+
+    assert client.last_stream_stats is not None
+    assert client.last_stream_stats.aborted is True
+
+
+def test_stream_token_budget_counts_delta_text_not_chunks() -> None:
+    long_chunk = '{"a": "' + "word " * 40 + '"}'
+    client = AIModelClient(
+        api_key="test-key", endpoint="https://api.example.com/v1/chat/completions", stream=True, max_stream_tokens=20
+    )
+
+    with patch("backend.models.ai_model_client.urlopen", return_value=_sse_response([long_chunk])):
+        with pytest.raises(StreamBudgetExceeded, match="token budget"):
+            client.chat_json(model="m", system_prompt="sys", user_prompt="user")
+    assert client.last_stream_stats.chunk_count == 1
+    assert client.last_stream_stats.estimated_tokens > 20
+
+    client.max_stream_tokens = 100
+    chunks = ['{"a": ', '"b"', "}"]
+    with patch("backend.models.ai_model_client.urlopen", return_value=_sse_response(chunks)):
+        assert client.chat_json(model="m", system_prompt="sys", user_prompt="user") == {"a": "b"}
+    assert client.last_stream_stats.chunk_count == 3
+    assert client.last_stream_stats.estimated_tokens == sum(estimate_tokens(chunk) for chunk in chunks)
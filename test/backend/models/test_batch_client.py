@@ -0,0 +1,162 @@
+"""Tests for offline batch submission through a local batch backend."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from backend.models.batch_client import BatchJob, BatchModelClient, LocalBatchBackend, read_batch_results
+from backend.models.tokens import UsageLedger
+from backend.paper_process.paper import PaperCandidate
+from backend.paper_process.ranker import RelevanceRanker
+from backend.paper_process.summarizer import PaperSummarizer
+
+
+def _completion(content: dict) -> dict:
+    return {
+        "model": "batch-model",
+        "choices": [{"message": {"content": json.dumps(content)}}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 20},
+    }
+
+
+def _candidate(external_id: str) -> PaperCandidate:
+    now = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    return PaperCandidate(
+        source="arxiv",
+        external_id=external_id,
+        title=f"Paper {external_id}",
+        abstract="Traffic safety with reinforcement learning.",
+        authors=["A. Author"],
+        affiliations=[],
+        published_at=now,
+        updated_at=now,
+        arxiv_url=f"https://arxiv.org/abs/{external_id}",
+        pdf_url=f"https://arxiv.org/pdf/{external_id}.pdf",
+        code_urls=[],
+        categories=["cs.AI"],
+    )
+
+
+def test_chat_json_many_writes_jsonl_and_maps_results_by_custom_id(tmp_path: Path) -> None:
+    def handler(body: dict) -> dict:
+        prompt = body["messages"][1]["content"]
+        if prompt == "fail":
+            raise ValueError("boom")
+        return _completion({"echo": prompt})
+
+    backend = LocalBatchBackend(handler)
+    ledger = UsageLedger()
+    client = BatchModelClient(backend=backend, batch_dir=tmp_path, usage_ledger=ledger)
+
+    results = client.chat_json_many(
+        [
+            {"model": "m", "system_prompt": "s", "user_prompt": "first"},
+            {"model": "m", "system_prompt": "s", "user_prompt": "fail"},
+            {"model": "m", "system_prompt": "s", "user_prompt": "third"},
+        ]
+    )
+
+    assert results[0] == {"echo": "first"}
+    assert isinstance(results[1], Exception)
+    assert results[2] == {"echo": "third"}
+    lines = backend.submitted[0].read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["custom_id"] for line in lines] == ["req-00000", "req-00001", "req-00002"]
+    assert len(list(tmp_path.glob("*_results.jsonl"))) == 1
+    assert ledger.totals() == {"calls": 2, "prompt_tokens": 200, "completion_tokens": 40}
+
+
+def test_batch_client_polls_until_backend_reports_terminal_state(tmp_path: Path) -> None:
+    class SlowBackend(LocalBatchBackend):
+        def __init__(self):
+            super().__init__(lambda body: _completion({"ok": True}))
+            self.refreshes = 0
+
+        def submit(self, input_path: Path) -> BatchJob:
+            job = super().submit(input_path)
+            return BatchJob(batch_id=job.batch_id, status="in_progress", output_file_id=job.output_file_id)
+
+        def refresh(self, job: BatchJob) -> BatchJob:
+            self.refreshes += 1
+            status = "completed" if self.refreshes >= 2 else "in_progress"
+            return BatchJob(batch_id=job.batch_id, status=status, output_file_id=job.output_file_id)
+
+    backend = SlowBackend()
+    sleeps: list[float] = []
+    client = BatchModelClient(backend=backend, batch_dir=tmp_path, poll_seconds=5, sleep=sleeps.append)
+
+    assert client.chat_json(model="m", system_prompt="s", user_prompt="u") == {"ok": True}
+    assert sleeps == [5, 5]
+
+
+def test_ranker_and_summarizer_submit_one_batch_per_stage(tmp_path: Path) -> None:
+    def handler(body: dict) -> dict:
+        prompt = body["messages"][1]["content"]
+        if prompt.startswith("RANK="):
+            items = json.loads(prompt[len("RANK=") :])
+            return _completion(
+                {"items": [{"external_id": i["external_id"], "relevance_score": 60, "relevance_reason": "r"} for i in items]}
+            )
+        paper = json.loads(prompt[len("SUM=") :])
+        return _completion(
+            {
+                "title": paper["title"],
+                "problem": "p",
+                "approach": "a",
+                "tell_someone_in_4_5_sentences": ["1", "2", "3", "4"],
+            }
+        )
+
+    backend = LocalBatchBackend(handler)
+    client = BatchModelClient(backend=backend, batch_dir=tmp_path)
+    candidates = [_candidate(f"id-{index}") for index in range(3)]
+    ranker = RelevanceRanker(
+        research_field="Traffic",
+        include_keywords=[],
+        exclude_keywords=[],
+        model_name="m",
+        system_prompt="s",
+        user_prompt_template="RANK={candidates_json}",
+        llm_client=client,
+    )
+    summarizer = PaperSummarizer(model_name="m", system_prompt="s", user_prompt_template="SUM={paper_json}", llm_client=client)
+
+    ranked = ranker.rank(candidates)
+    summaries = summarizer.summarize_many(ranked)
+
+    assert len(backend.submitted) == 2
+    assert "_rank_" in backend.submitted[0].name
+    assert "_summarize_" in backend.submitted[1].name
+    assert [item.problem for item in summaries] == ["p", "p", "p"]
+
+
+def test_read_batch_results_reports_http_errors() -> None:
+    text = json.dumps({"custom_id": "req-00000", "response": {"status_code": 429, "body": {}}, "error": None})
+
+    results = read_batch_results(text)
+
+    assert isinstance(results["req-00000"], RuntimeError)
+
+
+def test_summarizer_with_partial_reporter_uses_llm_output_in_batch_mode(tmp_path: Path) -> None:
+    def handler(body: dict) -> dict:
+        paper = json.loads(body["messages"][1]["content"][len("SUM=") :])
+        return _completion({"title": paper["title"], "problem": "p", "approach": "a"})
+
+    backend = LocalBatchBackend(handler)
+    partials: list[str] = []
+    summarizer = PaperSummarizer(
+        model_name="m",
+        system_prompt="s",
+        user_prompt_template="SUM={paper_json}",
+        llm_client=BatchModelClient(backend=backend, batch_dir=tmp_path),
+        on_partial=lambda external_id, partial: partials.append(external_id),
+    )
+
+    single = summarizer.summarize(_candidate("id-0"), 70.0, "r")
+    many = summarizer.summarize_many([(_candidate(f"id-{index}"), 70.0, "r") for index in (1, 2)])
+
+    assert [item.problem for item in [single, *many]] == ["p", "p", "p"]
+    assert len(backend.submitted) == 2
+    assert partials == []
@@ -0,0 +1,54 @@
+"""Tests for the local mock chat completions server."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from backend.models.ai_model_client import AIModelClient
+from backend.models.mock_server import MockLLMConfig, MockLLMServer, canned_response
+
+
+def _body(system_prompt: str, user_prompt: str) -> dict:
+    return {
+        "model": "mock",
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+    }
+
+
+def test_canned_response_matches_ranker_and_summarizer_shapes() -> None:
+    candidates = json.dumps([{"external_id": "a"}, {"external_id": "b"}])
+    ranking = canned_response(_body("Score paper relevance.", f"Candidates JSON:\n{candidates}"))
+    assert [item["external_id"] for item in ranking["items"]] == ["a", "b"]
+    assert all(0 <= item["relevance_score"] <= 100 for item in ranking["items"])
+    assert ranking == canned_response(_body("Score paper relevance.", f"Candidates JSON:\n{candidates}"))
+
+    single = canned_response(_body("Summarize.", 'Paper JSON:\n{"external_id": "a", "title": "T"}'))
+    assert single["title"] == "T"
+    assert len(single["tell_someone_in_4_5_sentences"]) == 4
+
+    batch = canned_response(_body("Summarize.", f"Papers JSON:\n{candidates}"))
+    assert [item["external_id"] for item in batch["items"]] == ["a", "b"]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_client_round_trips_through_mock_server(stream: bool) -> None:
+    with MockLLMServer(MockLLMConfig(stream_chunk_chars=8)) as server:
+        client = AIModelClient(api_key="mock", endpoint=server.url, stream=stream)
+        result = client.chat_json("mock", "Summarize.", 'Paper JSON:\n{"external_id": "a", "title": "T"}')
+
+    assert result["external_id"] == "a"
+    assert server.stats.requests == 1
+
+
+def test_mock_server_injects_rate_limits() -> None:
+    with MockLLMServer(MockLLMConfig(rate_limit_rate=1.0, seed=1)) as server:
+        client = AIModelClient(api_key="mock", endpoint=server.url)
+        with pytest.raises(RuntimeError, match="All AI model endpoints failed"):
+            client.chat_json("mock", "s", "{}")
+
+    assert server.stats.rate_limited == 1
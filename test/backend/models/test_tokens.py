@@ -0,0 +1,31 @@
+from backend.models.tokens import UsageLedger, UsageRecord, estimate_tokens, usage_stage, current_usage_stage
+
+
+def test_estimate_tokens_counts_words_digits_and_punctuation() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("graph networks") == 3
+    assert estimate_tokens("2026, ok!") == 5
+
+
+def test_estimate_tokens_scales_with_text_length() -> None:
+    short = estimate_tokens("traffic forecasting " * 10)
+    long = estimate_tokens("traffic forecasting " * 100)
+
+    assert long == short * 10
+
+
+def test_usage_stage_labels_calls_inside_block() -> None:
+    assert current_usage_stage() == "unknown"
+    with usage_stage("rank"):
+        assert current_usage_stage() == "rank"
+    assert current_usage_stage() == "unknown"
+
+
+def test_usage_ledger_totals_and_drain() -> None:
+    ledger = UsageLedger()
+    ledger.record(UsageRecord("rank", "m", "https://a", 100, 20, 90))
+    ledger.record(UsageRecord("summarize", "m", "https://a", 50, 30, 55))
+
+    assert ledger.totals() == {"calls": 2, "prompt_tokens": 150, "completion_tokens": 50}
+    assert len(ledger.drain()) == 2
+    assert ledger.drain() == []
@@ -0,0 +1,108 @@
+import tracemalloc
+from datetime import datetime, timezone
+
+from backend.models.ai_model_client import AIModelClient
+from backend.paper_process.batch import CandidateBatch
+from backend.paper_process import normalize
+from backend.paper_process.normalize import batch_title_keys, deduplicate_batch, deduplicate_candidates
+from backend.paper_process.paper import PaperCandidate
+from backend.paper_process.ranker import RelevanceRanker
+
+
+def _candidate(index: int, title: str | None = None) -> PaperCandidate:
+    # Build fresh string objects per candidate, as parsing a feed does.
+    published = datetime(2026, 2, 1, 8, 30, tzinfo=timezone.utc)
+    return PaperCandidate(
+        source="".join(["arx", "iv"]),
+        external_id=f"2602.{index:05d}",
+        title=title or f"Paper {index} on pedestrian safety",
+        abstract=f"Abstract {index}.",
+        authors=[f"Author {index % 7}", "".join(["Shared ", "Author"])],
+        affiliations=["".join(["Example ", "University"])],
+        published_at=published,
+        updated_at=published,
+        arxiv_url=f"https://arxiv.org/abs/2602.{index:05d}",
+        pdf_url=f"https://arxiv.org/pdf/2602.{index:05d}.pdf",
+        code_urls=[],
+        categories=["".join(["cs.", "LG"]), "".join(["cs.", "AI"])],
+        identifiers=[f"arxiv:2602.{index:05d}"],
+    )
+
+
+def test_batch_round_trips_candidates_and_interns_repeated_strings() -> None:
+    candidates = [_candidate(index) for index in range(50)]
+
+    batch = CandidateBatch.from_candidates(candidates)
+
+    assert len(batch) == 50
+    assert list(batch) == candidates
+    assert batch.values("categories", 3) == ["cs.LG", "cs.AI"]
+    # 1 source + 7 distinct authors + shared author + affiliation + 2 categories + 50 identifiers.
+    assert len(batch.strings) == 62
+
+
+def test_batch_uses_less_memory_than_candidate_objects() -> None:
+    def measure(build) -> int:
+        tracemalloc.start()
+        kept = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        return size
+
+    candidates_size = measure(lambda: [_candidate(index) for index in range(2000)])
+    batch_size = measure(lambda: CandidateBatch.from_candidates(_candidate(index) for index in range(2000)))
+
+    assert batch_size < candidates_size * 0.7
+
+
+def test_deduplicate_batch_matches_list_dedup() -> None:
+    candidates = [
+        _candidate(1),
+        _candidate(2, title="Paper 1 on Pedestrian-Safety"),
+        _candidate(3),
+        _candidate(1),
+        _candidate(4),
+    ]
+    seen_ids, seen_titles = {"2602.00004"}, set()
+
+    deduped = deduplicate_batch(CandidateBatch.from_candidates(candidates), seen_ids, seen_titles)
+
+    assert list(deduped) == deduplicate_candidates(candidates, seen_ids, seen_titles)
+    assert deduped.external_ids == ["2602.00001", "2602.00003"]
+
+
+def test_batch_title_keys_are_computed_once_and_carried_through_select(monkeypatch) -> None:
+    batch = CandidateBatch.from_candidates([_candidate(1), _candidate(2), _candidate(3)])
+    normalized = []
+    real_normalize_text = normalize.normalize_text
+    monkeypatch.setattr(normalize, "normalize_text", lambda text: normalized.append(text) or real_normalize_text(text))
+
+    keys = batch_title_keys(batch)
+    deduped = deduplicate_batch(batch, {"2602.00002"}, set())
+
+    assert keys == [f"paper {index} on pedestrian safety" for index in (1, 2, 3)]
+    assert [item.title_norm for item in deduped] == [keys[0], keys[2]]
+    assert batch_title_keys(deduped) == [keys[0], keys[2]]
+    assert len(normalized) == 3
+
+
+def test_rank_batch_matches_list_ranking() -> None:
+    candidates = [
+        _candidate(1, title="Protein folding"),
+        _candidate(2, title="Pedestrian safety at crossings"),
+        _candidate(3, title="Traffic signal timing"),
+    ]
+    ranker = RelevanceRanker(
+        research_field="pedestrian safety",
+        include_keywords=["crossings"],
+        exclude_keywords=[],
+        model_name="m",
+        system_prompt="s",
+        llm_client=AIModelClient(api_key=""),
+    )
+
+    ranked = ranker.rank_batch(CandidateBatch.from_candidates(candidates), top_k=2)
+
+    assert ranked == ranker.rank(candidates, top_k=2)
+    assert ranked[0][0].external_id == "2602.00002"
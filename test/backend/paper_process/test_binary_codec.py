@@ -0,0 +1,66 @@
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from backend.paper_process.binary_codec import decode_summary, encode_summary
+from backend.paper_process.paper import PaperSummary, RelatedPaper
+from backend.paper_process.paper_cache import SQLiteCache
+
+
+def _summary(related: list[RelatedPaper]) -> PaperSummary:
+    return PaperSummary(
+        external_id="2602.00001v2",
+        source="arxiv",
+        title="Pedestrian intent — a survey 🚶",
+        authors=["Zoë Author"],
+        affiliations=["Example University"],
+        arxiv_url="https://arxiv.org/abs/2602.00001v2",
+        pdf_url="https://arxiv.org/pdf/2602.00001v2.pdf",
+        code_urls=[],
+        problem="Problem.",
+        approach="",
+        methodological_novelty="Method.",
+        empirical_novelty="Results.",
+        tell_someone_in_4_5_sentences=["One.", "Two.", "Three.", "Four."],
+        relevance_score=87.5,
+        relevance_reason="Matches the profile.",
+        related_papers=related,
+    )
+
+
+def test_summary_round_trip_and_rejects_foreign_payloads() -> None:
+    summary = _summary([RelatedPaper("2501.00009", "Earlier work", "https://arxiv.org/abs/2501.00009", 0.812)])
+
+    assert decode_summary(encode_summary(summary)) == summary
+    assert decode_summary(encode_summary(_summary([]))) == _summary([])
+    with pytest.raises(ValueError):
+        decode_summary(b'{"json": 1}')
+
+
+@pytest.mark.parametrize("field, value", [("affiliations", None), ("code_urls", "https://github.com/x"), ("authors", [None])])
+def test_encode_summary_rejects_non_string_list_fields(field: str, value: object) -> None:
+    summary = _summary([])
+    setattr(summary, field, value)
+
+    with pytest.raises(ValueError):
+        encode_summary(summary)
+
+
+def test_cache_persists_summaries_and_clears_them_by_date(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    summary = _summary([RelatedPaper("2501.00009", "Earlier work", "https://arxiv.org/abs/2501.00009", 0.5)])
+
+    def stored() -> list[PaperSummary]:
+        with sqlite3.connect(cache.db_path) as conn:
+            return [decode_summary(payload) for (payload,) in conn.execute("SELECT payload FROM paper_summaries")]
+
+    cache.record_summaries(datetime(2026, 2, 6, 9, tzinfo=timezone.utc), [summary])
+
+    assert stored() == [summary]
+    cache.clear_history_for_date(datetime(2026, 2, 5, tzinfo=timezone.utc).date())
+    assert len(stored()) == 1
+    cache.clear_history_for_date(datetime(2026, 2, 6, tzinfo=timezone.utc).date())
+    assert stored() == []
@@ -0,0 +1,131 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from backend.models.ai_model_client import AIModelClient
+from backend.paper_process.paper import PaperCandidate
+from backend.paper_process.paper_cache import SQLiteCache
+from backend.paper_process.ranker import RelevanceRanker
+
+
+def _upsert(cache: SQLiteCache, external_id: str, title: str, abstract: str, first_seen_at: str) -> None:
+    cache.upsert_paper(
+        external_id=external_id,
+        source="arxiv",
+        title_raw=title,
+        title_norm=title.lower(),
+        abstract_raw=abstract,
+        authors_json="[]",
+        affiliations_json="[]",
+        published_at=first_seen_at,
+        updated_at=first_seen_at,
+        arxiv_url=f"https://arxiv.org/abs/{external_id}",
+        pdf_url=f"https://arxiv.org/pdf/{external_id}.pdf",
+        code_urls_json="[]",
+        categories_json="[]",
+        first_seen_at=first_seen_at,
+    )
+
+
+def _candidate(external_id: str, title: str, abstract: str) -> PaperCandidate:
+    now = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    return PaperCandidate(
+        source="arxiv",
+        external_id=external_id,
+        title=title,
+        abstract=abstract,
+        authors=[],
+        affiliations=[],
+        published_at=now,
+        updated_at=now,
+        arxiv_url=f"https://arxiv.org/abs/{external_id}",
+        pdf_url=f"https://arxiv.org/pdf/{external_id}.pdf",
+        code_urls=[],
+        categories=["cs.AI"],
+    )
+
+
+def test_term_index_follows_upserts_prunes_and_date_clears(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    _upsert(cache, "p1", "Pedestrian safety", "Pedestrian crossing risk.", "2026-02-05T00:00:00+00:00")
+    _upsert(cache, "p2", "Traffic signals", "Signal timing for pedestrian flow.", "2026-02-06T00:00:00+00:00")
+
+    stats = cache.fetch_term_stats(["pedestrian", "signal", "missing"])
+    assert (stats.doc_count, stats.df) == (2, {"pedestrian": 2, "signal": 1})
+    assert stats.total_length == 11
+
+    _upsert(cache, "p2", "Traffic signals", "Signal timing for cyclists.", "2026-02-06T00:00:00+00:00")
+    assert cache.fetch_term_stats(["pedestrian", "cyclists"]).df == {"pedestrian": 1, "cyclists": 1}
+
+    cache.prune_paper_payloads(datetime(2026, 2, 6, tzinfo=timezone.utc))
+    assert cache.fetch_term_stats(["pedestrian", "crossing"]).df == {"pedestrian": 1, "crossing": 0}
+
+    cache.clear_history_for_date(datetime(2026, 2, 6, tzinfo=timezone.utc).date())
+    stats = cache.fetch_term_stats(["pedestrian", "signal"])
+    assert (stats.doc_count, stats.total_length, stats.df) == (1, 2, {"pedestrian": 1, "signal": 0})
+
+
+def test_heuristic_ranking_uses_cached_idf_and_exclude_penalty(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    for index in range(20):
+        _upsert(cache, f"old-{index}", "Learning methods", "A learning study.", "2026-01-01T00:00:00+00:00")
+    candidates = [
+        _candidate("generic", "Learning for learning", "Deep learning study."),
+        _candidate("relevant", "Pedestrian safety at crossings", "Pedestrian risk with learning."),
+        _candidate("excluded", "Pedestrian protein", "Protein pedestrian learning."),
+    ]
+    ranker = RelevanceRanker(
+        research_field="pedestrian safety learning",
+        include_keywords=[],
+        exclude_keywords=["protein"],
+        model_name="m",
+        system_prompt="s",
+        llm_client=AIModelClient(api_key=""),
+        term_stats=cache,
+    )
+
+    ranked = ranker.rank(candidates)
+
+    assert [item[0].external_id for item in ranked] == ["relevant", "generic", "excluded"]
+    assert ranked[0][2].startswith("Heuristic rank: bm25=")
+    assert ranked[-1][1] == 0.0
+
+
+def test_batched_upserts_keep_the_same_term_statistics(tmp_path: Path) -> None:
+    rows = [
+        ("p1", "Graph traffic forecasting", "Graph networks forecast traffic."),
+        ("p2", "Pedestrian trajectories", "Forecasting pedestrian paths."),
+        ("p1", "Graph traffic signals", "Signal control with graphs."),
+    ]
+    one_by_one = SQLiteCache(tmp_path / "single.sqlite3")
+    one_by_one.init_db()
+    for external_id, title, abstract in rows:
+        _upsert(one_by_one, external_id, title, abstract, "2026-02-01T00:00:00+00:00")
+    batched = SQLiteCache(tmp_path / "batched.sqlite3")
+    batched.init_db()
+    _upsert(batched, "p1", *rows[0][1:], "2026-02-01T00:00:00+00:00")
+    batched.upsert_papers(
+        {
+            "external_id": external_id,
+            "source": "arxiv",
+            "title_raw": title,
+            "title_norm": title.lower(),
+            "abstract_raw": abstract,
+            "authors_json": "[]",
+            "affiliations_json": "[]",
+            "published_at": "2026-02-01T00:00:00+00:00",
+            "updated_at": "2026-02-01T00:00:00+00:00",
+            "arxiv_url": f"https://arxiv.org/abs/{external_id}",
+            "pdf_url": f"https://arxiv.org/pdf/{external_id}.pdf",
+            "code_urls_json": "[]",
+            "categories_json": "[]",
+            "first_seen_at": "2026-02-01T00:00:00+00:00",
+        }
+        for external_id, title, abstract in rows[1:]
+    )
+
+    terms = ["graph", "traffic", "forecast", "signal", "pedestrian"]
+    assert batched.fetch_term_stats(terms) == one_by_one.fetch_term_stats(terms)
+    assert [item["external_id"] for item in batched.search_papers("signals")] == ["p1"]
+    assert batched.search_papers("forecasting networks") == one_by_one.search_papers("forecasting networks")
@@ -1,7 +1,9 @@
+import sqlite3
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from backend.paper_process.paper_cache import SQLiteCache
+from backend.models.tokens import UsageRecord
+from backend.paper_process.paper_cache import SCHEMA_MIGRATIONS, SQLiteCache
 
 
 def test_should_run_respects_48h_gate(tmp_path) -> None:
@@ -190,3 +192,146 @@ def test_clear_history_for_date_only_removes_target_date_rows(tmp_path: Path) ->
         digest_item_count = conn.execute("SELECT COUNT(*) AS count FROM digest_items").fetchone()["count"]
     assert digest_count == 1
     assert digest_item_count == 1
+
+
+def test_record_llm_usage_accumulates_run_totals(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    run_at = datetime(2026, 2, 6, 1, 0, tzinfo=timezone.utc)
+
+    cache.record_llm_usage(run_at, [UsageRecord("rank", "m", "https://a", 1000, 200, 950)])
+    cache.record_llm_usage(run_at, [UsageRecord("summarize", "m", "https://a", 400, 300, 410)])
+
+    assert cache.fetch_llm_usage_totals(run_at) == {"calls": 2, "prompt_tokens": 1400, "completion_tokens": 500}
+    with cache._connect() as conn:
+        stages = [row["stage"] for row in conn.execute("SELECT stage FROM llm_usage ORDER BY usage_id")]
+    assert stages == ["rank", "summarize"]
+
+
+def _upsert(cache: SQLiteCache, external_id: str, title_norm: str) -> None:
+    cache.upsert_paper(
+        external_id=external_id,
+        source="arxiv",
+        title_raw=title_norm,
+        title_norm=title_norm,
+        abstract_raw="b",
+        authors_json='["x"]',
+        affiliations_json="[]",
+        published_at="2026-02-05T00:00:00+00:00",
+        updated_at="2026-02-05T00:00:00+00:00",
+        arxiv_url=f"https://arxiv.org/abs/{external_id}",
+        pdf_url=f"https://arxiv.org/pdf/{external_id}.pdf",
+        code_urls_json="[]",
+        categories_json='["cs.AI"]',
+        first_seen_at="2026-02-06T00:00:00+00:00",
+    )
+
+
+def test_digested_ids_follow_deleted_digests_but_survive_archiving(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    cache.record_digest(datetime(2026, 2, 5, 1, 0, tzinfo=timezone.utc), "a.md", "m", 7, 10, ["p1", "p2"])
+    cache.record_digest(datetime(2026, 2, 6, 1, 0, tzinfo=timezone.utc), "b.md", "m", 7, 10, ["p2", "p3"])
+    cache.record_digest(datetime(2026, 2, 7, 1, 0, tzinfo=timezone.utc), "c.md", "m", 7, 10, ["p4"])
+
+    cache.archive_digests(before=datetime(2026, 2, 6, tzinfo=timezone.utc))
+    assert cache.fetch_digested_ids() == {"p1", "p2", "p3", "p4"}
+    assert cache.delete_last_digest() == "c.md"
+    cache.clear_history_for_date(datetime(2026, 2, 6, tzinfo=timezone.utc).date())
+    assert cache.fetch_digested_ids() == {"p1", "p2"}
+    cache.clear_history()
+    assert cache.fetch_digested_ids() == set()
+
+
+def test_init_db_backfills_digested_ids_from_existing_digests(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    cache.record_digest(datetime(2026, 2, 5, 1, 0, tzinfo=timezone.utc), "a.md", "m", 7, 10, ["p1", "p2"])
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute("DROP TABLE digested_papers")
+        conn.execute("PRAGMA user_version = 5")
+
+    cache.init_db()
+
+    assert cache.fetch_digested_ids() == {"p1", "p2"}
+    assert cache.delete_last_digest() == "a.md"
+    assert cache.fetch_digested_ids() == set()
+
+
+def test_fetch_seen_keys_for_uses_persisted_bloom_filter(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3", seen_filter_capacity=1000)
+    cache.init_db()
+    _upsert(cache, "2501.00001v1", "graph traffic")
+
+    assert cache.seen_filter_path.exists()
+    reopened = SQLiteCache(tmp_path / "cache.sqlite3", seen_filter_capacity=1000)
+    assert reopened.fetch_seen_keys_for(["2501.00001v1", "new"], ["graph traffic", "other"]) == (
+        {"2501.00001v1"},
+        {"graph traffic"},
+    )
+
+
+def test_seen_filter_is_rebuilt_when_file_is_missing(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3", seen_filter_capacity=1000)
+    cache.init_db()
+    _upsert(cache, "2501.00001v1", "graph traffic")
+    cache._reset_seen_filter()
+
+    reopened = SQLiteCache(tmp_path / "cache.sqlite3", seen_filter_capacity=1000)
+    assert reopened.fetch_seen_keys_for(["2501.00001v1"], []) == ({"2501.00001v1"}, set())
+
+
+def test_init_db_migrates_legacy_schema_and_indexes_date_lookups(tmp_path: Path) -> None:
+    db_path = tmp_path / "cache.sqlite3"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE digests (
+                digest_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_at TEXT NOT NULL,
+                output_path TEXT NOT NULL,
+                model_used TEXT NOT NULL,
+                window_days INTEGER NOT NULL,
+                top_k INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO digests (run_at, output_path, model_used, window_days, top_k) VALUES (?, ?, ?, ?, ?)",
+            ("2026-02-06T01:00:00+00:00", "old.md", "m", 7, 10),
+        )
+
+    cache = SQLiteCache(db_path)
+    cache.init_db()
+    cache.init_db()
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == len(SCHEMA_MIGRATIONS)
+        plans = {
+            sql: " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+            for sql, params in [
+                ("SELECT MAX(run_at) FROM digests", ()),
+                ("SELECT digest_id FROM digests WHERE run_date = ?", ("2026-02-06",)),
+                ("SELECT external_id FROM papers WHERE first_seen_date = ?", ("2026-02-06",)),
+            ]
+        }
+    assert all("USING" in plan and "INDEX" in plan for plan in plans.values()), plans
+    cache.clear_history_for_date(datetime(2026, 2, 6, tzinfo=timezone.utc).date())
+    assert cache.delete_last_digest() is None
+
+
+def test_search_papers_ranks_by_bm25_and_follows_updates(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    _upsert(cache, "p1", "pedestrian trajectory prediction at intersections")
+    _upsert(cache, "p2", "protein folding")
+    _upsert(cache, "p3", "trajectory planning")
+
+    results = cache.search_papers("Pedestrian trajectories")
+
+    assert [item["external_id"] for item in results] == ["p1", "p3"]
+    assert results[0]["score"] > results[1]["score"]
+    _upsert(cache, "p3", "graph neural networks")
+    assert [item["external_id"] for item in cache.search_papers("trajectory")] == ["p1"]
+    cache.clear_history()
+    assert cache.search_papers("trajectory") == []
@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from backend.paper_process.embedding import EmbeddingRanker, EmbeddingStore, HashingEmbedder
+from backend.paper_process.paper import PaperCandidate
+
+
+def make_candidate(external_id: str, title: str, abstract: str) -> PaperCandidate:
+    now = datetime.now(timezone.utc)
+    return PaperCandidate(
+        source="arxiv",
+        external_id=external_id,
+        title=title,
+        abstract=abstract,
+        authors=["A. Author"],
+        affiliations=[],
+        published_at=now,
+        updated_at=now,
+        arxiv_url=f"https://example.org/{external_id}",
+        pdf_url=f"https://example.org/{external_id}.pdf",
+        code_urls=[],
+        categories=["cs.AI"],
+    )
+
+
+CANDIDATES = [
+    make_candidate("protein", "Protein structure prediction", "Medical imaging and protein folding with diffusion."),
+    make_candidate(
+        "traffic",
+        "Pedestrian trajectory prediction for autonomous vehicles",
+        "Reinforcement learning for vehicle pedestrian interaction and transportation safety.",
+    ),
+    make_candidate("generic", "A survey of optimizers", "We compare optimizers for deep learning."),
+]
+
+
+def test_embedding_ranker_prefers_profile_matches_and_penalizes_excludes() -> None:
+    ranker = EmbeddingRanker(
+        research_field="vehicle pedestrian interaction and safety",
+        include_keywords=["trajectory prediction", "reinforcement learning"],
+        exclude_keywords=["medical imaging", "protein"],
+    )
+
+    ranked = ranker.rank(CANDIDATES)
+
+    assert ranked[0][0].external_id == "traffic"
+    assert ranked[-1][0].external_id == "protein"
+    assert ranked[0][1] > 0
+    assert "similarity=" in ranked[0][2]
+
+
+def test_embedding_ranker_returns_heap_selected_top_k() -> None:
+    ranker = EmbeddingRanker("pedestrian trajectory", [], [])
+
+    assert [item[0].external_id for item in ranker.rank(CANDIDATES, top_k=1)] == ["traffic"]
+
+
+def test_embedding_store_persists_vectors_and_recovers_partial_appends(tmp_path: Path) -> None:
+    embedder = HashingEmbedder(dim=64)
+    store = EmbeddingStore(tmp_path / "cache.sqlite3.vectors.f32", dim=64)
+    EmbeddingRanker("pedestrian", [], [], embedder=embedder, store=store).rank(CANDIDATES)
+    with store.path.open("ab") as handle:
+        handle.write(b"\x00" * 10)
+
+    reopened = EmbeddingStore(store.path, dim=64)
+
+    assert reopened.ids == ["protein", "traffic", "generic"]
+    assert len(reopened.matrix) == 3 * 64
+    assert reopened.get("traffic") == embedder.embed(f"{CANDIDATES[1].title} {CANDIDATES[1].abstract}")
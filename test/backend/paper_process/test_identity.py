@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from backend.paper_process.identity import (
+    arxiv_identifier,
+    build_identifiers,
+    collapse_by_identity,
+    doi_identifier,
+)
+from backend.paper_process.paper import PaperCandidate
+from backend.paper_process.paper_cache import SQLiteCache
+
+
+def make_candidate(source: str, external_id: str, identifiers: list[str]) -> PaperCandidate:
+    now = datetime.now(timezone.utc)
+    return PaperCandidate(
+        source=source,
+        external_id=external_id,
+        title=f"Title {external_id}",
+        abstract="abstract",
+        authors=["A. Author"],
+        affiliations=[],
+        published_at=now,
+        updated_at=now,
+        arxiv_url="",
+        pdf_url="",
+        code_urls=[],
+        categories=[],
+        identifiers=identifiers,
+    )
+
+
+def test_identifiers_are_normalized() -> None:
+    assert doi_identifier("https://doi.org/10.1109/TITS.2026.12345.") == "doi:10.1109/tits.2026.12345"
+    assert doi_identifier("not a doi") is None
+    assert arxiv_identifier("http://arxiv.org/abs/2501.01234v3") == "arxiv:2501.01234"
+    assert arxiv_identifier("hep-th/9901001v2") == "arxiv:hep-th/9901001"
+    assert build_identifiers(doi_identifier("10.48550/arXiv.2501.01234"), None) == [
+        "doi:10.48550/arxiv.2501.01234",
+        "arxiv:2501.01234",
+    ]
+
+
+def test_collapse_by_identity_merges_batch_aliases_and_skips_history() -> None:
+    arxiv = make_candidate("arxiv", "2501.01234v1", ["arxiv:2501.01234", "doi:10.1/x"])
+    scopus = make_candidate("scopus", "85000001", ["doi:10.1/x", "scopus:85000001"])
+    revised = make_candidate("arxiv", "2401.00001v2", ["arxiv:2401.00001"])
+
+    kept = collapse_by_identity([arxiv, scopus, revised], known={"arxiv:2401.00001": "2401.00001v1"})
+
+    assert kept == [arxiv]
+    assert "scopus:85000001" in arxiv.identifiers
+
+
+def test_cache_maps_identifiers_to_first_paper_key(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    cache.record_identities("2501.01234v1", ["arxiv:2501.01234", "doi:10.1/x"])
+    cache.record_identities("85000001", ["doi:10.1/x", "scopus:85000001"])
+
+    assert cache.fetch_identity_keys(["doi:10.1/x", "scopus:85000001", "missing"]) == {
+        "doi:10.1/x": "2501.01234v1",
+        "scopus:85000001": "85000001",
+    }
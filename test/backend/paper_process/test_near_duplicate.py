@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from backend.paper_process.near_duplicate import NearDuplicateDetector
+from backend.paper_process.paper import PaperCandidate
+from backend.paper_process.paper_cache import SQLiteCache
+
+ABSTRACT = (
+    "We study vehicle pedestrian interaction at unsignalized crossings and propose a reinforcement "
+    "learning planner that anticipates pedestrian intent from trajectory history. Experiments on two "
+    "naturalistic driving datasets show fewer conflicts and smoother yielding than rule based baselines."
+)
+
+
+def make_candidate(external_id: str, title: str, abstract: str = ABSTRACT, source: str = "arxiv") -> PaperCandidate:
+    now = datetime.now(timezone.utc)
+    return PaperCandidate(
+        source=source,
+        external_id=external_id,
+        title=title,
+        abstract=abstract,
+        authors=["A. Author"],
+        affiliations=[],
+        published_at=now,
+        updated_at=now,
+        arxiv_url=f"https://example.org/{external_id}",
+        pdf_url=f"https://example.org/{external_id}.pdf",
+        code_urls=[],
+        categories=["cs.AI"],
+    )
+
+
+def _detector(tmp_path: Path) -> NearDuplicateDetector:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    return NearDuplicateDetector(cache)
+
+
+def test_near_duplicates_are_dropped_within_a_batch(tmp_path: Path) -> None:
+    detector = _detector(tmp_path)
+    candidates = [
+        make_candidate("2501.00001", "Intent-Aware Planning for Pedestrian Crossings"),
+        make_candidate("SCOPUS-1", "Intent aware planning for pedestrian crossings (extended)", source="scopus"),
+        make_candidate("2501.00002", "Graph Transformers for Traffic Forecasting", abstract="Unrelated forecasting work."),
+    ]
+
+    kept = detector.filter(candidates)
+
+    assert [item.external_id for item in kept] == ["2501.00001", "2501.00002"]
+
+
+def test_near_duplicates_of_cached_history_are_dropped(tmp_path: Path) -> None:
+    detector = _detector(tmp_path)
+    original = make_candidate("2501.00001", "Intent-Aware Planning for Pedestrian Crossings")
+    detector.remember(detector.filter([original]))
+
+    retitled = make_candidate("2501.00001v2-alias", "Anticipating Pedestrian Intent for Safer Crossings")
+    fresh_detector = NearDuplicateDetector(detector.cache)
+
+    assert fresh_detector.filter([retitled]) == []
+    assert fresh_detector.filter([make_candidate("other", "Other", abstract="Protein folding at scale.")])
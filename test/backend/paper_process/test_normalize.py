@@ -2,7 +2,13 @@ from datetime import datetime, timezone
 
 
 from backend.paper_process.paper import PaperCandidate
-from backend.paper_process.normalize import deduplicate_candidates, normalize_title
+from backend.paper_process.normalize import (
+    deduplicate_candidates,
+    normalize_text,
+    normalize_title,
+    normalize_titles,
+    title_keys,
+)
 
 
 def make_candidate(arxiv_id: str, title: str) -> PaperCandidate:
@@ -42,3 +48,24 @@ def test_deduplicate_candidates_against_history_and_batch() -> None:
     )
 
     assert [item.external_id for item in deduped] == ["2501.00003v1"]
+
+
+def test_normalize_titles_matches_single_item_path() -> None:
+    titles = ["  Graph-Learning for Traffic, Safety!!!  ", "", "---", "Σ-Nets\tand\nİnputs", "nul\x00byte", "A  b"]
+
+    assert normalize_titles(titles) == [normalize_text(title) for title in titles]
+    assert normalize_titles(titles[:4]) == [normalize_title(title) for title in titles[:4]]
+    assert normalize_titles([]) == []
+
+
+def test_title_keys_are_computed_once_and_carried_on_candidates(monkeypatch) -> None:
+    from backend.paper_process import normalize
+
+    candidates = [make_candidate("2501.00001v1", "Traffic: GNN"), make_candidate("2501.00002v1", "Signals")]
+    batches = []
+    monkeypatch.setattr(normalize, "normalize_titles", lambda titles: batches.append(titles) or ["k1", "k2"])
+
+    assert title_keys(candidates) == ["k1", "k2"]
+    assert deduplicate_candidates(candidates, set(), {"k2"}) == candidates[:1]
+    assert candidates[0].title_norm == "k1"
+    assert batches == [["Traffic: GNN", "Signals"]]
@@ -1,7 +1,19 @@
-from datetime import datetime, timezone
-
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timezone
+from itertools import groupby
+
+import pytest
+
+from backend.models.tokens import UsageLedger, UsageRecord
+from backend.paper_process import batch as batch_module
+from backend.paper_process.batch import CandidateBatch
+from backend.paper_process.binary_codec import decode_summary
 from backend.paper_process.paper import PaperCandidate, PaperSummary
-from backend.paper_process.pipeline import DailyPaperPipeline
+from backend.paper_process.paper_cache import SQLiteCache
+from backend.paper_process.pipeline import DailyPaperPipeline, DigestProfile
+from backend.paper_process.summarizer import PaperSummarizer
 
 
 class FakeSource:
@@ -31,7 +43,7 @@ class BrokenSource:
 
 
 class FakeRanker:
-    def rank(self, candidates):
+    def rank(self, candidates, top_k=None):
         return [(candidates[0], 88.0, "keyword match")]
 
 
@@ -55,6 +67,9 @@ class FakeSummarizer:
             relevance_reason=relevance_reason,
         )
 
+    def summarize_many(self, ranked):
+        return [self.summarize(candidate, score, reason) for candidate, score, reason in ranked]
+
 
 class FakeCache:
     def __init__(self):
@@ -69,13 +84,25 @@ class FakeCache:
     def fetch_seen_keys(self):
         return set(), set()
 
-    def upsert_paper(self, **kwargs):
+    def fetch_seen_keys_for(self, external_ids, title_norms):
+        return set(), set()
+
+    def upsert_papers(self, rows):
+        return None
+
+    def fetch_identity_keys(self, identifiers):
+        return {}
+
+    def record_identities(self, paper_key, identifiers):
         return None
 
     def record_digest(self, **kwargs):
         self.recorded = True
         return 1
 
+    def record_summaries(self, run_at, summaries):
+        return None
+
 
 class FakeRenderer:
     def render(self, run_date, summaries):
@@ -163,3 +190,375 @@ def test_pipeline_runs_normally_when_require_llm_false_and_llm_disabled():
     assert result.summary_count == 0
     assert result.output_path is None
     assert result.skipped_reason == "Source fetch failed: arxiv fetch timeout"
+
+
+class FailingRanker:
+    def rank(self, candidates, top_k=None):
+        raise RuntimeError("ranking failed")
+
+
+class UsageFailingCache(FakeCache):
+    def record_llm_usage(self, run_at, records):
+        raise OSError("database is locked")
+
+
+def test_usage_recording_failure_does_not_mask_pipeline_error(capsys):
+    ledger = UsageLedger()
+    ledger.record(UsageRecord("rank", "m", "https://a", 100, 20, 90))
+    pipeline = DailyPaperPipeline(
+        source=FakeSource(),
+        ranker=FailingRanker(),
+        summarizer=FakeSummarizer(),
+        cache=UsageFailingCache(),
+        renderer=FakeRenderer(),
+        writer=FakeWriter(),
+        top_k=10,
+        min_interval_hours=48,
+        usage_ledger=ledger,
+    )
+
+    with pytest.raises(RuntimeError, match="ranking failed"):
+        pipeline.run(now=datetime(2026, 2, 6, tzinfo=timezone.utc))
+    assert "Recording LLM usage failed: database is locked" in capsys.readouterr().out
+
+
+class MultiSource:
+    def search_recent(self):
+        now = datetime.now(timezone.utc)
+        return [
+            PaperCandidate(
+                source="arxiv",
+                external_id=f"id-{index}",
+                title=f"Paper {index}",
+                abstract="abstract",
+                authors=[],
+                affiliations=[],
+                published_at=now,
+                updated_at=now,
+                arxiv_url=f"https://arxiv.org/abs/id-{index}",
+                pdf_url=f"https://arxiv.org/pdf/id-{index}.pdf",
+                code_urls=[],
+                categories=["cs.AI"],
+            )
+            for index in range(4)
+        ]
+
+
+class OrderRanker:
+    def __init__(self, order):
+        self.order = order
+
+    def rank(self, candidates, top_k=None):
+        by_id = {item.external_id: item for item in candidates}
+        return [(by_id[key], 90.0 - index, f"rank {index}") for index, key in enumerate(self.order)][:top_k]
+
+
+class CountingSummarizer(FakeSummarizer):
+    def __init__(self):
+        self.summarized = []
+
+    def summarize_many(self, ranked):
+        self.summarized.extend(candidate.external_id for candidate, _, _ in ranked)
+        return super().summarize_many(ranked)
+
+
+class CapturingRenderer:
+    def __init__(self):
+        self.rendered = []
+
+    def render(self, run_date, summaries):
+        self.rendered.append([(item.external_id, item.relevance_score) for item in summaries])
+        return "ok"
+
+
+class NamedWriter:
+    def write(self, run_date, text, name=None):
+        return f"newspaper/0206_papers_{name}.md"
+
+
+def test_pipeline_writes_one_digest_per_profile_and_summarizes_overlap_once():
+    cache = FakeCache()
+    summarizer = CountingSummarizer()
+    renderer = CapturingRenderer()
+    pipeline = DailyPaperPipeline(
+        source=MultiSource(),
+        ranker=FakeRanker(),
+        summarizer=summarizer,
+        cache=cache,
+        renderer=renderer,
+        writer=NamedWriter(),
+        top_k=2,
+        min_interval_hours=48,
+        profiles=[
+            DigestProfile("safety", OrderRanker(["id-0", "id-1", "id-2"])),
+            DigestProfile("planning", OrderRanker(["id-1", "id-3", "id-0"]), top_k=3),
+        ],
+    )
+
+    result = pipeline.run(now=datetime(2026, 2, 6, tzinfo=timezone.utc))
+
+    assert result.generated is True
+    assert result.profile_outputs == {
+        "safety": "newspaper/0206_papers_safety.md",
+        "planning": "newspaper/0206_papers_planning.md",
+    }
+    assert sorted(summarizer.summarized) == ["id-0", "id-1", "id-3"]
+    assert renderer.rendered == [
+        [("id-0", 90.0), ("id-1", 89.0)],
+        [("id-1", 90.0), ("id-3", 89.0), ("id-0", 88.0)],
+    ]
+    assert result.emitted_ids == ["id-0", "id-1", "id-3"]
+
+
+class ConcurrencyRanker(OrderRanker):
+    def __init__(self, order, tracker):
+        super().__init__(order)
+        self.tracker = tracker
+
+    def rank(self, candidates, top_k=None):
+        with self.tracker["lock"]:
+            self.tracker["active"] += 1
+            self.tracker["peak"] = max(self.tracker["peak"], self.tracker["active"])
+        time.sleep(0.02)
+        with self.tracker["lock"]:
+            self.tracker["active"] -= 1
+        return super().rank(candidates, top_k)
+
+
+def test_profiles_are_ranked_one_at_a_time():
+    tracker = {"lock": threading.Lock(), "active": 0, "peak": 0}
+    pipeline = DailyPaperPipeline(
+        source=MultiSource(),
+        ranker=FakeRanker(),
+        summarizer=FakeSummarizer(),
+        cache=FakeCache(),
+        renderer=FakeRenderer(),
+        writer=NamedWriter(),
+        top_k=2,
+        min_interval_hours=48,
+        profiles=[DigestProfile(f"p{index}", ConcurrencyRanker(["id-0"], tracker)) for index in range(3)],
+    )
+
+    assert pipeline.run(now=datetime(2026, 2, 6, tzinfo=timezone.utc)).generated is True
+    assert tracker["peak"] == 1
+
+
+class RangeSource:
+    def __init__(self, days):
+        self.days = days
+        self.pulled = 0
+
+    def search_recent(self):
+        raise AssertionError("backfill must not use search_recent")
+
+    def search_range(self, start, end):
+        for day in sorted(self.days, reverse=True):
+            for index in range(2):
+                self.pulled += 1
+                published = datetime(2026, 1, day, 12 - index, tzinfo=timezone.utc)
+                yield PaperCandidate(
+                    source="arxiv",
+                    external_id=f"2601.{day:02d}{index}",
+                    title=f"Paper {day}-{index}",
+                    abstract="abstract",
+                    authors=[],
+                    affiliations=[],
+                    published_at=published,
+                    updated_at=published,
+                    arxiv_url="",
+                    pdf_url="",
+                    code_urls=[],
+                    categories=["cs.AI"],
+                )
+
+
+class RecordingCache(FakeCache):
+    def __init__(self):
+        super().__init__()
+        self.first_seen = {}
+        self.digests = []
+
+    def upsert_papers(self, rows):
+        for row in rows:
+            self.first_seen[row["external_id"]] = row["first_seen_at"]
+
+    def record_digest(self, **kwargs):
+        self.digests.append((kwargs["run_at"].date().isoformat(), kwargs["items"]))
+        return len(self.digests)
+
+
+class DatedWriter:
+    def write(self, run_date, text, name=None):
+        return f"newspaper/{run_date.strftime('%m%d')}_papers.md"
+
+
+def test_backfill_streams_one_digest_per_day_newest_first():
+    source = RangeSource(days=[3, 4, 5, 6, 7])
+    cache = RecordingCache()
+    pipeline = DailyPaperPipeline(
+        source=source,
+        ranker=FakeRanker(),
+        summarizer=FakeSummarizer(),
+        cache=cache,
+        renderer=FakeRenderer(),
+        writer=DatedWriter(),
+        top_k=5,
+        min_interval_hours=48,
+    )
+
+    results = pipeline.backfill(date(2026, 1, 4), date(2026, 1, 6), workers=1)
+    first_day, first = next(results)
+    pulled_at_first_result = source.pulled
+    rest = list(results)
+
+    assert first_day == date(2026, 1, 6)
+    assert pulled_at_first_result < 10
+    assert [day for day, _ in rest] == [date(2026, 1, 5), date(2026, 1, 4)]
+    assert [result.output_path for _, result in [(first_day, first), *rest]] == [
+        "newspaper/0106_papers.md",
+        "newspaper/0105_papers.md",
+        "newspaper/0104_papers.md",
+    ]
+    assert sorted(cache.digests) == [
+        ("2026-01-04", ["2601.040"]),
+        ("2026-01-05", ["2601.050"]),
+        ("2026-01-06", ["2601.060"]),
+    ]
+    assert cache.first_seen["2601.051"] == "2026-01-05T00:00:00+00:00"
+    assert "2601.070" not in cache.first_seen
+
+
+class BatchRanker:
+    def __init__(self):
+        self.batches = []
+
+    def rank(self, candidates, top_k=None):
+        raise AssertionError("backfill should rank the day's batch")
+
+    def rank_batch(self, batch, top_k=None):
+        self.batches.append(list(batch.external_ids))
+        return [(batch[0], 88.0, "keyword match")]
+
+
+class SeenCache(RecordingCache):
+    def __init__(self, seen_ids, seen_titles):
+        super().__init__()
+        self.seen = (seen_ids, seen_titles)
+        self.title_norms = {}
+
+    def fetch_seen_keys_for(self, external_ids, title_norms):
+        return self.seen
+
+    def upsert_papers(self, rows):
+        rows = list(rows)
+        super().upsert_papers(rows)
+        self.title_norms.update((row["external_id"], row["title_norm"]) for row in rows)
+
+
+def test_backfill_dedups_and_ranks_each_day_as_a_batch():
+    ranker = BatchRanker()
+    cache = SeenCache(seen_ids={"2601.060"}, seen_titles={"paper 5 1"})
+    pipeline = DailyPaperPipeline(
+        source=RangeSource(days=[5, 6]),
+        ranker=ranker,
+        summarizer=FakeSummarizer(),
+        cache=cache,
+        renderer=FakeRenderer(),
+        writer=DatedWriter(),
+        top_k=5,
+        min_interval_hours=48,
+    )
+
+    results = list(pipeline.backfill(date(2026, 1, 5), date(2026, 1, 6), workers=1))
+
+    assert [result.generated for _, result in results] == [True, True]
+    assert ranker.batches == [["2601.061"], ["2601.050"]]
+    assert cache.title_norms == {"2601.061": "paper 6 1", "2601.050": "paper 5 0"}
+
+
+class BatchRangeSource:
+    def __init__(self, days):
+        self.rows = RangeSource(days)
+
+    def search_recent(self):
+        raise AssertionError("backfill must not use search_recent")
+
+    def search_range_batches(self, start, end):
+        for _, group in groupby(self.rows.search_range(start, end), key=lambda item: item.published_at.date()):
+            yield CandidateBatch.from_candidates(group)
+
+
+def test_backfill_materializes_only_rows_that_survive_dedup(monkeypatch):
+    built = []
+
+    def counting_candidate(**fields):
+        built.append(fields["external_id"])
+        return PaperCandidate(**fields)
+
+    monkeypatch.setattr(batch_module, "PaperCandidate", counting_candidate)
+    ranker = BatchRanker()
+    pipeline = DailyPaperPipeline(
+        source=BatchRangeSource(days=[4, 5, 6]),
+        ranker=ranker,
+        summarizer=FakeSummarizer(),
+        cache=SeenCache(seen_ids={"2601.060", "2601.061", "2601.050"}, seen_titles=set()),
+        renderer=FakeRenderer(),
+        writer=DatedWriter(),
+        top_k=5,
+        min_interval_hours=48,
+    )
+
+    results = list(pipeline.backfill(date(2026, 1, 5), date(2026, 1, 6), workers=1))
+
+    assert [(day, result.generated) for day, result in results] == [
+        (date(2026, 1, 6), False),
+        (date(2026, 1, 5), True),
+    ]
+    assert ranker.batches == [["2601.051"]]
+    # One build at ingest and one for the ranker's pick; day 4 is outside the range.
+    assert built == ["2601.051", "2601.051"]
+
+
+class MalformedSummaryLLM:
+    enabled = True
+
+    def chat_json(self, model, system_prompt, user_prompt, temperature=0.1, on_partial=None):
+        return {
+            "title": None,
+            "authors": None,
+            "affiliations": None,
+            "code_urls": "https://github.com/example/code",
+            "problem": "Problem.",
+            "approach": "Approach.",
+            "methodological_novelty": None,
+            "tell_someone_in_4_5_sentences": "One sentence only.",
+        }
+
+
+def test_digest_stores_summaries_with_null_or_string_list_fields(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    renderer = CapturingRenderer()
+    candidate = FakeSource().search_recent()[0]
+    pipeline = DailyPaperPipeline(
+        source=FakeSource(),
+        ranker=FakeRanker(),
+        summarizer=PaperSummarizer(model_name="m", system_prompt="s", llm_client=MalformedSummaryLLM()),
+        cache=cache,
+        renderer=renderer,
+        writer=FakeWriter(),
+        top_k=10,
+        min_interval_hours=48,
+    )
+
+    result = pipeline._digest([candidate], datetime(2026, 2, 6, tzinfo=timezone.utc))
+
+    assert result.generated is True
+    with sqlite3.connect(cache.db_path) as conn:
+        (payload,) = conn.execute("SELECT payload FROM paper_summaries").fetchone()
+    summary = decode_summary(payload)
+    assert summary.title == candidate.title
+    assert summary.authors == candidate.authors
+    assert summary.affiliations == [] and summary.code_urls == []
+    assert summary.methodological_novelty == ""
+    assert len(summary.tell_someone_in_4_5_sentences) == 4
@@ -110,3 +110,96 @@ def test_summarizer_uses_configured_user_prompt_template() -> None:
     decoded = json.loads(payload)
     assert decoded["external_id"] == "2501.00001v1"
     assert decoded["title"] == "Traffic Forecasting with Graph Networks"
+
+
+def test_ranker_splits_batches_to_fit_prompt_budget_and_refuses_oversized() -> None:
+    class BatchLLM(CaptureLLM):
+        def chat_json(self, model, system_prompt, user_prompt, temperature=0.1):
+            super().chat_json(model, system_prompt, user_prompt, temperature)
+            payload = json.loads(user_prompt.split("CANDIDATES=", maxsplit=1)[1])
+            return {
+                "items": [
+                    {"external_id": item["external_id"], "relevance_score": 70, "relevance_reason": "llm"}
+                    for item in payload
+                ]
+            }
+
+    candidates = []
+    for index in range(6):
+        candidate = _candidate()
+        candidate.external_id = f"id-{index}"
+        candidates.append(candidate)
+    candidates[5].abstract = "traffic " * 2000
+
+    llm = BatchLLM(response={})
+    ranker = RelevanceRanker(
+        research_field="Traffic engineering",
+        include_keywords=[],
+        exclude_keywords=[],
+        model_name="glm-4.7",
+        system_prompt="ranker-system",
+        user_prompt_template="CANDIDATES={candidates_json}",
+        llm_client=llm,
+        max_prompt_tokens=120,
+    )
+
+    ranked = ranker.rank(candidates)
+
+    assert len(llm.calls) > 1
+    assert all("id-5" not in call["user_prompt"] for call in llm.calls)
+    reasons = {item[0].external_id: item[2] for item in ranked}
+    assert set(reasons) == {f"id-{index}" for index in range(6)}
+    assert reasons["id-5"].startswith("Heuristic rank")
+
+
+def test_summarizer_batches_papers_and_splits_on_malformed_response() -> None:
+    summary_fields = {
+        "problem": "p",
+        "approach": "a",
+        "methodological_novelty": "m",
+        "empirical_novelty": "e",
+        "tell_someone_in_4_5_sentences": ["1", "2", "3", "4"],
+    }
+
+    class BatchLLM(CaptureLLM):
+        def chat_json(self, model, system_prompt, user_prompt, temperature=0.1):
+            super().chat_json(model, system_prompt, user_prompt, temperature)
+            if user_prompt.startswith("BATCH="):
+                papers = json.loads(user_prompt.split("BATCH=", maxsplit=1)[1])
+                if len(papers) > 2:
+                    raise ValueError("truncated JSON")
+                return {"items": [{"external_id": item["external_id"], **summary_fields} for item in papers]}
+            return {"title": "single", **summary_fields}
+
+    candidates = []
+    for index in range(5):
+        candidate = _candidate()
+        candidate.external_id = f"id-{index}"
+        candidates.append(candidate)
+
+    llm = BatchLLM(response={})
+    summarizer = PaperSummarizer(
+        model_name="glm-4.7",
+        system_prompt="summarizer-system",
+        user_prompt_template="SINGLE={paper_json}",
+        llm_client=llm,
+        batch_size=4,
+        batch_user_prompt_template="BATCH={papers_json}",
+    )
+
+    summaries = summarizer.summarize_many([(item, 80.0, "match") for item in candidates])
+
+    assert [item.external_id for item in summaries] == [f"id-{index}" for index in range(5)]
+    assert all(item.problem == "p" for item in summaries)
+    prompts = [call["user_prompt"].split("=", maxsplit=1)[0] for call in llm.calls]
+    assert prompts == ["BATCH", "SINGLE", "BATCH", "BATCH"]
+
+
+def test_summarize_many_keeps_partial_single_paper_output() -> None:
+    llm = CaptureLLM(response={"title": "LLM title", "problem": "p", "tell_someone_in_4_5_sentences": ["1"]})
+    summarizer = PaperSummarizer(model_name="glm-4.7", system_prompt="summarizer-system", llm_client=llm)
+
+    summaries = summarizer.summarize_many([(_candidate(), 80.0, "match")])
+
+    assert len(llm.calls) == 1
+    assert (summaries[0].title, summaries[0].problem, summaries[0].approach) == ("LLM title", "p", "")
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from backend.paper_process.embedding import EmbeddingStore, HashingEmbedder
+from backend.paper_process.paper import PaperCandidate
+from backend.paper_process.paper_cache import SQLiteCache
+from backend.paper_process.related import IvfIndex, RelatedPaperFinder
+from backend.paper_process.retention import RetentionPolicy
+
+TOPICS = [
+    "pedestrian trajectory prediction at urban intersections with graph neural networks",
+    "reinforcement learning for adaptive traffic signal control",
+    "protein structure prediction with diffusion models",
+    "medical image segmentation using transformers",
+]
+
+
+def make_candidate(external_id: str, text: str) -> PaperCandidate:
+    now = datetime.now(timezone.utc)
+    return PaperCandidate(
+        source="arxiv",
+        external_id=external_id,
+        title=text.title(),
+        abstract=f"We study {text}. Experiments show {text} improves accuracy.",
+        authors=["A. Author"],
+        affiliations=[],
+        published_at=now,
+        updated_at=now,
+        arxiv_url=f"https://arxiv.org/abs/{external_id}",
+        pdf_url=f"https://arxiv.org/pdf/{external_id}.pdf",
+        code_urls=[],
+        categories=["cs.AI"],
+    )
+
+
+def _store_history(cache: SQLiteCache, candidates: list[PaperCandidate]) -> None:
+    for item in candidates:
+        cache.upsert_paper(
+            external_id=item.external_id,
+            source=item.source,
+            title_raw=item.title,
+            title_norm=item.title.lower(),
+            abstract_raw=item.abstract,
+            authors_json="[]",
+            affiliations_json="[]",
+            published_at=item.published_at.isoformat(),
+            updated_at=item.updated_at.isoformat(),
+            arxiv_url=item.arxiv_url,
+            pdf_url=item.pdf_url,
+            code_urls_json="[]",
+            categories_json="[]",
+            first_seen_at=item.published_at.isoformat(),
+        )
+
+
+def test_index_search_matches_exhaustive_neighbours(tmp_path: Path) -> None:
+    embedder = HashingEmbedder(dim=128)
+    store = EmbeddingStore(tmp_path / "vectors.f32", dim=128)
+    store.add_many(
+        [(f"p{index}", embedder.embed(f"{TOPICS[index % 4]} variant {index}")) for index in range(400)]
+    )
+    index = IvfIndex(tmp_path / "vectors.f32.ivf", store)
+    index.build()
+
+    reopened = IvfIndex(index.path, store)
+    query = embedder.embed(f"{TOPICS[1]} variant 5")
+    hits = reopened.search(query, k=5)
+
+    assert reopened.count == 400 and reopened.bits >= 2
+    assert {store.ids[row] for row, _ in hits} <= {f"p{index}" for index in range(1, 400, 4)}
+    assert hits[0][1] >= hits[-1][1]
+
+
+def test_finder_attaches_only_previously_digested_papers(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    history = [make_candidate(f"old{index}", topic) for index, topic in enumerate(TOPICS)]
+    _store_history(cache, history)
+    cache.record_digest(datetime(2026, 1, 1, tzinfo=timezone.utc), "old.md", "m", 7, 10, ["old0", "old2"])
+    store = EmbeddingStore(tmp_path / "cache.sqlite3.vectors.f32", dim=256)
+    finder = RelatedPaperFinder(cache, store, k=2, min_similarity=0.4)
+    finder.find_related(history)
+
+    new = make_candidate("new1", "pedestrian trajectory prediction at signalized intersections")
+    related = finder.find_related([new])
+
+    assert [item.external_id for item in related["new1"]] == ["old0"]
+    assert related["new1"][0].url == "https://arxiv.org/abs/old0"
+
+
+def test_finder_still_links_papers_whose_digests_were_archived(tmp_path: Path) -> None:
+    now = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    history = [make_candidate(f"old{index}", topic) for index, topic in enumerate(TOPICS)]
+    _store_history(cache, history)
+    cache.record_digest(now - timedelta(days=500), "old.md", "m", 7, 10, ["old0"])
+    assert RetentionPolicy(digest_days=365).apply(cache, now=now)["archived_digests"] == 1
+    store = EmbeddingStore(tmp_path / "cache.sqlite3.vectors.f32", dim=256)
+    finder = RelatedPaperFinder(cache, store, k=2, min_similarity=0.4)
+    finder.find_related(history)
+
+    related = finder.find_related([make_candidate("new1", "pedestrian trajectory prediction at signalized intersections")])
+
+    assert [item.external_id for item in related["new1"]] == ["old0"]
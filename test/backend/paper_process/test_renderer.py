@@ -1,6 +1,6 @@
 from datetime import date
 
-from backend.paper_process.paper import PaperSummary
+from backend.paper_process.paper import PaperSummary, RelatedPaper
 from backend.paper_process.renderer import render_markdown_digest
 
 
@@ -40,3 +40,9 @@ def test_render_markdown_digest_contains_required_sections() -> None:
     assert "- **Code Repository**: https://github.com/example/repo" in text
     assert "### Problem Addressed" in text
     assert "### Summary for Communication" in text
+    assert "Related Earlier Work" not in text
+
+    summary.related_papers = [RelatedPaper("2401.00002v1", "Earlier Work", "https://arxiv.org/abs/2401.00002v1", 0.61)]
+    text = render_markdown_digest(run_date=date(2026, 2, 6), summaries=[summary])
+
+    assert "- **Related Earlier Work**: [Earlier Work](https://arxiv.org/abs/2401.00002v1) (0.61)" in text
@@ -0,0 +1,109 @@
+import gzip
+import json
+import random
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from backend.paper_process.paper import PaperSummary
+from backend.paper_process.paper_cache import SQLiteCache
+from backend.paper_process.retention import RetentionPolicy
+
+
+def _upsert(cache: SQLiteCache, external_id: str, first_seen_at: datetime) -> None:
+    cache.upsert_paper(
+        external_id=external_id,
+        source="arxiv",
+        title_raw=f"Title {external_id}",
+        title_norm=f"title {external_id}",
+        abstract_raw=random.Random(external_id).randbytes(6000).hex(),
+        authors_json='["x"]',
+        affiliations_json='["lab"]',
+        published_at=first_seen_at.isoformat(),
+        updated_at=first_seen_at.isoformat(),
+        arxiv_url=f"https://arxiv.org/abs/{external_id}",
+        pdf_url=f"https://arxiv.org/pdf/{external_id}.pdf",
+        code_urls_json="[]",
+        categories_json='["cs.AI"]',
+        first_seen_at=first_seen_at.isoformat(),
+    )
+
+
+def test_retention_prunes_payloads_but_keeps_dedup_keys(tmp_path: Path) -> None:
+    now = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    for index in range(50):
+        _upsert(cache, f"old{index}", now - timedelta(days=400))
+    _upsert(cache, "fresh", now - timedelta(days=1))
+
+    stats = RetentionPolicy(paper_days=180).apply(cache, now=now)
+
+    assert stats["pruned_papers"] == 50
+    assert stats["vacuumed_pages"] > 0
+    assert cache.fetch_seen_keys_for(["old0", "fresh"], ["title old1"]) == ({"old0", "fresh"}, {"title old1"})
+    with sqlite3.connect(cache.db_path) as conn:
+        abstracts = dict(conn.execute("SELECT external_id, abstract_raw FROM papers").fetchall())
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert abstracts["old0"] == ""
+    assert abstracts["fresh"] != ""
+    assert RetentionPolicy(paper_days=180).apply(cache, now=now)["pruned_papers"] == 0
+
+
+def _summary(external_id: str) -> PaperSummary:
+    return PaperSummary(
+        external_id=external_id,
+        source="arxiv",
+        title=f"Title {external_id}",
+        authors=["x"],
+        affiliations=[],
+        arxiv_url=f"https://arxiv.org/abs/{external_id}",
+        pdf_url=f"https://arxiv.org/pdf/{external_id}.pdf",
+        code_urls=[],
+        problem="p",
+        approach="a",
+        methodological_novelty="m",
+        empirical_novelty="e",
+        tell_someone_in_4_5_sentences=["1", "2", "3", "4"],
+        relevance_score=50.0,
+        relevance_reason="r",
+    )
+
+
+def test_retention_prunes_old_summaries(tmp_path: Path) -> None:
+    now = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    cache.record_summaries(now - timedelta(days=400), [_summary("old")])
+    cache.record_summaries(now - timedelta(days=1), [_summary("fresh")])
+
+    RetentionPolicy(paper_days=180).apply(cache, now=now)
+
+    with sqlite3.connect(cache.db_path) as conn:
+        assert conn.execute("SELECT external_id FROM paper_summaries").fetchall() == [("fresh",)]
+
+
+def test_retention_archives_old_digests(tmp_path: Path) -> None:
+    now = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    cache.record_digest(now - timedelta(days=500), "old.md", "m", 7, 10, ["a", "b"])
+    cache.record_digest(now - timedelta(days=2), "new.md", "m", 7, 10, ["c"])
+
+    stats = RetentionPolicy(digest_days=365).apply(cache, now=now)
+
+    assert stats["archived_digests"] == 1
+    with gzip.open(cache.digest_archive_path, "rt", encoding="utf-8") as handle:
+        archived = [json.loads(line) for line in handle]
+    assert [(item["output_path"], item["items"]) for item in archived] == [("old.md", ["a", "b"])]
+    assert cache.delete_last_digest() == "new.md"
+    assert cache.delete_last_digest() is None
+
+
+def test_disabled_retention_is_a_no_op(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+
+    stats = RetentionPolicy().apply(cache, now=datetime(2026, 6, 1, tzinfo=timezone.utc))
+
+    assert stats == {"pruned_papers": 0, "archived_digests": 0, "vacuumed_pages": 0}
@@ -0,0 +1,14 @@
+import random
+
+from backend.paper_process.selection import select_top_k
+
+
+def test_select_top_k_matches_stable_sort_prefix() -> None:
+    rng = random.Random(7)
+    scored = [(f"id-{index}", float(rng.randint(0, 5)), "") for index in range(200)]
+    expected = sorted(scored, key=lambda item: item[1], reverse=True)
+
+    assert select_top_k(scored, 10) == expected[:10]
+    assert select_top_k(scored, None) == expected
+    assert select_top_k(scored, 500) == expected
+    assert select_top_k(scored, 0) == []
@@ -0,0 +1,61 @@
+import sqlite3
+from pathlib import Path
+
+from backend.paper_process.paper_cache import DICTIONARY_TRAINING_MIN_PAPERS, SQLiteCache
+from backend.paper_process.text_codec import TextCodec, train_dictionary
+
+ABSTRACT = (
+    "We propose a reinforcement learning framework for pedestrian trajectory prediction at "
+    "unsignalized intersections and evaluate it on naturalistic driving data. "
+)
+
+
+def test_codec_round_trips_and_keeps_short_values_as_text() -> None:
+    dictionary = train_dictionary([ABSTRACT * 3, ABSTRACT + "with a transformer backbone"])
+    codec = TextCodec({1: dictionary}, dict_id=1)
+
+    encoded = codec.encode(ABSTRACT)
+
+    assert isinstance(encoded, bytes)
+    assert len(encoded) < len(TextCodec().encode(ABSTRACT))
+    assert codec.decode(encoded) == ABSTRACT
+    assert codec.encode("[]") == "[]"
+    assert codec.decode("legacy text") == "legacy text"
+
+
+def _paper(index: int) -> dict[str, str]:
+    return {
+        "external_id": f"2501.{index:05d}v1",
+        "source": "arxiv",
+        "title_raw": f"Paper {index}",
+        "title_norm": f"paper {index}",
+        "abstract_raw": f"{ABSTRACT} Variant {index}.",
+        "authors_json": '["Alice Example", "Bob Example", "Carol Example", "Dan Example"]',
+        "affiliations_json": "[]",
+        "published_at": "2026-02-05T00:00:00+00:00",
+        "updated_at": "2026-02-05T00:00:00+00:00",
+        "arxiv_url": f"https://arxiv.org/abs/2501.{index:05d}v1",
+        "pdf_url": f"https://arxiv.org/pdf/2501.{index:05d}v1.pdf",
+        "code_urls_json": "[]",
+        "categories_json": '["cs.AI"]',
+        "first_seen_at": "2026-02-06T00:00:00+00:00",
+    }
+
+
+def test_plain_text_rows_are_migrated_when_dictionary_is_trained(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite3")
+    cache.init_db()
+    columns = list(_paper(0))
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.executemany(
+            f"INSERT INTO papers ({','.join(columns)}) VALUES ({','.join('?' for _ in columns)})",
+            [list(_paper(index).values()) for index in range(DICTIONARY_TRAINING_MIN_PAPERS)],
+        )
+
+    SQLiteCache(cache.db_path).init_db()
+
+    with sqlite3.connect(cache.db_path) as conn:
+        types = {row[0] for row in conn.execute("SELECT typeof(abstract_raw) FROM papers")}
+        assert conn.execute("SELECT COUNT(*) FROM text_dictionaries").fetchone()[0] == 1
+    assert types == {"blob"}
+    assert SQLiteCache(cache.db_path).fetch_paper("2501.00007v1") == _paper(7)
@@ -0,0 +1,63 @@
+from datetime import date
+
+from backend.sources import arxiv
+from backend.sources.arxiv import ArxivSource
+
+
+def _feed(entries: list[str]) -> str:
+    body = "".join(
+        f"""
+        <entry>
+          <id>http://arxiv.org/abs/{external_id}</id>
+          <title>Paper {external_id}</title>
+          <summary>Abstract {external_id}</summary>
+          <published>2026-01-0{external_id[-1]}T10:00:00Z</published>
+          <updated>2026-01-0{external_id[-1]}T10:00:00Z</updated>
+          <author><name>A. Author</name></author>
+        </entry>
+        """
+        for external_id in entries
+    )
+    return f'<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">{body}</feed>'
+
+
+def test_search_range_pages_until_short_page(monkeypatch) -> None:
+    pages = {0: ["2601.00005", "2601.00004"], 2: ["2601.00003", "2601.00002"], 4: ["2601.00001"]}
+    requests = []
+    pauses = []
+
+    def fake_fetch(self, query=None, offset=0, limit=None):
+        requests.append((query, offset, limit))
+        return _feed(pages[offset])
+
+    monkeypatch.setattr(ArxivSource, "_fetch_atom_feed", fake_fetch)
+    monkeypatch.setattr(arxiv.time, "sleep", pauses.append)
+    source = ArxivSource("traffic", ["pedestrian"], [], ["cs.AI"], max_results=100, window_days=7, page_size=2)
+
+    stream = source.search_range(date(2026, 1, 1), date(2026, 1, 5))
+    assert next(stream).external_id == "2601.00005"
+    assert len(requests) == 1
+
+    assert [item.external_id for item in stream] == ["2601.00004", "2601.00003", "2601.00002", "2601.00001"]
+    assert [offset for _, offset, _ in requests] == [0, 2, 4]
+    assert all("submittedDate:[202601010000 TO 202601052359]" in query for query, _, _ in requests)
+    assert pauses == [arxiv.PAGE_PAUSE_SECONDS] * 2
+
+
+
+def test_search_range_batches_group_the_range_stream_by_day(monkeypatch) -> None:
+    # Day 5 spans the first two pages.
+    pages = {0: ["2601.00015", "2601.00005"], 2: ["2601.00025", "2601.00004"], 4: []}
+
+    def fake_fetch(self, query=None, offset=0, limit=None):
+        return _feed(pages[offset])
+
+    monkeypatch.setattr(ArxivSource, "_fetch_atom_feed", fake_fetch)
+    monkeypatch.setattr(arxiv.time, "sleep", lambda seconds: None)
+    source = ArxivSource("traffic", ["pedestrian"], [], ["cs.AI"], max_results=100, window_days=7, page_size=2)
+
+    batches = list(source.search_range_batches(date(2026, 1, 4), date(2026, 1, 5)))
+    papers = list(source.search_range(date(2026, 1, 4), date(2026, 1, 5)))
+
+    assert [batch.external_ids for batch in batches] == [["2601.00015", "2601.00005", "2601.00025"], ["2601.00004"]]
+    assert [paper for batch in batches for paper in batch] == papers
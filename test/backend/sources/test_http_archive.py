@@ -0,0 +1,116 @@
+import json
+import zipfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+import backend.sources.ieee as ieee_source
+from backend.sources import http_archive
+from backend.sources.http_archive import ArchiveMiss, HttpArchive, archive_key, strip_secrets
+from backend.sources.ieee import IeeeXploreSource
+
+
+class _FakeResponse:
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def read(self) -> bytes:
+        return json.dumps(self._payload).encode("utf-8")
+
+
+def _build_source(api_key: str, archive: HttpArchive, window_days: int = 3650) -> IeeeXploreSource:
+    return IeeeXploreSource(
+        research_field="Traffic engineering",
+        include_keywords=["intelligent transportation"],
+        exclude_keywords=[],
+        max_results=20,
+        window_days=window_days,
+        api_key=api_key,
+        http_archive=archive,
+    )
+
+
+def test_strip_secrets_drops_api_keys_from_archive_key() -> None:
+    assert "apikey" not in strip_secrets("https://x.test/api?apikey=secret&format=json")
+    assert archive_key("https://x.test/api?apikey=a&format=json") == archive_key(
+        "https://x.test/api?format=json&apikey=b"
+    )
+
+
+def test_recorded_ieee_responses_replay_offline(monkeypatch, tmp_path: Path) -> None:
+    archive_path = tmp_path / "http_archive.zip"
+    payload = {
+        "articles": [
+            {
+                "article_number": "1",
+                "title": "Recorded IEEE Paper",
+                "abstract": "a",
+                "publication_date": "1 January 2026",
+                "authors": {"authors": [{"full_name": "A"}]},
+            }
+        ]
+    }
+    monkeypatch.setattr(ieee_source, "urlopen", lambda url, timeout: _FakeResponse(payload))
+    recorded = _build_source("live-key", HttpArchive(archive_path, mode="record")).search_recent()
+
+    def offline_urlopen(url, timeout):
+        raise AssertionError("replay must not touch the network")
+
+    monkeypatch.setattr(ieee_source, "urlopen", offline_urlopen)
+    replayed = _build_source("other-key", HttpArchive(archive_path, mode="replay")).search_recent()
+
+    assert [item.title for item in replayed] == [item.title for item in recorded] == ["Recorded IEEE Paper"]
+    with zipfile.ZipFile(archive_path) as archive:
+        assert not any(b"live-key" in archive.read(name) for name in archive.namelist())
+
+
+def test_replay_raises_for_unrecorded_url(tmp_path: Path) -> None:
+    archive = HttpArchive(tmp_path / "missing.zip", mode="replay")
+
+    with pytest.raises(ArchiveMiss):
+        archive.fetch("https://x.test/unknown", lambda: b"")
+
+
+def test_replay_filters_the_window_at_recording_time(monkeypatch, tmp_path: Path) -> None:
+    archive_path = tmp_path / "http_archive.zip"
+    payload = {
+        "articles": [
+            {
+                "article_number": "1",
+                "title": "Recorded IEEE Paper",
+                "abstract": "a",
+                "publication_date": "1 January 2026",
+                "authors": {"authors": [{"full_name": "A"}]},
+            }
+        ]
+    }
+    recorded_at = datetime(2026, 1, 3, tzinfo=timezone.utc)
+    monkeypatch.setattr(ieee_source, "urlopen", lambda url, timeout: _FakeResponse(payload))
+    monkeypatch.setattr(http_archive, "_utc_now", lambda: recorded_at)
+    recorded = _build_source("live-key", HttpArchive(archive_path, mode="record"), window_days=7).search_recent()
+
+    # Months later, the paper is far outside a 7-day window of the current clock.
+    monkeypatch.setattr(http_archive, "_utc_now", lambda: recorded_at + timedelta(days=200))
+    replay = HttpArchive(archive_path, mode="replay")
+    replayed = _build_source("other-key", replay, window_days=7).search_recent()
+
+    assert replay.now() == recorded_at
+    assert [item.title for item in replayed] == [item.title for item in recorded] == ["Recorded IEEE Paper"]
+
+
+def test_record_mode_keeps_the_previous_archive_as_backup(tmp_path: Path) -> None:
+    archive_path = tmp_path / "http_archive.zip"
+    HttpArchive(archive_path, mode="record").fetch("https://x.test/a", lambda: b"first")
+
+    HttpArchive(archive_path, mode="record").fetch("https://x.test/b", lambda: b"second")
+
+    assert HttpArchive(archive_path.with_name("http_archive.zip.bak")).fetch("https://x.test/a", lambda: b"") == b"first"
+    with pytest.raises(ArchiveMiss):
+        HttpArchive(archive_path).fetch("https://x.test/a", lambda: b"")
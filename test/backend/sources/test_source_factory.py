@@ -1,7 +1,8 @@
 import os
 from types import SimpleNamespace
 
-from backend.app import _build_source
+from backend.app import _build_source, _fetch_query
+from backend.config.paper_config import QueryConfig
 
 
 class DummyRuntime(SimpleNamespace):
@@ -89,3 +90,24 @@ def test_build_source_includes_ssrn_without_api_key() -> None:
     assert len(source.sources) == 2
     ssrn_source = [item for item in source.sources if item.__class__.__name__ == "SsrnSource"][0]
     assert ssrn_source.ssrn_backend == "html"
+
+
+def test_fetch_query_covers_every_profile() -> None:
+    def profile(include, exclude, categories):
+        return SimpleNamespace(
+            query=QueryConfig("field", include_keywords=include, exclude_keywords=exclude, categories=categories)
+        )
+
+    config = SimpleNamespace(
+        query=QueryConfig("Traffic engineering"),
+        profiles=[
+            profile(["pedestrian safety"], ["protein", "astronomy"], ["cs.AI"]),
+            profile(["motion planning", "pedestrian safety"], ["astronomy"], ["cs.RO", "cs.AI"]),
+        ],
+    )
+
+    query = _fetch_query(config)
+
+    assert query.include_keywords == ["pedestrian safety", "motion planning"]
+    assert query.exclude_keywords == ["astronomy"]
+    assert query.categories == ["cs.AI", "cs.RO"]
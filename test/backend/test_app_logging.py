@@ -1,5 +1,8 @@
+from datetime import date
 from types import SimpleNamespace
 
+import pytest
+
 from backend.app import _build_arg_parser, _build_runtime_log_lines
 
 
@@ -35,3 +38,22 @@ def test_arg_parser_supports_delete_last_file_flag() -> None:
 
     assert args.config == "config/default_config.json"
     assert args.delete_last_file is True
+
+
+def test_arg_parser_supports_profile_flag() -> None:
+    assert _build_arg_parser([]).profile is None
+    assert _build_arg_parser(["--profile"]).profile == "cprofile"
+    assert _build_arg_parser(["--profile", "sample"]).profile == "sample"
+
+
+def test_arg_parser_supports_backfill_range() -> None:
+    assert _build_arg_parser([]).backfill is None
+    assert _build_arg_parser(["--backfill", "2026-01-01", "2026-03-31"]).backfill == [date(2026, 1, 1), date(2026, 3, 31)]
+
+
+@pytest.mark.parametrize("flag", ["--profile", "--delete-last-file"])
+def test_arg_parser_rejects_run_only_flags_with_backfill(flag, capsys) -> None:
+    with pytest.raises(SystemExit):
+        _build_arg_parser(["--backfill", "2026-01-01", "2026-01-02", flag])
+
+    assert "--backfill cannot be combined" in capsys.readouterr().err
@@ -0,0 +1,75 @@
+import json
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from backend.app import run_backfill, run_pipeline
+from backend.paper_process.paper import PaperCandidate
+
+DEFAULT_CONFIG = Path(__file__).resolve().parents[2] / "config" / "default_config.json"
+
+
+def _candidate(index: int, published_at: datetime) -> PaperCandidate:
+    return PaperCandidate(
+        source="arxiv",
+        external_id=f"2602.{index:05d}",
+        title=f"Pedestrian trajectory prediction study {index}",
+        abstract=f"Transportation safety with reinforcement learning, variant {index}.",
+        authors=["A. Author"],
+        affiliations=[],
+        published_at=published_at,
+        updated_at=published_at,
+        arxiv_url=f"https://arxiv.org/abs/2602.{index:05d}",
+        pdf_url=f"https://arxiv.org/pdf/2602.{index:05d}.pdf",
+        code_urls=[],
+        categories=["cs.AI"],
+    )
+
+
+class StubSource:
+    def search_recent(self) -> list[PaperCandidate]:
+        now = datetime.now(timezone.utc)
+        return [_candidate(index, now) for index in range(3)]
+
+    def search_range(self, start: date, end: date):
+        for index, day in enumerate((date(2026, 2, 3), date(2026, 2, 2)), start=10):
+            yield _candidate(index, datetime(day.year, day.month, day.day, 12, tzinfo=timezone.utc))
+
+
+def _write_config(tmp_path: Path) -> Path:
+    config = json.loads(DEFAULT_CONFIG.read_text(encoding="utf-8"))
+    config["runtime"].update(
+        {
+            "db_path": str(tmp_path / "cache.sqlite3"),
+            "markdown_output_dir": str(tmp_path / "markdown"),
+            "pdf_output_dir": str(tmp_path / "pdf"),
+            "min_interval_hours": 0,
+            "require_llm": False,
+            "top_k": 2,
+        }
+    )
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return path
+
+
+def test_run_pipeline_end_to_end_with_stub_source(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("AI_MODEL_API_KEY", raising=False)
+    monkeypatch.delenv("AI_MODEL_URL", raising=False)
+
+    result = run_pipeline(config_path=str(_write_config(tmp_path)), source=StubSource())
+
+    assert result["generated"] is True
+    assert result["summary_count"] == 2
+    assert Path(result["output_path"]).exists()
+
+
+def test_run_backfill_end_to_end_with_stub_source(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("AI_MODEL_API_KEY", raising=False)
+    monkeypatch.delenv("AI_MODEL_URL", raising=False)
+
+    results = list(
+        run_backfill(date(2026, 2, 2), date(2026, 2, 3), config_path=str(_write_config(tmp_path)), source=StubSource())
+    )
+
+    assert [item["date"] for item in results] == ["2026-02-03", "2026-02-02"]
+    assert all(item["generated"] and Path(item["output_path"]).exists() for item in results)
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import json
+import sqlite3
 from pathlib import Path
 
+import pytest
+
+from backend.paper_process.paper_cache import SQLiteCache
 from backend.web.service import PaperSummaryService, render_markdown_for_browser
 
 
 def test_paper_summary_service_executes_job_and_records_result(tmp_path: Path) -> None:
-    def fake_runner(config_path: str | None, delete_last_file: bool) -> dict:
+    def fake_runner(config_path: str | None, delete_last_file: bool, on_progress=None, profile=None) -> dict:
         return {
             "generated": True,
             "summary_count": 2,
@@ -54,3 +59,52 @@ def test_render_markdown_for_browser_preserves_structure() -> None:
     assert "<h2>Section</h2>" in html
     assert "<a href=" in html
     assert "<code>code</code>" in html
+
+
+def _write_config(tmp_path: Path, db_path: Path) -> Path:
+    config_path = tmp_path / "config.json"
+    config_path.write_text(
+        json.dumps({"query": {"research_field": "Traffic"}, "runtime": {"db_path": str(db_path)}}),
+        encoding="utf-8",
+    )
+    return config_path
+
+
+def test_search_papers_reads_the_pipeline_cache_read_only(tmp_path: Path) -> None:
+    db_path = tmp_path / "pipeline" / "cache.sqlite3"
+    cache = SQLiteCache(db_path)
+    cache.init_db()
+    cache.upsert_paper(
+        external_id="p1",
+        source="arxiv",
+        title_raw="Pedestrian trajectory prediction",
+        title_norm="pedestrian trajectory prediction",
+        abstract_raw="Forecasting paths.",
+        authors_json="[]",
+        affiliations_json="[]",
+        published_at="2026-02-01T00:00:00+00:00",
+        updated_at="2026-02-01T00:00:00+00:00",
+        arxiv_url="https://arxiv.org/abs/p1",
+        pdf_url="https://arxiv.org/pdf/p1.pdf",
+        code_urls_json="[]",
+        categories_json="[]",
+        first_seen_at="2026-02-01T00:00:00+00:00",
+    )
+    service = PaperSummaryService(markdown_dir=tmp_path, config_path=_write_config(tmp_path, db_path))
+
+    assert [item["external_id"] for item in service.search_papers("trajectory")] == ["p1"]
+    missing = PaperSummaryService(config_path=_write_config(tmp_path, tmp_path / "missing.sqlite3"))
+    assert missing.search_papers("trajectory") == []
+    assert not (tmp_path / "missing.sqlite3").exists()
+
+
+def test_search_papers_rejects_an_unmigrated_cache_without_upgrading_it(tmp_path: Path) -> None:
+    db_path = tmp_path / "cache.sqlite3"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE papers (external_id TEXT PRIMARY KEY)")
+    service = PaperSummaryService(config_path=_write_config(tmp_path, db_path))
+
+    with pytest.raises(RuntimeError, match="run the pipeline"):
+        service.search_papers("trajectory")
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
@@ -12,12 +12,13 @@ class FakePaperSummaryService:
         self.latest_newspaper = latest_newspaper
         self.jobs: dict[str, dict] = {}
 
-    def create_job(self, *, delete_last_file: bool, config_path: str | None) -> dict:
+    def create_job(self, *, delete_last_file: bool, config_path: str | None, profile: str | None = None) -> dict:
         job = {
             "job_id": "job-001",
             "status": "queued",
             "delete_last_file": delete_last_file,
             "config_path": config_path,
+            "profile": profile,
             "result": None,
             "error": None,
         }
@@ -41,6 +42,9 @@ class FakePaperSummaryService:
     def get_latest_newspaper(self) -> dict[str, str] | None:
         return self.latest_newspaper
 
+    def search_papers(self, query: str, limit: int = 20) -> list[dict]:
+        return [{"external_id": "paper-1", "title": f"Match for {query}", "score": 1.5}][:limit]
+
 
 def _build_frontend_files(frontend_dir: Path) -> None:
     frontend_dir.mkdir(parents=True, exist_ok=True)
@@ -102,3 +106,30 @@ def test_web_app_serves_frontend_and_assets(tmp_path: Path) -> None:
     asset_response = client.get("/assets/styles.css")
     assert asset_response.status_code == 200
     assert "color" in asset_response.text
+
+
+def test_web_app_searches_cached_papers(tmp_path: Path) -> None:
+    frontend_dir = tmp_path / "frontend"
+    _build_frontend_files(frontend_dir)
+    client = TestClient(create_app(service=FakePaperSummaryService(), frontend_dir=frontend_dir))
+
+    response = client.get("/api/papers/search", params={"q": "trajectory", "limit": 5})
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["title"] == "Match for trajectory"
+    assert client.get("/api/papers/search", params={"q": ""}).status_code == 422
+
+
+def test_web_app_reports_an_unmigrated_cache_as_unavailable(tmp_path: Path) -> None:
+    class OutdatedCacheService(FakePaperSummaryService):
+        def search_papers(self, query: str, limit: int = 20) -> list[dict]:
+            raise RuntimeError("Cache has schema version 2, expected 6; run the pipeline once to migrate it")
+
+    frontend_dir = tmp_path / "frontend"
+    _build_frontend_files(frontend_dir)
+    client = TestClient(create_app(service=OutdatedCacheService(), frontend_dir=frontend_dir))
+
+    response = client.get("/api/papers/search", params={"q": "trajectory"})
+
+    assert response.status_code == 503
+    assert "run the pipeline" in response.json()["detail"]